@@ -7,23 +7,24 @@ from django.contrib.auth import get_permission_codename
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Count, F, Q
 from django.shortcuts import get_object_or_404, render
 from django.template.defaultfilters import truncatechars
 from django.urls import path
 from django.utils.decorators import method_decorator
 from django.utils.html import format_html
-from django_admin_multiple_choice_list_filter.list_filters import (
-    MultipleChoiceListFilter,
-)
 from tabular_export.admin import export_to_csv_action, export_to_excel_action
 
 from exporter import views as exporter_views
 from importer.tasks import import_items_into_project_from_url
 
 from ..models import (
+    TRANSCRIPTION_SEARCH_CONFIG,
     Asset,
+    AssetSearchDocument,
     AssetTranscriptionReservation,
+    BulkActionJob,
     Campaign,
     CarouselSlide,
     Item,
@@ -37,42 +38,67 @@ from ..models import (
     Transcription,
     UserAssetTagCollection,
 )
+from ..tasks import reconcile_contributor_tallies
 from ..views import ReportCampaignView
 from .actions import (
     anonymize_action,
     publish_action,
     publish_item_action,
     reopen_asset_action,
+    start_delete_job,
     unpublish_action,
     unpublish_item_action,
 )
-from .filters import AcceptedFilter, RejectedFilter, SubmittedFilter
+from .changelists import ArraySubquery, EqualsAny, LargeTableAdminMixin
+from .filters import (
+    AcceptedFilter,
+    AutocompleteListFilter,
+    RejectedFilter,
+    SubmittedFilter,
+)
 from .forms import (
     AdminItemImportForm,
     BleachedDescriptionAdminForm,
     SimpleContentBlockAdminForm,
 )
 
+logger = logging.getLogger(__name__)
 
-class ProjectListFilter(MultipleChoiceListFilter):
-    title = "Project"
 
-    def lookups(self, request, model_admin):
-        choices = Project.objects.values_list("pk", "title")
-        return tuple(choices)
+class ProjectListFilter(AutocompleteListFilter):
+    title = "Project"
+    related_field = Item._meta.get_field("project")
 
 
-logger = logging.getLogger(__name__)
+class CampaignListFilter(AutocompleteListFilter):
+    title = "Campaign"
+    related_field = Project._meta.get_field("campaign")
 
 
 class AssetProjectListFilter(ProjectListFilter):
     parameter_name = "item__project__in"
 
 
+class AssetCampaignListFilter(CampaignListFilter):
+    parameter_name = "item__project__campaign__in"
+
+
 class ItemProjectListFilter(ProjectListFilter):
     parameter_name = "project__in"
 
 
+class ItemCampaignListFilter(CampaignListFilter):
+    parameter_name = "project__campaign__in"
+
+
+class TranscriptionProjectListFilter(ProjectListFilter):
+    parameter_name = "asset__item__project__in"
+
+
+class TranscriptionCampaignListFilter(CampaignListFilter):
+    parameter_name = "asset__item__project__campaign__in"
+
+
 class ConcordiaUserAdmin(UserAdmin):
     list_display = UserAdmin.list_display + ("date_joined", "transcription_count")
 
@@ -115,6 +141,39 @@ admin.site.unregister(User)
 admin.site.register(User, ConcordiaUserAdmin)
 
 
+def summarize_deleted_objects(request, model, objs, related_querysets, extra_models=()):
+    """
+    Return the values expected from ModelAdmin.get_deleted_objects() for
+    objects which are deleted using the delete_items or delete_projects tasks,
+    counting the related objects rather than collecting every one of them
+
+    related_querysets maps each related model to the queryset of the objects
+    which will be deleted and extra_models lists the models whose objects will
+    be deleted without being counted, which are only checked for permission.
+    """
+
+    opts = model._meta
+
+    if len(objs) < 30:
+        deleted_objects = [str(obj) for obj in objs]
+    else:
+        deleted_objects = [str(obj) for obj in objs[:3]]
+        deleted_objects.append(f"… and {len(objs) - 3} more {opts.verbose_name_plural}")
+
+    perms_needed = set()
+    for i in (model, *related_querysets, *extra_models):
+        perm = "%s.%s" % (i._meta.app_label, get_permission_codename("delete", i._meta))
+        if not request.user.has_perm(perm):
+            perms_needed.add(i._meta.verbose_name)
+    protected = []
+
+    model_count = {opts.verbose_name_plural: len(objs)}
+    for related_model, queryset in related_querysets.items():
+        model_count[related_model._meta.verbose_name_plural] = queryset.count()
+
+    return (deleted_objects, model_count, perms_needed, protected)
+
+
 class CustomListDisplayFieldsMixin:
     """
     Mixin which provides some custom text formatters for list display fields
@@ -223,6 +282,24 @@ class ProjectAdmin(admin.ModelAdmin, CustomListDisplayFieldsMixin):
 
     actions = (publish_action, unpublish_action)
 
+    def get_deleted_objects(self, objs, request):
+        return summarize_deleted_objects(
+            request,
+            Project,
+            objs,
+            {
+                Item: Item.objects.filter(project__in=objs),
+                Asset: Asset.objects.filter(item__project__in=objs),
+            },
+            extra_models=(Transcription,),
+        )
+
+    def delete_model(self, request, obj):
+        start_delete_job(request, Project.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        start_delete_job(request, queryset)
+
     def get_urls(self):
         urls = super().get_urls()
 
@@ -292,7 +369,7 @@ class ProjectAdmin(admin.ModelAdmin, CustomListDisplayFieldsMixin):
 
 
 @admin.register(Item)
-class ItemAdmin(admin.ModelAdmin):
+class ItemAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("title", "item_id", "campaign_title", "project", "published")
     list_display_links = ("title", "item_id")
     search_fields = [
@@ -306,42 +383,28 @@ class ItemAdmin(admin.ModelAdmin):
     list_filter = (
         "published",
         "project__topics",
-        "project__campaign",
+        ItemCampaignListFilter,
         ItemProjectListFilter,
     )
 
     actions = (publish_item_action, unpublish_item_action)
 
     def get_deleted_objects(self, objs, request):
+        return summarize_deleted_objects(
+            request,
+            Item,
+            objs,
+            {Asset: Asset.objects.filter(item__in=objs)},
+            # The transcriptions and other records which depend on the assets
+            # are deleted without being counted:
+            extra_models=(Transcription,),
+        )
 
-        if len(objs) < 30:
-            deleted_objects = [str(obj) for obj in objs]
-        else:
-            deleted_objects = [str(obj) for obj in objs[:3]]
-            deleted_objects.append(
-                f"… and {len(objs) - 3} more {Item._meta.verbose_name_plural}"
-            )
-        perms_needed = set()
-        for model in (Item, Asset, Transcription):
-            perm = "%s.%s" % (
-                model._meta.app_label,
-                get_permission_codename("delete", model._meta),
-            )
-            if not request.user.has_perm(perm):
-                perms_needed.add(model._meta.verbose_name)
-        protected = []
-
-        model_count = {
-            Item._meta.verbose_name_plural: len(objs),
-            Asset._meta.verbose_name_plural: Asset.objects.filter(
-                item__in=objs
-            ).count(),
-            Transcription._meta.verbose_name_plural: Transcription.objects.filter(
-                asset__item__in=objs
-            ).count(),
-        }
+    def delete_model(self, request, obj):
+        start_delete_job(request, Item.objects.filter(pk=obj.pk))
 
-        return (deleted_objects, model_count, perms_needed, protected)
+    def delete_queryset(self, request, queryset):
+        start_delete_job(request, queryset)
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -368,7 +431,7 @@ class AssetTranscriptionReservationAdmin(
 
 
 @admin.register(Asset)
-class AssetAdmin(admin.ModelAdmin, CustomListDisplayFieldsMixin):
+class AssetAdmin(LargeTableAdminMixin, admin.ModelAdmin, CustomListDisplayFieldsMixin):
     list_display = (
         "published",
         "transcription_status",
@@ -382,18 +445,12 @@ class AssetAdmin(admin.ModelAdmin, CustomListDisplayFieldsMixin):
     )
     list_display_links = ("item_id", "sequence")
     prepopulated_fields = {"slug": ("title",)}
-    search_fields = [
-        "title",
-        "media_url",
-        "item__project__campaign__title",
-        "item__project__title",
-        "item__item_id",
-    ]
+    search_fields = ["^title", "^item__item_id"]
     list_filter = (
         "transcription_status",
         "published",
         "item__project__topics",
-        "item__project__campaign",
+        AssetCampaignListFilter,
         AssetProjectListFilter,
         "media_type",
     )
@@ -406,11 +463,32 @@ class AssetAdmin(admin.ModelAdmin, CustomListDisplayFieldsMixin):
         export_to_excel_action,
     )
     autocomplete_fields = ("item",)
-    ordering = ("item__item_id", "sequence")
+    # Sorting the entire table by item ID would have to join every item, where
+    # the primary key allows the changelist to use keyset pagination:
+    ordering = ("id",)
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related("item").order_by("item__item_id", "sequence")
+        return qs.select_related("item")
+
+    def get_search_results(self, request, queryset, search_term):
+        # The titles and item IDs are matched by prefix, which can use the
+        # expression indexes created in migration 0058, rather than scanning
+        # the entire table for substrings. Postgres scans every asset for an
+        # OR with IN (subquery) so the matching items are compared using
+        # EqualsAny, which lets it combine the two index scans:
+        if not search_term:
+            return queryset, False
+
+        matching_items = Item.objects.filter(item_id__istartswith=search_term)
+
+        queryset = queryset.annotate(
+            in_matching_item=EqualsAny(
+                F("item_id"), ArraySubquery(matching_items.values("pk"))
+            )
+        ).filter(Q(in_matching_item=True) | Q(title__istartswith=search_term))
+
+        return queryset, False
 
     def lookup_allowed(self, key, value):
         if key in ("item__project__id__exact"):
@@ -436,6 +514,13 @@ class AssetAdmin(admin.ModelAdmin, CustomListDisplayFieldsMixin):
             return self.readonly_fields + ("item",)
         return self.readonly_fields
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+
+        # Only work on published assets is included in the contributor tallies:
+        if change and "published" in form.changed_data:
+            reconcile_contributor_tallies.delay([obj.item.project.campaign_id])
+
     def change_view(self, request, object_id, extra_context=None, **kwargs):
         if object_id:
             if extra_context is None:
@@ -472,7 +557,7 @@ class UserAssetTagCollectionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Transcription)
-class TranscriptionAdmin(admin.ModelAdmin):
+class TranscriptionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "asset",
@@ -489,11 +574,11 @@ class TranscriptionAdmin(admin.ModelAdmin):
         SubmittedFilter,
         AcceptedFilter,
         RejectedFilter,
-        "asset__item__project__campaign",
-        "asset__item__project",
+        TranscriptionCampaignListFilter,
+        TranscriptionProjectListFilter,
     )
 
-    search_fields = ["text", "user__username", "user__email"]
+    search_fields = ["user__username", "user__email"]
 
     readonly_fields = (
         "asset",
@@ -515,6 +600,37 @@ class TranscriptionAdmin(admin.ModelAdmin):
 
     truncated_text.short_description = "Text"
 
+    def get_search_results(self, request, queryset, search_term):
+        # Searching the text uses the full-text index of each asset's latest
+        # transcription since a substring match scans the entire table, so
+        # only the latest transcriptions are matched; earlier revisions are
+        # not indexed. Postgres scans every transcription for an OR with
+        # IN (subquery) so both the matching users and the matching latest
+        # transcriptions are compared using EqualsAny, which lets it combine
+        # the two index scans:
+        if not search_term:
+            return queryset, False
+
+        matching_users = User.objects.filter(
+            Q(username__icontains=search_term) | Q(email__icontains=search_term)
+        )
+        matching_documents = AssetSearchDocument.objects.filter(
+            search_vector=SearchQuery(search_term, config=TRANSCRIPTION_SEARCH_CONFIG),
+            asset__latest_transcription__isnull=False,
+        )
+
+        queryset = queryset.annotate(
+            by_matching_user=EqualsAny(
+                F("user_id"), ArraySubquery(matching_users.values("pk"))
+            ),
+            is_matching_text=EqualsAny(
+                F("pk"),
+                ArraySubquery(matching_documents.values("asset__latest_transcription")),
+            ),
+        ).filter(Q(by_matching_user=True) | Q(is_matching_text=True))
+
+        return queryset, False
+
 
 @admin.register(SimpleContentBlock)
 class SimpleContentBlockAdmin(admin.ModelAdmin):
@@ -546,6 +662,41 @@ class SimplePageAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(BulkActionJob)
+class BulkActionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "description",
+        "created_by",
+        "created_on",
+        "display_progress",
+        "last_started",
+        "completed",
+        "failed",
+    )
+    list_filter = ("action",)
+    readonly_fields = (
+        "description",
+        "action",
+        "created_by",
+        "created_on",
+        "display_progress",
+        "total",
+        "processed",
+        "last_started",
+        "completed",
+        "failed",
+        "status",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def display_progress(self, obj):
+        return f"{obj.processed} of {obj.total} ({obj.progress:.0%})"
+
+    display_progress.short_description = "Progress"
+
+
 @admin.register(SiteReport)
 class SiteReportAdmin(admin.ModelAdmin):
     list_display = ("created_on", "campaign", "topic")
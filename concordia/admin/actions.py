@@ -1,9 +1,29 @@
 import uuid
 
 from django.contrib import messages
-from django.utils.timezone import now
+from django.urls import reverse
+from django.utils.html import format_html
 
-from ..models import Asset, Transcription, TranscriptionStatus
+from ..models import Asset, BulkAction, BulkActionJob, Project, TranscriptionStatus
+from ..tasks import (
+    delete_items,
+    delete_projects,
+    publish_items,
+    reconcile_contributor_tallies,
+    reopen_assets,
+)
+from ..utils import clear_item_asset_navigation
+
+#: Selections larger than this are reopened by a Celery task rather than during
+#: the admin request
+REOPEN_ASSETS_TASK_THRESHOLD = 500
+
+#: Items are published by a Celery task when more assets than this would change
+PUBLISH_ITEMS_TASK_THRESHOLD = 5000
+
+#: Items and projects are deleted by a Celery task when they have more assets
+#: than this, since each asset's image is also removed from storage
+DELETE_TASK_THRESHOLD = 500
 
 
 def anonymize_action(modeladmin, request, queryset):
@@ -26,12 +46,7 @@ def publish_item_action(modeladmin, request, queryset):
     Mark all of the selected items and their related assets as published
     """
 
-    count = queryset.filter(published=False).update(published=True)
-    asset_count = Asset.objects.filter(item__in=queryset, published=False).update(
-        published=True
-    )
-
-    messages.info(request, f"Published {count} items and {asset_count} assets")
+    start_publish_items_job(request, queryset, published=True)
 
 
 publish_item_action.short_description = "Publish selected items and assets"
@@ -42,15 +57,113 @@ def unpublish_item_action(modeladmin, request, queryset):
     Mark all of the selected items and their related assets as unpublished
     """
 
-    count = queryset.filter(published=True).update(published=False)
-    asset_count = Asset.objects.filter(item__in=queryset, published=True).update(
-        published=False
+    start_publish_items_job(request, queryset, published=False)
+
+
+unpublish_item_action.short_description = "Unpublish selected items and assets"
+
+
+def start_publish_items_job(request, queryset, *, published):
+    """
+    Publish or unpublish the selected items and their assets, using a
+    background task which reports its progress in a BulkActionJob when there
+    are too many assets to update during the admin request
+    """
+
+    item_pks = list(queryset.order_by().values_list("pk", flat=True))
+
+    if published:
+        action, verb = BulkAction.PUBLISH_ITEMS, "Publish"
+    else:
+        action, verb = BulkAction.UNPUBLISH_ITEMS, "Unpublish"
+
+    job = BulkActionJob.objects.create(
+        created_by=request.user,
+        action=action,
+        description=f"{BulkAction.CHOICE_MAP[action]}: {len(item_pks)} items",
+    )
+
+    asset_count = (
+        Asset.objects.filter(item__in=item_pks).exclude(published=published).count()
     )
 
-    messages.info(request, f"Unpublished {count} items and {asset_count} assets")
+    if asset_count > PUBLISH_ITEMS_TASK_THRESHOLD:
+        publish_items.delay(job.pk, item_pks, published)
+        messages.info(
+            request,
+            format_html(
+                "{}ing {} items and {} assets in the background:"
+                ' <a href="{}">view progress</a>',
+                verb,
+                len(item_pks),
+                asset_count,
+                reverse("admin:concordia_bulkactionjob_change", args=(job.pk,)),
+            ),
+        )
+    else:
+        publish_items(job.pk, item_pks, published)
+        messages.info(
+            request, f"{verb}ed {len(item_pks)} items and {asset_count} assets"
+        )
 
 
-unpublish_item_action.short_description = "Unpublish selected items and assets"
+def start_delete_job(request, queryset):
+    """
+    Delete the selected items or projects, their assets and everything which
+    depends on them using a background task which reports its progress in a
+    BulkActionJob when there are too many assets to delete during the admin
+    request
+    """
+
+    pks = list(queryset.order_by().values_list("pk", flat=True))
+
+    if queryset.model is Project:
+        action, delete_task = BulkAction.DELETE_PROJECTS, delete_projects
+        assets = Asset.objects.filter(item__project__in=pks)
+    else:
+        action, delete_task = BulkAction.DELETE_ITEMS, delete_items
+        assets = Asset.objects.filter(item__in=pks)
+
+    label = f"{len(pks)} {queryset.model._meta.verbose_name_plural}"
+
+    job = BulkActionJob.objects.create(
+        created_by=request.user,
+        action=action,
+        description=f"{BulkAction.CHOICE_MAP[action]}: {label}",
+    )
+
+    asset_count = assets.count()
+
+    if asset_count > DELETE_TASK_THRESHOLD:
+        delete_task.delay(job.pk, pks)
+        messages.info(
+            request,
+            format_html(
+                "Deleting {} and {} assets in the background:"
+                ' <a href="{}">view progress</a>',
+                label,
+                asset_count,
+                reverse("admin:concordia_bulkactionjob_change", args=(job.pk,)),
+            ),
+        )
+    else:
+        delete_task(job.pk, pks)
+
+
+def update_asset_contributor_tallies(asset_qs, changed_count):
+    """
+    Rebuild the contributor tallies of the campaigns containing the provided
+    assets in the background, since they only include work on published assets
+    """
+
+    if changed_count:
+        reconcile_contributor_tallies.delay(
+            list(
+                asset_qs.values_list("item__project__campaign", flat=True)
+                .order_by()
+                .distinct()
+            )
+        )
 
 
 def publish_action(modeladmin, request, queryset):
@@ -59,6 +172,11 @@ def publish_action(modeladmin, request, queryset):
     """
 
     count = queryset.filter(published=False).update(published=True)
+
+    if queryset.model is Asset:
+        clear_item_asset_navigation(queryset.values_list("item_id", flat=True))
+        update_asset_contributor_tallies(queryset, count)
+
     messages.info(request, f"Published {count} objects")
 
 
@@ -71,6 +189,11 @@ def unpublish_action(modeladmin, request, queryset):
     """
 
     count = queryset.filter(published=True).update(published=False)
+
+    if queryset.model is Asset:
+        clear_item_asset_navigation(queryset.values_list("item_id", flat=True))
+        update_asset_contributor_tallies(queryset, count)
+
     messages.info(request, f"Unpublished {count} objects")
 
 
@@ -78,36 +201,28 @@ unpublish_action.short_description = "Unpublish selected"
 
 
 def reopen_asset_action(modeladmin, request, queryset):
+    """
+    Reopen the selected completed assets by rejecting their latest
+    transcriptions, using a background task for large selections
+    """
 
     # Can only reopen completed assets
-    assets = queryset.filter(transcription_status=TranscriptionStatus.COMPLETED)
-
-    # Count the number of assets that will become reopened
-    count = assets.count()
-
-    """
-    For each asset, create a new transcription that:
-    - supersedes the currently-latest transcription
-    - has rejected set to now
-    - has reviewed_by set to the current user
-    - has the same transcription text as the latest transcription
-    Don't use bulk_create because then the post-save signal will not be sent.
+    asset_pks = list(
+        queryset.filter(transcription_status=TranscriptionStatus.COMPLETED)
+        .order_by()
+        .values_list("pk", flat=True)
+    )
 
-    """
-    for asset in assets:
-        latest_transcription = asset.transcription_set.order_by("-pk").first()
-        new_transcription = Transcription(
-            supersedes=latest_transcription,
-            rejected=now(),
-            reviewed_by=request.user,
-            text=latest_transcription.text,
-            asset=asset,
-            user=request.user,
+    if len(asset_pks) > REOPEN_ASSETS_TASK_THRESHOLD:
+        reopen_assets.delay(asset_pks, request.user.pk)
+        messages.info(
+            request,
+            f"Reopening {len(asset_pks)} assets in the background."
+            " This may take a few minutes.",
         )
-        new_transcription.full_clean()
-        new_transcription.save()
-
-    messages.info(request, f"Reopened {count} assets")
+    else:
+        count = reopen_assets(asset_pks, request.user.pk)
+        messages.info(request, f"Reopened {count} assets")
 
 
 reopen_asset_action.short_description = "Reopen selected assets"
@@ -0,0 +1,212 @@
+from django import forms
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.admin.widgets import AutocompleteSelectMultiple
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import BooleanField, Func, Subquery
+from django.utils.functional import cached_property
+
+from .filters import AutocompleteListFilter
+
+#: The query string parameter holding the primary key of the last result on
+#: the previous page of a keyset paginated changelist
+AFTER_VAR = "after"
+
+
+class ArraySubquery(Subquery):
+    """Subquery which returns its single column of results as an array"""
+
+    template = "ARRAY(%(subquery)s)"
+
+
+class EqualsAny(Func):
+    """
+    Test whether an expression equals any element of an array
+
+    Unlike IN (subquery), `expression = ANY(ARRAY(subquery))` evaluates the
+    subquery once so Postgres can still use an index when it is combined with
+    other conditions using OR.
+    """
+
+    arg_joiner = " = ANY("
+    template = "%(expressions)s)"
+    output_field = BooleanField()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator which uses the row estimate Postgres maintains for the query
+    planner rather than counting every row when the queryset is unfiltered
+
+    Small tables, and tables which have not been analyzed yet, are still
+    counted exactly.
+    """
+
+    #: Tables estimated to have fewer rows than this are counted exactly
+    estimate_threshold = 10000
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        estimate = self.get_estimated_count()
+        if estimate is not None:
+            self.count_is_estimate = True
+            return estimate
+
+        return super().count
+
+    def get_estimated_count(self):
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+
+        if (
+            query is None
+            or query.where
+            or query.distinct
+            or query.combinator
+            or not query.can_filter()
+        ):
+            return None
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            (estimate,) = cursor.fetchone()
+
+        if estimate < self.estimate_threshold:
+            return None
+
+        return int(estimate)
+
+
+class KeysetChangeList(ChangeList):
+    """
+    ChangeList which pages through results ordered by primary key using the
+    last primary key on the previous page rather than an offset, which
+    Postgres can only satisfy by reading and discarding every earlier row
+
+    Other orderings use the standard numbered pages.
+    """
+
+    def __init__(self, request, model, *args, **kwargs):
+        try:
+            self.after = model._meta.pk.to_python(request.GET.get(AFTER_VAR))
+        except ValidationError:
+            raise IncorrectLookupParameters
+
+        self.next_after = None
+
+        super().__init__(request, model, *args, **kwargs)
+
+        # The links to change the filters or ordering start from the first page:
+        self.params.pop(AFTER_VAR, None)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(AFTER_VAR, None)
+        return lookup_params
+
+    def get_keyset_ordering(self):
+        """
+        Return the order_by() value if the results are ordered only by the
+        primary key, otherwise None
+        """
+
+        # The ModelAdmin's ordering is also applied by get_queryset() so the
+        # same field may be listed twice:
+        ordering = set(map(str, self.queryset.query.order_by))
+        pk_names = ("pk", self.lookup_opts.pk.name)
+
+        if len(ordering) == 1:
+            (field_name,) = ordering
+            if field_name.lstrip("-") in pk_names:
+                return field_name
+
+        return None
+
+    @property
+    def next_page_query_string(self):
+        if self.next_after is None:
+            return None
+
+        return self.get_query_string({AFTER_VAR: self.next_after})
+
+    def get_results(self, request):
+        self.keyset_ordering = self.get_keyset_ordering()
+
+        if self.keyset_ordering is None:
+            return super().get_results(request)
+
+        paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        )
+        result_count = paginator.count
+
+        if self.model_admin.show_full_result_count:
+            full_result_count = self.root_queryset.count()
+        else:
+            full_result_count = None
+        can_show_all = result_count <= self.list_max_show_all
+        multi_page = result_count > self.list_per_page
+
+        if (self.show_all and can_show_all) or not multi_page:
+            result_list = self.queryset._clone()
+        else:
+            queryset = self.queryset
+            if self.after is not None:
+                if self.keyset_ordering.startswith("-"):
+                    queryset = queryset.filter(pk__lt=self.after)
+                else:
+                    queryset = queryset.filter(pk__gt=self.after)
+
+            result_list = queryset[: self.list_per_page]
+
+            # The results are evaluated here to find the start of the next page
+            # and the template will reuse them:
+            results = list(result_list)
+            if len(results) == self.list_per_page:
+                self.next_after = results[-1].pk
+
+        self.result_count = result_count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(
+            full_result_count
+        )
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = can_show_all
+        self.multi_page = multi_page
+        self.paginator = paginator
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin mixin for tables which are too large to count or page through
+    using OFFSET on every changelist request
+
+    This must be listed before ModelAdmin so its attributes take precedence.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    @property
+    def media(self):
+        media = super().media
+
+        if any(
+            isinstance(i, type) and issubclass(i, AutocompleteListFilter)
+            for i in self.list_filter
+        ):
+            media += AutocompleteSelectMultiple(None, self.admin_site).media
+            media += forms.Media(js=["admin/autocomplete-list-filter.js"])
+
+        return media
@@ -1,4 +1,6 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelectMultiple
 
 
 class NullableTimestampFilter(admin.SimpleListFilter):
@@ -42,3 +44,57 @@ class RejectedFilter(NullableTimestampFilter):
     title = "Rejected"
     parameter_name = "rejected"
     lookup_labels = ("Pending", "Rejected")
+
+
+class AutocompleteListFilter(admin.SimpleListFilter):
+    """
+    Base class for Admin list filters which select related objects using the
+    admin autocomplete view rather than listing every possible value
+
+    The selected primary keys are passed as a comma-separated list so the
+    parameter name should end in "__in".
+    """
+
+    template = "admin/autocomplete_list_filter.html"
+    # Title displayed on the list filter URL
+    title = ""
+    # Lookup used to filter the changelist:
+    parameter_name = ""
+    # A foreign key to the model being selected, whose ModelAdmin must have
+    # search_fields for the autocomplete view:
+    related_field = None
+
+    def lookups(self, request, model_admin):
+        # The choices are loaded on demand by the autocomplete widget:
+        return ()
+
+    def has_output(self):
+        return True
+
+    def get_selected(self):
+        return self.value().split(",") if self.value() else []
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.get_selected()})
+        return queryset
+
+    def choices(self, changelist):
+        query_string = changelist.get_query_string(remove=[self.parameter_name])
+
+        widget = AutocompleteSelectMultiple(
+            self.related_field.remote_field,
+            changelist.model_admin.admin_site,
+            attrs={"data-query-string": query_string, "style": "width: 100%"},
+        )
+        field = forms.ModelMultipleChoiceField(
+            queryset=self.related_field.related_model._default_manager.all(),
+            required=False,
+            widget=widget,
+        )
+
+        yield {
+            "selected": not self.value(),
+            "query_string": query_string,
+            "widget": field.widget.render(self.parameter_name, self.get_selected()),
+        }
@@ -1,19 +1,22 @@
 import re
+from datetime import timedelta
 
 from bittersweet.models import validated_get_or_create
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import permission_required
 from django.core.exceptions import ValidationError
+from django.db.models import Max, Sum
 from django.shortcuts import render
 from django.utils.text import slugify
+from django.utils.timezone import now
 from django.views.decorators.cache import never_cache
 from tabular_export.core import export_to_csv_response, flatten_queryset
 
 from importer.tasks import import_items_into_project_from_url, redownload_image_task
 from importer.utils.excel import slurp_excel
 
-from ..models import Asset, Campaign, Project, SiteReport
+from ..models import Asset, Campaign, Project, SiteReport, TaskStatistics
 from .forms import AdminProjectBulkImportForm, AdminRedownloadImagesForm
 
 
@@ -268,3 +271,58 @@ def admin_site_report_view(request):
     )
 
     return export_to_csv_response("site-report.csv", headers, data)
+
+
+@never_cache
+@staff_member_required
+def admin_task_health_view(request):
+    request.current_app = "admin"
+
+    try:
+        hours = int(request.GET.get("hours", 24))
+    except ValueError:
+        hours = 24
+    hours = min(max(hours, 1), 24 * 90)
+
+    since = now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours)
+
+    task_stats = (
+        TaskStatistics.objects.filter(period_start__gte=since)
+        .values("task_name")
+        .annotate(
+            total_runs=Sum("runs"),
+            total_failures=Sum("failures"),
+            total_retries=Sum("retries"),
+            total_runtime=Sum("runtime"),
+            longest_runtime=Max("max_runtime"),
+            total_queue_wait=Sum("queue_wait"),
+            longest_queue_wait=Max("max_queue_wait"),
+            total_db_queries=Sum("db_queries"),
+            total_db_duration=Sum("db_duration"),
+            total_http_requests=Sum("http_requests"),
+            total_http_bytes=Sum("http_bytes"),
+        )
+        .order_by("-total_runtime")
+    )
+
+    tasks = []
+    for stats in task_stats:
+        runs = stats["total_runs"]
+        stats["average_runtime"] = stats["total_runtime"] / runs
+        stats["average_queue_wait"] = stats["total_queue_wait"] / runs
+        stats["average_db_queries"] = stats["total_db_queries"] / runs
+        stats["failure_rate"] = stats["total_failures"] / runs
+        tasks.append(stats)
+
+    context = {
+        "title": "Task Health",
+        "hours": hours,
+        "period_choices": (
+            (24, "Last day"),
+            (24 * 7, "Last week"),
+            (24 * 30, "Last month"),
+        ),
+        "tasks": tasks,
+    }
+
+    return render(request, "admin/task_health.html", context)
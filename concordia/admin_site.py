@@ -10,6 +10,7 @@ class ConcordiaAdminSite(admin.AdminSite):
         from concordia.admin.views import (
             admin_bulk_import_view,
             admin_site_report_view,
+            admin_task_health_view,
             redownload_images_view,
         )
 
@@ -18,6 +19,7 @@ class ConcordiaAdminSite(admin.AdminSite):
         custom_urls = [
             path("bulk-import/", admin_bulk_import_view, name="bulk-import"),
             path("site-report/", admin_site_report_view, name="site-report"),
+            path("task-health/", admin_task_health_view, name="task-health"),
             path(
                 "redownload-images/", redownload_images_view, name="redownload-images"
             ),
@@ -6,6 +6,7 @@ class ConcordiaAppConfig(AppConfig):
     name = "concordia"
 
     def ready(self):
+        from . import task_metrics  # NOQA
         from .signals import handlers  # NOQA
 
 
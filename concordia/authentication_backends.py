@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
 from django.db.models import Q
+from django.db.models.functions import Lower
 
 
 class EmailOrUsernameModelBackend(ModelBackend):
@@ -18,14 +19,14 @@ class EmailOrUsernameModelBackend(ModelBackend):
 
         if username is None:
             username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
 
         # The `username` field is allows to contain `@` characters so
         # technically a given email address could be present in either field,
         # possibly even for different users, so we'll query for all matching
         # records and test each one.
-        users = user_model._default_manager.filter(
-            Q(**{user_model.USERNAME_FIELD: username}) | Q(email__iexact=username)
-        )
+        users = self.get_matching_users(username)
 
         # Test whether any matched user has the provided password:
         for user in users:
@@ -36,3 +37,17 @@ class EmailOrUsernameModelBackend(ModelBackend):
             # difference between an existing and a non-existing user (see
             # https://code.djangoproject.com/ticket/20760)
             user_model().set_password(password)
+
+    def get_matching_users(self, username):
+        """
+        Return the users whose username matches exactly or whose email address
+        matches without regard to case
+        """
+
+        user_model = get_user_model()
+
+        # The email address is compared using LOWER() rather than iexact so the
+        # auth_user_email_lower_idx index can be used:
+        return user_model._default_manager.annotate(email_lower=Lower("email")).filter(
+            Q(**{user_model.USERNAME_FIELD: username}) | Q(email_lower=username.lower())
+        )
@@ -0,0 +1,39 @@
+"""
+Cache backends which record hits and misses for the view metrics
+
+These are the standard Django backends with the lookups counted by
+concordia.middleware.ViewMetricsMiddleware for the request being handled.
+"""
+
+from django.core.cache.backends import locmem, memcached
+
+from .middleware import record_cache_lookups
+
+_MISSING = object()
+
+
+class CacheMetricsMixin(object):
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+
+        if value is _MISSING:
+            record_cache_lookups(misses=1)
+            return default
+
+        record_cache_lookups(hits=1)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version)
+
+        record_cache_lookups(hits=len(values), misses=len(keys) - len(values))
+        return values
+
+
+class LocMemCache(CacheMetricsMixin, locmem.LocMemCache):
+    pass
+
+
+class MemcachedCache(CacheMetricsMixin, memcached.MemcachedCache):
+    pass
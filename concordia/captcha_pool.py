@@ -0,0 +1,143 @@
+"""
+Pre-generated captcha challenges
+
+Generating a captcha inserts a CaptchaStore record and rendering its image is
+CPU-intensive, which becomes a bottleneck when a campaign launch brings many
+anonymous volunteers to the site at once. The fill_captcha_pool task instead
+generates up to CAPTCHA_POOL_SIZE challenges ahead of time, storing each key in
+a numbered cache slot and its rendered image in the cache so the image view
+does not need to touch the database.
+
+get_captcha_key() hands out the slots in turn, removing each one as it is
+used. Two requests can read the same slot before it is removed, so each key
+is claimed using cache.add(), which only one of them can succeed at. When it
+finds an empty slot, loses a claim or the slot counter has been evicted it
+generates a challenge synchronously, scheduling the pool to be refilled if
+the slot was empty.
+"""
+
+from datetime import timedelta
+
+from captcha.conf import settings as captcha_settings
+from captcha.models import CaptchaStore
+from captcha.views import captcha_image
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.timezone import now
+
+#: Cache key holding the number of challenges handed out from the pool
+POOL_COUNTER_CACHE_KEY = "captcha-pool-counter"
+
+#: Cache key used to avoid scheduling more than one pending fill task
+FILL_SCHEDULED_CACHE_KEY = "captcha-pool-fill-scheduled"
+
+
+def get_pool_slot_cache_key(index):
+    return "captcha-pool:%d" % index
+
+
+def get_captcha_image_cache_key(key):
+    return "captcha-image:%s" % key
+
+
+def get_captcha_claim_cache_key(key):
+    return "captcha-claimed:%s" % key
+
+
+def get_captcha_key():
+    """
+    Return the key of an unused captcha challenge, taken from the pool if one
+    is available
+    """
+
+    pool_size = settings.CAPTCHA_POOL_SIZE
+
+    if pool_size:
+        cache.add(POOL_COUNTER_CACHE_KEY, 0, None)
+        try:
+            index = cache.incr(POOL_COUNTER_CACHE_KEY)
+        except ValueError:
+            # The counter was evicted after it was added. It is restored for
+            # the following requests rather than sending them all to one slot:
+            cache.add(POOL_COUNTER_CACHE_KEY, 0, None)
+        else:
+            key = claim_pool_slot(index % pool_size)
+            if key is not None:
+                return key
+
+    return CaptchaStore.generate_key()
+
+
+def claim_pool_slot(index):
+    """
+    Remove and return the key stored in the numbered pool slot, or None if the
+    slot is empty or another request claimed its key first
+    """
+
+    slot_key = get_pool_slot_cache_key(index)
+
+    key = cache.get(slot_key)
+    if key is None:
+        schedule_pool_fill()
+        return None
+
+    if not cache.add(
+        get_captcha_claim_cache_key(key), True, settings.CAPTCHA_POOL_TIMEOUT
+    ):
+        return None
+
+    cache.delete(slot_key)
+    return key
+
+
+def schedule_pool_fill():
+    # As with the search index updates, the flag is only set after commit so a
+    # rolled back request cannot block the refill:
+    transaction.on_commit(start_pool_fill)
+
+
+def start_pool_fill():
+    if cache.add(FILL_SCHEDULED_CACHE_KEY, True, settings.CAPTCHA_POOL_TIMEOUT):
+        from .tasks import fill_captcha_pool
+
+        fill_captcha_pool.delay()
+
+
+def fill_pool():
+    """
+    Generate a challenge for every empty slot in the pool, returning the
+    number of challenges generated
+    """
+
+    pool_timeout = settings.CAPTCHA_POOL_TIMEOUT
+    slot_keys = [get_pool_slot_cache_key(i) for i in range(settings.CAPTCHA_POOL_SIZE)]
+    filled_slots = cache.get_many(slot_keys)
+
+    # A challenge handed out just before its slot expires must still allow the
+    # usual time to solve it:
+    solving_time = 60 * int(captcha_settings.CAPTCHA_TIMEOUT)
+    expiration = now() + timedelta(seconds=pool_timeout + solving_time)
+
+    generated = 0
+
+    for slot_key in slot_keys:
+        if slot_key in filled_slots:
+            continue
+
+        challenge, response = captcha_settings.get_challenge()()
+        store = CaptchaStore.objects.create(
+            challenge=challenge, response=response, expiration=expiration
+        )
+
+        image = captcha_image(None, store.hashkey).content
+        cache.set(
+            get_captcha_image_cache_key(store.hashkey),
+            image,
+            pool_timeout + solving_time,
+        )
+        cache.set(slot_key, store.hashkey, pool_timeout)
+
+        generated += 1
+
+    return generated
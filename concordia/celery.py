@@ -4,6 +4,13 @@ import os
 
 import sentry_sdk
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    multiprocess,
+    start_http_server,
+)
 from sentry_sdk.integrations.celery import CeleryIntegration
 
 from concordia.version import get_concordia_version
@@ -19,6 +26,12 @@ if SENTRY_BACKEND_DSN:
         integrations=[CeleryIntegration()],
     )
 
+# The task metrics recorded by concordia.task_metrics are served on this port
+# by each worker. When the worker uses the prefork pool, prometheus_client's
+# multiprocess mode must be enabled by setting prometheus_multiproc_dir to an
+# empty directory so the metrics from all of the child processes are combined:
+CELERY_WORKER_METRICS_PORT = os.environ.get("CELERY_WORKER_METRICS_PORT", None)
+
 app = Celery("concordia")
 
 # Using a string here means the worker doesn't have to serialize
@@ -34,3 +47,23 @@ app.autodiscover_tasks()
 @app.task(bind=True)
 def debug_task(self):
     print("Request: {0!r}".format(self.request))
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    if not CELERY_WORKER_METRICS_PORT:
+        return
+
+    if "prometheus_multiproc_dir" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    start_http_server(int(CELERY_WORKER_METRICS_PORT), registry=registry)
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    if "prometheus_multiproc_dir" in os.environ:
+        multiprocess.mark_process_dead(pid)
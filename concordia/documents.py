@@ -1,13 +1,48 @@
+from collections import defaultdict
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.db.models import Count, Q
 from django_elasticsearch_dsl import Document, fields
 from django_elasticsearch_dsl.registries import registry
+from more_itertools.more import chunked
 
 from .models import Asset, SiteReport, Transcription, UserAssetTagCollection
 
 
+class BulkPreparedDocument(Document):
+    """
+    Document which loads values for a batch of instances at a time
+
+    Subclasses implement prepare_bulk(), which receives a list of up to
+    SEARCH_INDEX_BATCH_SIZE instances and returns a dictionary of
+    {field name: {pk: value}} using grouped queries. The prepare_<field>
+    methods can then use get_bulk_value() rather than querying the database
+    for every document.
+    """
+
+    # This must be declared on the class so elasticsearch_dsl does not treat
+    # the instance attribute as part of the document:
+    _bulk_values = {}
+
+    def prepare_bulk(self, instances):
+        return {}
+
+    def get_bulk_value(self, field_name, instance, default=None):
+        return self._bulk_values[field_name].get(instance.pk, default)
+
+    def _get_actions(self, object_list, action):
+        if action == "delete":
+            yield from super()._get_actions(object_list, action)
+            return
+
+        for chunk in chunked(object_list, settings.SEARCH_INDEX_BATCH_SIZE):
+            self._bulk_values = self.prepare_bulk(chunk)
+            yield from super()._get_actions(chunk, action)
+
+
 @registry.register_document
-class UserDocument(Document):
+class UserDocument(BulkPreparedDocument):
     class Index:
         # Name of the Elasticsearch index
         name = "users"
@@ -20,9 +55,26 @@ class UserDocument(Document):
         model = User
         fields = ["last_login", "date_joined", "is_active", "id"]
 
+    def prepare_bulk(self, instances):
+        transcription_counts = (
+            Transcription.objects.filter(user__in=instances)
+            .order_by()
+            .values_list("user")
+            .annotate(Count("pk"))
+        )
+
+        return {"transcription_count": dict(transcription_counts)}
+
     def prepare_transcription_count(self, instance):
-        qs = User.objects.filter(id=instance.id).annotate(Count("transcription"))
-        return qs[0].transcription__count
+        return self.get_bulk_value("transcription_count", instance, 0)
+
+    def get_queryset_changed_since(self, since):
+        changed_users = User.objects.filter(
+            Q(date_joined__gte=since)
+            | Q(last_login__gte=since)
+            | Q(transcription__updated_on__gte=since)
+        )
+        return self.get_queryset().filter(pk__in=changed_users.values("pk"))
 
 
 @registry.register_document
@@ -62,9 +114,12 @@ class SiteReportDocument(Document):
             "users_activated",
         ]
 
+    def get_queryset_changed_since(self, since):
+        return self.get_queryset().filter(created_on__gte=since)
+
 
 @registry.register_document
-class TagCollectionDocument(Document):
+class TagCollectionDocument(BulkPreparedDocument):
     class Index:
         # Name of the Elasticsearch index
         name = "tags"
@@ -99,15 +154,36 @@ class TagCollectionDocument(Document):
         fields = ["created_on", "updated_on"]
 
     def get_queryset(self):
+        # The queryset is iterated without prefetching so the related records
+        # are joined instead:
         return (
             super()
             .get_queryset()
             .order_by("pk")
-            .prefetch_related(
-                "asset__item", "asset__item__project", "asset__item__project__campaign"
+            .select_related("asset__item__project__campaign", "user")
+        )
+
+    def prepare_bulk(self, instances):
+        collection_tags = (
+            UserAssetTagCollection.tags.through.objects.filter(
+                userassettagcollection__in=instances
             )
+            .order_by("tag__value")
+            .values_list("userassettagcollection", "tag__value")
         )
 
+        tags = defaultdict(list)
+        for collection_id, value in collection_tags:
+            tags[collection_id].append({"value": value})
+
+        return {"tags": tags}
+
+    def prepare_tags(self, instance):
+        return self.get_bulk_value("tags", instance, [])
+
+    def get_queryset_changed_since(self, since):
+        return self.get_queryset().filter(updated_on__gte=since)
+
 
 @registry.register_document
 class TranscriptionDocument(Document):
@@ -170,9 +246,12 @@ class TranscriptionDocument(Document):
             )
         )
 
+    def get_queryset_changed_since(self, since):
+        return self.get_queryset().filter(updated_on__gte=since)
+
 
 @registry.register_document
-class AssetDocument(Document):
+class AssetDocument(BulkPreparedDocument):
     class Index:
         # Name of the Elasticsearch index
         name = "assets"
@@ -210,10 +289,40 @@ class AssetDocument(Document):
 
     submission_count = fields.IntegerField()
 
+    def prepare_bulk(self, instances):
+        submission_counts = (
+            Transcription.objects.filter(asset__in=instances, submitted__isnull=True)
+            .order_by()
+            .values_list("asset")
+            .annotate(Count("pk"))
+        )
+
+        latest_transcriptions = Transcription.objects.filter(
+            pk__in=[i.latest_transcription_id for i in instances]
+        ).values(
+            "asset_id",
+            "created_on",
+            "updated_on",
+            "accepted",
+            "rejected",
+            "submitted",
+        )
+
+        latest_transcriptions_by_asset = {}
+        for transcription in latest_transcriptions:
+            asset_id = transcription.pop("asset_id")
+            latest_transcriptions_by_asset[asset_id] = transcription
+
+        return {
+            "submission_count": dict(submission_counts),
+            "latest_transcription": latest_transcriptions_by_asset,
+        }
+
     def prepare_submission_count(self, instance):
-        return Transcription.objects.filter(
-            asset=instance, submitted__isnull=True
-        ).count()
+        return self.get_bulk_value("submission_count", instance, 0)
+
+    def prepare_latest_transcription(self, instance):
+        return self.get_bulk_value("latest_transcription", instance)
 
     class Django:
         model = Asset
@@ -231,3 +340,9 @@ class AssetDocument(Document):
                 "item__project__campaign",
             )
         )
+
+    def get_queryset_changed_since(self, since):
+        # Assets do not have a modification timestamp but their indexed status
+        # and difficulty values change when their transcriptions are updated:
+        changed_assets = Asset.objects.filter(transcription__updated_on__gte=since)
+        return self.get_queryset().filter(pk__in=changed_assets.values("pk"))
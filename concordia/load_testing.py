@@ -0,0 +1,339 @@
+"""
+HTTP load test of the volunteer workflow
+
+Each simulated volunteer runs in a thread with its own HTTP session and loops
+through the same requests as the browser:
+
+* transcribers open the next transcribable asset, poll its reservation, save
+  a transcription one or more times and submit it for review
+* reviewers open the next reviewable asset and accept or reject the latest
+  transcription
+* anonymous users behave like transcribers after answering the captcha
+
+The server should be run using the concordia.settings_loadtest settings,
+which bypass the captcha and rate limits and report the database queries for
+each request in response headers, against a database filled using the
+generate_synthetic_data command.
+"""
+
+import math
+import random
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from timeit import default_timer
+from urllib.parse import urljoin
+
+import requests
+
+#: Status codes which are part of the normal workflow for each request
+EXPECTED_STATUS_CODES = {
+    "login": (302,),
+    "redirect_to_next_transcribable_asset": (302,),
+    "redirect_to_next_reviewable_asset": (302,),
+    "reserve_asset": (200, 409),
+    "save_transcription": (201, 401, 409),
+}
+
+ASSET_PK_RE = re.compile(r'action="/assets/(\d+)/transcriptions/save/"')
+TRANSCRIPTION_PK_RE = re.compile(r'data-transcription-id="(\d+)"')
+CSRF_TOKEN_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def percentile(sorted_values, percent):
+    """Return the nearest-rank percentile of a sorted list of values"""
+
+    if not sorted_values:
+        return None
+
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
+
+
+class LoadTestResults(object):
+    """Thread-safe record of the requests made by every simulated volunteer"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = defaultdict(list)
+
+    def add(self, name, status_code, duration, query_count, query_duration):
+        expected = EXPECTED_STATUS_CODES.get(name, (200,))
+
+        with self.lock:
+            self.requests[name].append(
+                (status_code not in expected, duration, query_count, query_duration)
+            )
+
+    def get_summary(self):
+        """
+        Return a list of dictionaries with the request count, error rate,
+        latency percentiles and average query count for each endpoint
+        """
+
+        summary = []
+
+        with self.lock:
+            for name, records in sorted(self.requests.items()):
+                durations = sorted(i[1] for i in records)
+                query_counts = [i[2] for i in records if i[2] is not None]
+                query_durations = [i[3] for i in records if i[3] is not None]
+
+                summary.append(
+                    {
+                        "endpoint": name,
+                        "requests": len(records),
+                        "error_rate": sum(i[0] for i in records) / len(records),
+                        "p50": percentile(durations, 50),
+                        "p90": percentile(durations, 90),
+                        "p99": percentile(durations, 99),
+                        "max": durations[-1],
+                        "queries": (
+                            sum(query_counts) / len(query_counts)
+                            if query_counts
+                            else None
+                        ),
+                        "query_duration": (
+                            sum(query_durations) / len(query_durations)
+                            if query_durations
+                            else None
+                        ),
+                    }
+                )
+
+        return summary
+
+
+class SimulatedVolunteer(ABC, threading.Thread):
+    def __init__(
+        self,
+        base_url,
+        results,
+        *,
+        deadline,
+        think_time,
+        seed,
+        username=None,
+        password=None,
+    ):
+        super().__init__(daemon=True)
+
+        self.username = username
+        self.password = password
+
+        self.base_url = base_url
+        self.results = results
+        self.deadline = deadline
+        self.think_time = think_time
+        self.random = random.Random(seed)
+
+        self.session = requests.Session()
+        self.stopping = threading.Event()
+
+    def request(self, name, method, path, **kwargs):
+        if method == "POST":
+            kwargs.setdefault("headers", {})["X-CSRFToken"] = self.session.cookies.get(
+                "csrftoken", ""
+            )
+
+        start_time = default_timer()
+        response = self.session.request(
+            method, urljoin(self.base_url, path), allow_redirects=False, **kwargs
+        )
+        duration = default_timer() - start_time
+
+        query_count = response.headers.get("X-Query-Count")
+        query_duration = response.headers.get("X-Query-Duration")
+
+        self.results.add(
+            name,
+            response.status_code,
+            duration,
+            int(query_count) if query_count is not None else None,
+            float(query_duration) if query_duration is not None else None,
+        )
+
+        return response
+
+    def think(self):
+        """Pause like a person reading the page before their next action"""
+
+        self.stopping.wait(self.think_time * self.random.uniform(0.5, 1.5))
+
+    def is_finished(self):
+        return self.stopping.is_set() or default_timer() >= self.deadline
+
+    def run(self):
+        try:
+            self.start_session()
+
+            while not self.is_finished():
+                if not self.run_iteration():
+                    # There was nothing left to do so there's no point in
+                    # repeatedly asking for more work:
+                    self.stopping.wait(self.think_time * 5)
+        except requests.RequestException as exc:
+            self.results.add(type(exc).__name__, None, 0, None, None)
+
+    def start_session(self):
+        """Log in, unless this is an anonymous volunteer"""
+
+        if self.username is None:
+            return
+
+        response = self.request("login_form", "GET", "/account/login/")
+        csrf_match = CSRF_TOKEN_RE.search(response.text)
+
+        response = self.request(
+            "login",
+            "POST",
+            "/account/login/",
+            data={
+                "username": self.username,
+                "password": self.password,
+                "csrfmiddlewaretoken": csrf_match.group(1) if csrf_match else "",
+            },
+        )
+        if response.status_code != 302:
+            raise requests.RequestException(f"Unable to log in as {self.username}")
+
+    @abstractmethod
+    def run_iteration(self):
+        """
+        Perform one unit of work, returning False if there was nothing to do
+        """
+
+    def open_next_asset(self, name, path):
+        """
+        Follow the redirect to the next asset, returning the asset and latest
+        transcription primary keys from the page
+        """
+
+        response = self.request(name, "GET", path)
+        if response.status_code != 302:
+            return None, None
+
+        response = self.request("asset_detail", "GET", response.headers["Location"])
+
+        asset_match = ASSET_PK_RE.search(response.text)
+        if not asset_match:
+            return None, None
+
+        transcription_match = TRANSCRIPTION_PK_RE.search(response.text)
+
+        return (
+            int(asset_match.group(1)),
+            int(transcription_match.group(1)) if transcription_match else None,
+        )
+
+
+class Transcriber(SimulatedVolunteer):
+    #: The number of reservation updates made while transcribing each asset
+    reservation_polls = (1, 5)
+
+    #: The number of times each transcription is saved before it's submitted
+    saves = (1, 3)
+
+    def run_iteration(self):
+        asset_pk, transcription_pk = self.open_next_asset(
+            "redirect_to_next_transcribable_asset", "/next-transcribable-asset/"
+        )
+        if asset_pk is None:
+            return False
+
+        for i in range(self.random.randint(*self.reservation_polls)):
+            self.request("reserve_asset", "POST", f"/reserve-asset/{asset_pk}/")
+            self.think()
+
+        try:
+            for i in range(self.random.randint(*self.saves)):
+                transcription_pk = self.save_transcription(asset_pk, transcription_pk)
+                if transcription_pk is None:
+                    return True
+                self.think()
+
+            self.request(
+                "submit_transcription",
+                "POST",
+                f"/transcriptions/{transcription_pk}/submit/",
+            )
+        finally:
+            # The browser releases the reservation when leaving the page:
+            self.request(
+                "release_reservation",
+                "POST",
+                f"/reserve-asset/{asset_pk}/",
+                data={"release": "true"},
+            )
+
+        return True
+
+    def save_transcription(self, asset_pk, supersedes_pk):
+        response = self.request(
+            "save_transcription",
+            "POST",
+            f"/assets/{asset_pk}/transcriptions/save/",
+            data={
+                "text": f"Load test transcription {self.random.random()}",
+                "supersedes": supersedes_pk or "",
+            },
+        )
+
+        if response.status_code != 201:
+            return None
+
+        return response.json()["id"]
+
+
+class AnonymousTranscriber(Transcriber):
+    def save_transcription(self, asset_pk, supersedes_pk):
+        transcription_pk = super().save_transcription(asset_pk, supersedes_pk)
+
+        if transcription_pk is None and "key" in self.last_challenge:
+            self.request(
+                "ajax_captcha",
+                "POST",
+                "/captcha/ajax/",
+                data={"key": self.last_challenge["key"], "response": "PASSED"},
+            )
+            transcription_pk = super().save_transcription(asset_pk, supersedes_pk)
+
+        return transcription_pk
+
+    def request(self, name, method, path, **kwargs):
+        response = super().request(name, method, path, **kwargs)
+
+        if response.status_code == 401:
+            self.last_challenge = response.json()
+        else:
+            self.last_challenge = {}
+
+        return response
+
+
+class Reviewer(SimulatedVolunteer):
+    #: Fraction of transcriptions which are accepted
+    acceptance_rate = 0.8
+
+    def run_iteration(self):
+        asset_pk, transcription_pk = self.open_next_asset(
+            "redirect_to_next_reviewable_asset", "/next-reviewable-asset/"
+        )
+        if transcription_pk is None:
+            return False
+
+        self.think()
+
+        self.request(
+            "review_transcription",
+            "POST",
+            f"/transcriptions/{transcription_pk}/review/",
+            data={
+                "action": "accept"
+                if self.random.random() < self.acceptance_rate
+                else "reject"
+            },
+        )
+
+        return True
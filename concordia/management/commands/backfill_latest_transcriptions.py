@@ -0,0 +1,36 @@
+"""
+Populate Asset.latest_transcription from the Transcription records
+
+The signal handlers maintain the pointer as transcriptions are saved. This
+command repairs it for existing data, processing the assets in batches so it
+can safely be run against a live database.
+"""
+
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+
+from concordia.tasks import backfill_latest_transcriptions
+
+
+class Command(BaseCommand):
+    help = "Set the latest transcription for every asset"  # NOQA: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of asset primary keys updated in each query",
+        )
+
+    def handle(self, *, batch_size, verbosity, **kwargs):
+        start_time = default_timer()
+
+        updated_count = backfill_latest_transcriptions(batch_size=batch_size)
+
+        if verbosity > 1:
+            print(
+                "Updated %d assets in %0.1f seconds"
+                % (updated_count, default_timer() - start_time)
+            )
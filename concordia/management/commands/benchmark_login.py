@@ -0,0 +1,131 @@
+"""
+Measure the latency of authenticating with a username or email address
+
+Run this against a database filled using generate_synthetic_data with a
+password and a production-sized number of users, e.g.::
+
+    ./manage.py generate_synthetic_data --users=1000000 --password=benchmark
+    ./manage.py benchmark_login --password=benchmark
+
+Each sample calls authenticate() in this process, so the results include the
+password hashing as well as the user lookup, which is also reported separately.
+"""
+
+import json
+import random
+from timeit import default_timer
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from concordia.authentication_backends import EmailOrUsernameModelBackend
+from concordia.load_testing import percentile
+from concordia.middleware import QueryCounter
+
+
+class Command(BaseCommand):
+    help = "Benchmark logging in using usernames and email addresses"  # NOQA: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed used to generate the synthetic users",
+        )
+        parser.add_argument(
+            "--password", required=True, help="Password of the synthetic users"
+        )
+        parser.add_argument(
+            "--samples", type=int, default=100, help="Logins to time for each case"
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the results as JSON"
+        )
+
+    def handle(self, *, seed, password, samples, **options):
+        prefix = f"synthetic-{seed}-user-"
+        users = User.objects.filter(username__startswith=prefix)
+
+        pk_range = list(users.order_by("pk").values_list("pk", flat=True)[:1])
+        pk_range += list(users.order_by("-pk").values_list("pk", flat=True)[:1])
+        if not pk_range:
+            raise CommandError(f"There are no synthetic users for seed {seed}")
+
+        rng = random.Random(seed)
+        sampled_pks = [rng.randint(*pk_range) for i in range(samples)]
+        sampled_users = list(
+            users.filter(pk__in=sampled_pks).values_list("username", "email")
+        )
+
+        cases = {
+            "username": [(i, password) for i, _ in sampled_users],
+            "email": [(i.upper(), password) for _, i in sampled_users],
+            "wrong password": [(i, f"not-{password}") for i, _ in sampled_users],
+            "unknown user": [
+                (f"unknown-{i}@example.com", password) for i in range(samples)
+            ],
+        }
+
+        user_count = User.objects.count()
+
+        summary = [
+            {"case": name, **self.time_logins(credentials)}
+            for name, credentials in cases.items()
+        ]
+
+        plan = (
+            EmailOrUsernameModelBackend()
+            .get_matching_users(sampled_users[0][1].upper())
+            .explain(analyze=True)
+        )
+
+        if options["json"]:
+            print(
+                json.dumps(
+                    {"user_count": user_count, "results": summary, "plan": plan},
+                    indent=2,
+                )
+            )
+            return
+
+        print("Users: %d" % user_count)
+
+        columns = ("Logins", "p50 ms", "p90 ms", "p99 ms", "Max ms", "Lookup ms")
+        print(("%-16s" + " %9s" * len(columns)) % ("Case", *columns))
+        for row in summary:
+            values = [
+                row["logins"],
+                *(
+                    "%0.1f" % (1000 * row[i])
+                    for i in ("p50", "p90", "p99", "max", "query_duration")
+                ),
+            ]
+            print(("%-16s" + " %9s" * len(values)) % (row["case"], *values))
+
+        print()
+        print(plan)
+
+    def time_logins(self, credentials):
+        durations = []
+        query_counter = QueryCounter()
+
+        with connection.execute_wrapper(query_counter):
+            for username, password in credentials:
+                start_time = default_timer()
+                authenticate(username=username, password=password)
+                durations.append(default_timer() - start_time)
+
+        durations.sort()
+
+        return {
+            "logins": len(durations),
+            "p50": percentile(durations, 50),
+            "p90": percentile(durations, 90),
+            "p99": percentile(durations, 99),
+            "max": durations[-1],
+            # The average time spent finding the matching users:
+            "query_duration": query_counter.duration / len(durations),
+        }
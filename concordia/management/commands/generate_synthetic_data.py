@@ -0,0 +1,71 @@
+"""
+Fill the database with a large, repeatable synthetic dataset for benchmarking
+
+This is intended for development databases: the records are loaded directly
+without running any signal handlers and are not added to the search indices.
+"""
+
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand, CommandError
+
+from concordia.synthetic_data import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic campaigns, assets, transcriptions and users"  # NOQA: A003
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed which determines the generated values and names",
+        )
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--topics", type=int, default=5)
+        parser.add_argument("--tags", type=int, default=500)
+        parser.add_argument("--campaigns", type=int, default=10)
+        parser.add_argument("--projects-per-campaign", type=int, default=5)
+        parser.add_argument("--items-per-project", type=int, default=50)
+        parser.add_argument("--assets-per-item", type=int, default=40)
+        parser.add_argument(
+            "--password",
+            help="Password for every generated user. By default they cannot log in",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Approximate number of assets loaded in each COPY",
+        )
+
+    def handle(self, *, seed, verbosity, **kwargs):
+        generator = SyntheticDataGenerator(
+            seed,
+            users=kwargs["users"],
+            topics=kwargs["topics"],
+            tags=kwargs["tags"],
+            campaigns=kwargs["campaigns"],
+            projects_per_campaign=kwargs["projects_per_campaign"],
+            items_per_project=kwargs["items_per_project"],
+            assets_per_item=kwargs["assets_per_item"],
+            password=kwargs["password"],
+            chunk_size=kwargs["chunk_size"],
+        )
+
+        if generator.exists():
+            raise CommandError(
+                f"Synthetic data has already been generated using seed {seed}"
+            )
+
+        start_time = default_timer()
+
+        counts = generator.generate()
+
+        if verbosity > 1:
+            for name, count in counts.items():
+                print("Created %d %s" % (count, name))
+            print("Finished in %0.1f seconds" % (default_timer() - start_time))
@@ -0,0 +1,44 @@
+"""
+Rebuild the Elasticsearch indices without interrupting search
+
+Each index is loaded into a new versioned index by parallel Celery tasks and
+the live alias is switched to it once every chunk has completed. Unlike the
+search_index --rebuild command, searches continue to use the old index until
+the new one is ready.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django_elasticsearch_dsl.registries import registry
+
+from concordia.tasks import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Queue background rebuilds of the search indices"  # NOQA: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "documents",
+            nargs="*",
+            metavar="DOCUMENT",
+            help="Document class names to rebuild (default: all)",
+        )
+
+    def handle(self, *, documents, verbosity, **kwargs):
+        available = sorted(i.__name__ for i in registry.get_documents())
+
+        if not documents:
+            documents = available
+
+        unknown = set(documents).difference(available)
+        if unknown:
+            raise CommandError(
+                "Unknown documents: %s (available: %s)"
+                % (", ".join(sorted(unknown)), ", ".join(available))
+            )
+
+        for document_name in documents:
+            result = rebuild_search_index.delay(document_name)
+
+            if verbosity > 1:
+                print(f"Queued rebuild of {document_name} as task {result.id}")
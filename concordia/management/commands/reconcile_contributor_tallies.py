@@ -0,0 +1,27 @@
+"""
+Rebuild the campaign, project and item contributor tallies from the
+transcription history
+"""
+
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+
+from concordia.tasks import reconcile_contributor_tallies
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the exact contributor tallies from all transcriptions"  # NOQA: A003
+    )
+
+    def handle(self, *, verbosity, **kwargs):
+        start_time = default_timer()
+
+        tally_count = reconcile_contributor_tallies()
+
+        if verbosity > 1:
+            print(
+                "Recorded %d contributor tallies in %0.1f seconds"
+                % (tally_count, default_timer() - start_time)
+            )
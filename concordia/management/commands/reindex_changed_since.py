@@ -0,0 +1,44 @@
+"""
+Update the Elasticsearch indices for every record changed since a timestamp
+
+This is useful for catching up after the search cluster has been unavailable
+without rebuilding the entire index using the search_index command.
+"""
+
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from concordia.search_index import update_search_indices_changed_since
+
+
+class Command(BaseCommand):
+    help = "Reindex all records modified since the provided date or time"  # NOQA: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "since", help="ISO-8601 date or timestamp (e.g. 2020-03-25T14:30)"
+        )
+
+    def handle(self, *, since, verbosity, **kwargs):
+        timestamp = parse_datetime(since)
+        if timestamp is None:
+            date = parse_date(since)
+            if date is None:
+                raise CommandError(f"Invalid date or timestamp: {since}")
+            timestamp = parse_datetime(f"{date.isoformat()}T00:00")
+
+        if is_naive(timestamp):
+            timestamp = make_aware(timestamp)
+
+        start_time = default_timer()
+
+        indexed_count = update_search_indices_changed_since(timestamp)
+
+        if verbosity > 1:
+            print(
+                "Indexed %d records changed since %s in %0.1f seconds"
+                % (indexed_count, timestamp.isoformat(), default_timer() - start_time)
+            )
@@ -0,0 +1,138 @@
+"""
+Run an HTTP load test of the volunteer workflow against a local server
+
+Start the server using the load testing settings against a database filled
+using generate_synthetic_data with a password, e.g.::
+
+    DJANGO_SETTINGS_MODULE=concordia.settings_loadtest gunicorn concordia.wsgi
+    ./manage.py run_load_test --password=benchmark --duration=120
+
+The simulated volunteers log in as the synthetic users for the seed, which
+are looked up in the local database.
+"""
+
+import json
+from timeit import default_timer
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from concordia.load_testing import (
+    AnonymousTranscriber,
+    LoadTestResults,
+    Reviewer,
+    Transcriber,
+)
+from concordia.synthetic_data import split_reviewers
+
+
+class Command(BaseCommand):
+    help = "Load test the transcription and review workflow"  # NOQA: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000/")
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed used to generate the synthetic users",
+        )
+        parser.add_argument(
+            "--password", required=True, help="Password of the synthetic users"
+        )
+        parser.add_argument("--transcribers", type=int, default=10)
+        parser.add_argument("--reviewers", type=int, default=2)
+        parser.add_argument("--anonymous", type=int, default=5)
+        parser.add_argument(
+            "--duration", type=int, default=60, help="Length of the test in seconds"
+        )
+        parser.add_argument(
+            "--think-time",
+            type=float,
+            default=1.0,
+            help="Average seconds each volunteer waits between actions",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the results as JSON"
+        )
+
+    def handle(self, *, base_url, seed, password, duration, think_time, **options):
+        usernames = list(
+            User.objects.filter(username__startswith=f"synthetic-{seed}-user-")
+            .order_by("pk")
+            .values_list("username", flat=True)
+        )
+        reviewer_usernames, transcriber_usernames = split_reviewers(usernames)
+        reviewer_usernames = reviewer_usernames[: options["reviewers"]]
+        transcriber_usernames = transcriber_usernames[: options["transcribers"]]
+
+        if (
+            len(reviewer_usernames) < options["reviewers"]
+            or len(transcriber_usernames) < options["transcribers"]
+        ):
+            raise CommandError(f"There are not enough synthetic users for seed {seed}")
+
+        results = LoadTestResults()
+        kwargs = {
+            "deadline": default_timer() + duration,
+            "think_time": think_time,
+        }
+
+        volunteers = [
+            Transcriber(
+                base_url,
+                results,
+                username=username,
+                password=password,
+                seed=i,
+                **kwargs,
+            )
+            for i, username in enumerate(transcriber_usernames)
+        ]
+        volunteers.extend(
+            Reviewer(
+                base_url,
+                results,
+                username=username,
+                password=password,
+                seed=i,
+                **kwargs,
+            )
+            for i, username in enumerate(reviewer_usernames)
+        )
+        volunteers.extend(
+            AnonymousTranscriber(base_url, results, seed=i, **kwargs)
+            for i in range(options["anonymous"])
+        )
+
+        for volunteer in volunteers:
+            volunteer.start()
+
+        try:
+            for volunteer in volunteers:
+                volunteer.join()
+        except KeyboardInterrupt:
+            for volunteer in volunteers:
+                volunteer.stopping.set()
+
+        summary = results.get_summary()
+
+        if options["json"]:
+            print(json.dumps(summary, indent=2))
+            return
+
+        columns = ("Requests", "Errors", "p50 ms", "p90 ms", "p99 ms", "Max ms")
+        columns += ("Queries", "DB ms")
+        print(("%-38s" + " %8s" * len(columns)) % ("Endpoint", *columns))
+
+        for row in summary:
+            values = [
+                row["requests"],
+                "%0.1f%%" % (100 * row["error_rate"]),
+                *("%0.0f" % (1000 * row[i]) for i in ("p50", "p90", "p99", "max")),
+                "%0.1f" % row["queries"] if row["queries"] is not None else "-",
+                "%0.1f" % (1000 * row["query_duration"])
+                if row["query_duration"] is not None
+                else "-",
+            ]
+            print(("%-38s" + " %8s" * len(values)) % (row["endpoint"], *values))
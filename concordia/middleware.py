@@ -0,0 +1,147 @@
+from collections import Counter
+from contextvars import ContextVar
+from logging import getLogger
+from timeit import default_timer
+
+from django.conf import settings
+from django.db import connection
+from prometheus_client import Counter as MetricCounter
+from prometheus_client import Histogram
+
+logger = getLogger(__name__)
+
+view_db_queries = Histogram(
+    "django_view_db_queries",
+    "Histogram of the number of database queries made by each request",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf")),
+)
+view_db_duration = Histogram(
+    "django_view_db_duration_seconds",
+    "Histogram of the time spent waiting for the database by each request",
+    ["view"],
+)
+view_response_size = Histogram(
+    "django_view_response_size_bytes",
+    "Histogram of the size of each response body, excluding streaming responses",
+    ["view"],
+    buckets=tuple(2**i for i in range(8, 26, 2)) + (float("inf"),),
+)
+view_cache_lookups = MetricCounter(
+    "django_view_cache_lookups_total",
+    "Total count of cache lookups made by each view",
+    ["view", "result"],
+)
+
+#: The cache lookups made while handling the current request
+_request_cache_lookups = ContextVar("request_cache_lookups", default=None)
+
+
+def record_cache_lookups(*, hits=0, misses=0):
+    """Count cache lookups towards the metrics for the current request"""
+
+    lookups = _request_cache_lookups.get()
+
+    if lookups is not None:
+        lookups["hit"] += hits
+        lookups["miss"] += misses
+
+
+class QueryCounter(object):
+    """
+    Database execute wrapper which records the number of queries and the total
+    time spent waiting for them
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start_time = default_timer()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += default_timer() - start_time
+
+
+class QueryCountHeaderMiddleware(object):
+    """
+    Report the database queries made while handling each request using the
+    X-Query-Count and X-Query-Duration (in seconds) response headers
+
+    This is intended for load testing, where DEBUG is disabled so the queries
+    are not otherwise recorded, and should be placed first in MIDDLEWARE so
+    the session and authentication queries are included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+
+        response["X-Query-Count"] = counter.count
+        response["X-Query-Duration"] = f"{counter.duration:0.6f}"
+
+        return response
+
+
+class ViewMetricsMiddleware(object):
+    """
+    Record the database queries, cache lookups and response size for each
+    view as Prometheus metrics, alongside the request latency which
+    django_prometheus_metrics records using the same view labels
+
+    Views which make more database queries than their entry in the
+    QUERY_BUDGETS setting, keyed by the name used to reverse the URL, are
+    logged as warnings to make N+1 query regressions visible.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        cache_lookups = Counter()
+        token = _request_cache_lookups.set(cache_lookups)
+
+        try:
+            with connection.execute_wrapper(counter):
+                response = self.get_response(request)
+        finally:
+            _request_cache_lookups.reset(token)
+
+        resolver_match = request.resolver_match
+        if resolver_match:
+            view = (resolver_match.url_name or resolver_match.view_name).replace(
+                "-", "_"
+            )
+        else:
+            view = "<unnamed view>"
+
+        view_db_queries.labels(view).observe(counter.count)
+        view_db_duration.labels(view).observe(counter.duration)
+
+        for result, count in cache_lookups.items():
+            view_cache_lookups.labels(view, result).inc(count)
+
+        if not response.streaming:
+            view_response_size.labels(view).observe(len(response.content))
+
+        if resolver_match:
+            budget = settings.QUERY_BUDGETS.get(resolver_match.view_name)
+            if budget is not None and counter.count > budget:
+                logger.warning(
+                    "%s made %d database queries, exceeding its budget of %d",
+                    resolver_match.view_name,
+                    counter.count,
+                    budget,
+                    extra={"path": request.path},
+                )
+
+        return response
@@ -0,0 +1,136 @@
+# Generated by Django 2.2.15 on 2026-10-19 04:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_contributor_tallies(apps, schema_editor):
+    Transcription = apps.get_model("concordia", "Transcription")
+
+    for model_name, scope_field, lookup in (
+        ("CampaignContributor", "campaign_id", "asset__item__project__campaign"),
+        ("ProjectContributor", "project_id", "asset__item__project"),
+        ("ItemContributor", "item_id", "asset__item"),
+    ):
+        model = apps.get_model("concordia", model_name)
+
+        for user_field in ("user", "reviewed_by"):
+            contributor_qs = (
+                Transcription.objects.filter(
+                    asset__published=True, **{f"{user_field}__isnull": False}
+                )
+                .values_list(lookup, user_field)
+                .order_by()
+                .distinct()
+            )
+            model.objects.bulk_create(
+                (
+                    model(user_id=user_id, **{scope_field: scope_id})
+                    for scope_id, user_id in contributor_qs.iterator()
+                ),
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("concordia", "0049_auto_20200324_2004"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignContributor",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="concordia.Campaign",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("campaign", "user")}},
+        ),
+        migrations.CreateModel(
+            name="ProjectContributor",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="concordia.Project",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("project", "user")}},
+        ),
+        migrations.CreateModel(
+            name="ItemContributor",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="concordia.Item",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("item", "user")}},
+        ),
+        migrations.RunPython(populate_contributor_tallies, migrations.RunPython.noop),
+    ]
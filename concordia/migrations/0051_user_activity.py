@@ -0,0 +1,111 @@
+# Generated by Django 2.2.15 on 2026-10-19 04:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+POPULATE_USER_ASSET_ACTIVITY = """
+INSERT INTO concordia_userassetactivity
+    (user_id, asset_id, last_transcribed, last_reviewed)
+SELECT user_id, asset_id, MAX(last_transcribed), MAX(last_reviewed)
+FROM (
+    SELECT user_id, asset_id, created_on AS last_transcribed,
+        NULL::timestamp with time zone AS last_reviewed
+    FROM concordia_transcription
+    UNION ALL
+    SELECT reviewed_by_id, asset_id, NULL, updated_on
+    FROM concordia_transcription
+    WHERE reviewed_by_id IS NOT NULL
+) AS activity
+GROUP BY user_id, asset_id
+"""
+
+POPULATE_USER_CAMPAIGN_ACTIVITY = """
+INSERT INTO concordia_usercampaignactivity (user_id, campaign_id, action_count)
+SELECT activity.user_id, concordia_project.campaign_id, COUNT(*)
+FROM (
+    SELECT id, user_id, asset_id FROM concordia_transcription
+    UNION
+    SELECT id, reviewed_by_id, asset_id
+    FROM concordia_transcription
+    WHERE reviewed_by_id IS NOT NULL
+) AS activity
+INNER JOIN concordia_asset ON concordia_asset.id = activity.asset_id
+INNER JOIN concordia_item ON concordia_item.id = concordia_asset.item_id
+INNER JOIN concordia_project ON concordia_project.id = concordia_item.project_id
+GROUP BY activity.user_id, concordia_project.campaign_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("concordia", "0050_contributor_tallies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserAssetActivity",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_transcribed", models.DateTimeField(blank=True, null=True)),
+                ("last_reviewed", models.DateTimeField(blank=True, null=True)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="concordia.Asset",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("user", "asset")}},
+        ),
+        migrations.CreateModel(
+            name="UserCampaignActivity",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("action_count", models.IntegerField(default=0)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="concordia.Campaign",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("user", "campaign")}},
+        ),
+        migrations.RunSQL(POPULATE_USER_ASSET_ACTIVITY, migrations.RunSQL.noop),
+        migrations.RunSQL(POPULATE_USER_CAMPAIGN_ACTIVITY, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 2.2.15 on 2026-10-19 05:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_ASSET_SEARCH_DOCUMENTS = """
+INSERT INTO concordia_assetsearchdocument (asset_id, search_vector)
+SELECT DISTINCT ON (asset_id) asset_id, to_tsvector('english', text)
+FROM concordia_transcription
+ORDER BY asset_id, id DESC
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("concordia", "0052_searchindexchange")]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetSearchDocument",
+            fields=[
+                (
+                    "asset",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="concordia.Asset",
+                    ),
+                ),
+                ("search_vector", django.contrib.postgres.search.SearchVectorField()),
+            ],
+        ),
+        # Building the index after loading the existing transcriptions is
+        # considerably faster than updating it for each row:
+        migrations.RunSQL(POPULATE_ASSET_SEARCH_DOCUMENTS, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="assetsearchdocument",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="concordia_a_search__2f24cc_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 2.2.15 on 2026-10-19 05:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_LATEST_TRANSCRIPTIONS = """
+UPDATE concordia_asset
+SET latest_transcription_id = latest.id
+FROM (
+    SELECT DISTINCT ON (asset_id) asset_id, id
+    FROM concordia_transcription
+    ORDER BY asset_id, id DESC
+) AS latest
+WHERE concordia_asset.id = latest.asset_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("concordia", "0053_assetsearchdocument")]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="latest_transcription",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="concordia.Transcription",
+            ),
+        ),
+        migrations.RunSQL(POPULATE_LATEST_TRANSCRIPTIONS, migrations.RunSQL.noop),
+    ]
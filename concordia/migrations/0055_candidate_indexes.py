@@ -0,0 +1,64 @@
+# Generated by Django 2.2.15 on 2026-10-19 06:14
+
+from django.db import migrations, models
+
+# Django 2.2 cannot declare expression indexes so this one, which matches the
+# ordering used by AccountProfileView, is managed here rather than in the
+# model's Meta.indexes:
+CREATE_RECENT_ACTIVITY_INDEX = """
+CREATE INDEX userassetactivity_recent_idx ON concordia_userassetactivity
+    (user_id, COALESCE(last_reviewed, last_transcribed) DESC, id DESC)
+"""
+
+DROP_RECENT_ACTIVITY_INDEX = "DROP INDEX userassetactivity_recent_idx"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("concordia", "0054_asset_latest_transcription")]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(
+                    ("published", True),
+                    ("transcription_status__in", ("not_started", "in_progress")),
+                ),
+                fields=["item", "sequence"],
+                name="asset_transcribable_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(
+                    ("published", True), ("transcription_status", "submitted")
+                ),
+                fields=["item", "sequence"],
+                name="asset_reviewable_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(
+                    ("published", True),
+                    ("transcription_status__in", ("not_started", "in_progress")),
+                ),
+                fields=["id"],
+                name="asset_transcribable_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(
+                    ("published", True), ("transcription_status", "submitted")
+                ),
+                fields=["id"],
+                name="asset_reviewable_id_idx",
+            ),
+        ),
+        migrations.RunSQL(CREATE_RECENT_ACTIVITY_INDEX, DROP_RECENT_ACTIVITY_INDEX),
+    ]
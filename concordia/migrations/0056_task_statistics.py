@@ -0,0 +1,44 @@
+# Generated by Django 2.2.15 on 2026-10-19 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("concordia", "0055_candidate_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskStatistics",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_name", models.CharField(max_length=255)),
+                ("period_start", models.DateTimeField(db_index=True)),
+                ("runs", models.PositiveIntegerField(default=0)),
+                ("failures", models.PositiveIntegerField(default=0)),
+                ("retries", models.PositiveIntegerField(default=0)),
+                ("runtime", models.FloatField(default=0)),
+                ("max_runtime", models.FloatField(default=0)),
+                ("queue_wait", models.FloatField(default=0)),
+                ("max_queue_wait", models.FloatField(default=0)),
+                ("db_queries", models.PositiveIntegerField(default=0)),
+                ("db_duration", models.FloatField(default=0)),
+                ("http_requests", models.PositiveIntegerField(default=0)),
+                ("http_bytes", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "task statistics",
+                "unique_together": {("task_name", "period_start")},
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 2.2.15 on 2026-10-19 05:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("concordia", "0056_task_statistics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BulkActionJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("publish_items", "Publish items"),
+                            ("unpublish_items", "Unpublish items"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("description", models.CharField(max_length=255)),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of records which will be processed"
+                    ),
+                ),
+                (
+                    "processed",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of records which have been processed",
+                    ),
+                ),
+                (
+                    "last_started",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Last time when a worker started processing this job",
+                        null=True,
+                    ),
+                ),
+                (
+                    "completed",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Time when the job completed without error",
+                        null=True,
+                    ),
+                ),
+                (
+                    "failed",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Time when the job failed due to an error",
+                        null=True,
+                    ),
+                ),
+                (
+                    "status",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Status message, if any, from the last worker",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-created_on",),
+            },
+        ),
+    ]
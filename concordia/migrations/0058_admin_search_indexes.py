@@ -0,0 +1,29 @@
+from django.db import migrations
+
+# The admin searches assets by the prefix of their title or item ID. Django
+# 2.2 cannot declare expression indexes and these must match the
+# UPPER(column::text) expression used for case-insensitive lookups, with the
+# pattern operator class so they can be used for LIKE 'prefix%':
+CREATE_ITEM_ID_INDEX = """
+CREATE INDEX item_item_id_upper_idx ON concordia_item
+    (UPPER(item_id::text) text_pattern_ops)
+"""
+
+DROP_ITEM_ID_INDEX = "DROP INDEX item_item_id_upper_idx"
+
+CREATE_ASSET_TITLE_INDEX = """
+CREATE INDEX asset_title_upper_idx ON concordia_asset
+    (UPPER(title::text) text_pattern_ops)
+"""
+
+DROP_ASSET_TITLE_INDEX = "DROP INDEX asset_title_upper_idx"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("concordia", "0057_bulk_action_job")]
+
+    operations = [
+        migrations.RunSQL(CREATE_ITEM_ID_INDEX, DROP_ITEM_ID_INDEX),
+        migrations.RunSQL(CREATE_ASSET_TITLE_INDEX, DROP_ASSET_TITLE_INDEX),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.15 on 2026-10-19 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("concordia", "0058_admin_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="bulkactionjob",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("publish_items", "Publish items"),
+                    ("unpublish_items", "Unpublish items"),
+                    ("delete_items", "Delete items"),
+                    ("delete_projects", "Delete projects"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 2.2.15 on 2026-10-19 06:33
+
+import django.core.validators
+from django.db import migrations, models
+
+# Tags were previously created without a unique constraint so concurrent
+# submissions could create the same value more than once. Collections using a
+# duplicate are moved to the oldest tag with that value before the duplicates
+# are removed. The constraints are checked immediately so the table can be
+# altered in the same transaction:
+MERGE_DUPLICATE_TAGS = """
+SET CONSTRAINTS ALL IMMEDIATE;
+
+CREATE TEMPORARY TABLE duplicate_tags ON COMMIT DROP AS
+    SELECT tag.id, canonical.id AS canonical_id
+    FROM concordia_tag AS tag
+    INNER JOIN (
+        SELECT value, MIN(id) AS id FROM concordia_tag GROUP BY value
+    ) AS canonical ON canonical.value = tag.value
+    WHERE tag.id <> canonical.id;
+
+INSERT INTO concordia_userassettagcollection_tags (userassettagcollection_id, tag_id)
+    SELECT tag_through.userassettagcollection_id, duplicate_tags.canonical_id
+    FROM concordia_userassettagcollection_tags AS tag_through
+    INNER JOIN duplicate_tags ON duplicate_tags.id = tag_through.tag_id
+    ON CONFLICT DO NOTHING;
+
+DELETE FROM concordia_userassettagcollection_tags
+    WHERE tag_id IN (SELECT id FROM duplicate_tags);
+
+DELETE FROM concordia_tag WHERE id IN (SELECT id FROM duplicate_tags);
+"""
+
+# Django did not remove the pattern index when the earlier unique constraint on
+# this column was dropped and adding the constraint again recreates it:
+DROP_STALE_LIKE_INDEX = "DROP INDEX IF EXISTS concordia_tag_value_374a9b09_like"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("concordia", "0059_bulk_delete_actions")]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATE_TAGS, migrations.RunSQL.noop),
+        migrations.RunSQL(DROP_STALE_LIKE_INDEX, migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name="tag",
+            name="value",
+            field=models.CharField(
+                max_length=50,
+                unique=True,
+                validators=[
+                    django.core.validators.RegexValidator("^[- _À-ž'\\w]{1,50}$")
+                ],
+            ),
+        ),
+    ]
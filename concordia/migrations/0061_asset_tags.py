@@ -0,0 +1,53 @@
+# Generated by Django 2.2.15 on 2026-10-19 07:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_ASSET_TAGS = """
+INSERT INTO concordia_assettag (asset_id, tag_id, user_count)
+SELECT collection.asset_id, collection_tag.tag_id, COUNT(*)
+FROM concordia_userassettagcollection AS collection
+INNER JOIN concordia_userassettagcollection_tags AS collection_tag
+    ON collection_tag.userassettagcollection_id = collection.id
+GROUP BY collection.asset_id, collection_tag.tag_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("concordia", "0060_unique_tag_values")]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetTag",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_count", models.PositiveIntegerField(default=0)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="concordia.Asset",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="concordia.Tag"
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("asset", "tag")},
+            },
+        ),
+        migrations.RunSQL(POPULATE_ASSET_TAGS, migrations.RunSQL.noop),
+    ]
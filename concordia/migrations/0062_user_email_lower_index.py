@@ -0,0 +1,21 @@
+from django.db import migrations
+
+# EmailOrUsernameModelBackend looks up users by LOWER(email) so every login
+# attempt does not scan the users table. Django 2.2 cannot declare expression
+# indexes and auth.User is not ours to add Meta.indexes to so it is managed
+# here:
+CREATE_EMAIL_LOWER_INDEX = """
+CREATE INDEX auth_user_email_lower_idx ON auth_user (LOWER(email::text))
+"""
+
+DROP_EMAIL_LOWER_INDEX = "DROP INDEX auth_user_email_lower_idx"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0011_update_proxy_permissions"),
+        ("concordia", "0061_asset_tags"),
+    ]
+
+    operations = [migrations.RunSQL(CREATE_EMAIL_LOWER_INDEX, DROP_EMAIL_LOWER_INDEX)]
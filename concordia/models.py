@@ -2,11 +2,14 @@ from logging import getLogger
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
-from django.db import models
-from django.db.models import Count
+from django.db import connection, models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
 from django.urls import reverse
 from django_prometheus_metrics.models import MetricsModelMixin
 
@@ -14,6 +17,9 @@ logger = getLogger(__name__)
 
 metadata_default = dict
 
+#: Postgres text search configuration used to index and query transcriptions
+TRANSCRIPTION_SEARCH_CONFIG = "english"
+
 User._meta.get_field("email").__dict__["_unique"] = True
 
 
@@ -53,6 +59,25 @@ class TranscriptionStatus(object):
     CHOICE_MAP = dict(CHOICES)
 
 
+class BulkAction:
+    """
+    Admin actions which are processed in the background for large selections
+    """
+
+    PUBLISH_ITEMS = "publish_items"
+    UNPUBLISH_ITEMS = "unpublish_items"
+    DELETE_ITEMS = "delete_items"
+    DELETE_PROJECTS = "delete_projects"
+
+    CHOICES = (
+        (PUBLISH_ITEMS, "Publish items"),
+        (UNPUBLISH_ITEMS, "Unpublish items"),
+        (DELETE_ITEMS, "Delete items"),
+        (DELETE_PROJECTS, "Delete projects"),
+    )
+    CHOICE_MAP = dict(CHOICES)
+
+
 class MediaType:
     IMAGE = "IMG"
     AUDIO = "AUD"
@@ -225,6 +250,19 @@ class Item(MetricsModelMixin("item"), models.Model):
         )
 
 
+TRANSCRIBABLE_ASSET_Q = models.Q(
+    published=True,
+    transcription_status__in=(
+        TranscriptionStatus.NOT_STARTED,
+        TranscriptionStatus.IN_PROGRESS,
+    ),
+)
+
+REVIEWABLE_ASSET_Q = models.Q(
+    published=True, transcription_status=TranscriptionStatus.SUBMITTED
+)
+
+
 class AssetQuerySet(PublicationQuerySet):
     def add_contribution_counts(self):
         """Add annotations for the number of transcriptions & users"""
@@ -235,6 +273,119 @@ class AssetQuerySet(PublicationQuerySet):
             reviewer_count=Count("transcription__reviewed_by", distinct=True),
         )
 
+    def update_latest_transcriptions(self):
+        """
+        Set latest_transcription for the selected assets from their
+        Transcription records, returning the number of assets updated
+        """
+
+        latest_transcription_qs = (
+            Transcription.objects.filter(asset=OuterRef("pk"))
+            .order_by("-pk")
+            .values("pk")
+        )
+
+        return self.update(latest_transcription=Subquery(latest_transcription_qs[:1]))
+
+    def search_transcriptions(self, text):
+        """
+        Filter to assets whose latest transcription matches the provided text,
+        annotated with a search_rank value for ordering
+        """
+
+        query = SearchQuery(text, config=TRANSCRIPTION_SEARCH_CONFIG)
+
+        return self.filter(search_document__search_vector=query).annotate(
+            search_rank=SearchRank(F("search_document__search_vector"), query)
+        )
+
+    def update_tag_summaries(self):
+        """
+        Replace the AssetTag records for the selected assets with the tags in
+        their users' UserAssetTagCollection records
+
+        The assets are locked until the end of the transaction so concurrent
+        changes to the same asset's tags are summarized one after the other,
+        with the last one seeing all of the others' committed changes.
+        """
+
+        asset_sql, asset_params = self.values("pk").query.sql_with_params()
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # NO KEY UPDATE does not block inserting rows which refer to the
+            # assets, such as transcriptions:
+            cursor.execute(
+                f"""
+                SELECT id FROM concordia_asset
+                WHERE id IN ({asset_sql})
+                ORDER BY id
+                FOR NO KEY UPDATE
+                """,
+                asset_params,
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO concordia_assettag (asset_id, tag_id, user_count)
+                SELECT collection.asset_id, collection_tag.tag_id, COUNT(*)
+                FROM concordia_userassettagcollection AS collection
+                INNER JOIN concordia_userassettagcollection_tags AS collection_tag
+                    ON collection_tag.userassettagcollection_id = collection.id
+                WHERE collection.asset_id IN ({asset_sql})
+                GROUP BY collection.asset_id, collection_tag.tag_id
+                ON CONFLICT (asset_id, tag_id)
+                DO UPDATE SET user_count = EXCLUDED.user_count
+                """,
+                asset_params,
+            )
+            cursor.execute(
+                f"""
+                DELETE FROM concordia_assettag AS asset_tag
+                WHERE asset_tag.asset_id IN ({asset_sql})
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM concordia_userassettagcollection AS collection
+                    INNER JOIN concordia_userassettagcollection_tags AS collection_tag
+                        ON collection_tag.userassettagcollection_id = collection.id
+                    WHERE collection.asset_id = asset_tag.asset_id
+                    AND collection_tag.tag_id = asset_tag.tag_id
+                )
+                """,
+                asset_params,
+            )
+
+    def update_search_documents(self):
+        """
+        Replace the AssetSearchDocument records for the selected assets with
+        the text of each asset's latest transcription
+        """
+
+        asset_sql, asset_params = self.values("pk").query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO concordia_assetsearchdocument (asset_id, search_vector)
+                SELECT asset.id, to_tsvector(%s::regconfig, transcription.text)
+                FROM concordia_asset AS asset
+                INNER JOIN concordia_transcription AS transcription
+                    ON transcription.id = asset.latest_transcription_id
+                WHERE asset.id IN ({asset_sql})
+                ON CONFLICT (asset_id)
+                DO UPDATE SET search_vector = EXCLUDED.search_vector
+                """,
+                [TRANSCRIPTION_SEARCH_CONFIG, *asset_params],
+            )
+            cursor.execute(
+                f"""
+                DELETE FROM concordia_assetsearchdocument AS asd
+                USING concordia_asset AS asset
+                WHERE asd.asset_id IN ({asset_sql})
+                AND asset.id = asd.asset_id
+                AND asset.latest_transcription_id IS NULL
+                """,
+                asset_params,
+            )
+
 
 class Asset(MetricsModelMixin("asset"), models.Model):
     objects = AssetQuerySet.as_manager()
@@ -275,11 +426,45 @@ class Asset(MetricsModelMixin("asset"), models.Model):
 
     difficulty = models.PositiveIntegerField(default=0, blank=True, null=True)
 
+    # Like transcription_status, this is maintained by the Transcription signal
+    # handlers so the most recent transcription can be loaded using a join:
+    latest_transcription = models.ForeignKey(
+        "Transcription",
+        editable=False,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
     class Meta:
         unique_together = (("slug", "item"),)
         indexes = [
             models.Index(fields=["id", "item", "published", "transcription_status"]),
             models.Index(fields=["published", "transcription_status"]),
+            # Candidates for the next asset to transcribe or review, which are
+            # a small part of the table, looked up for each item in a campaign:
+            models.Index(
+                fields=["item", "sequence"],
+                name="asset_transcribable_idx",
+                condition=TRANSCRIBABLE_ASSET_Q,
+            ),
+            models.Index(
+                fields=["item", "sequence"],
+                name="asset_reviewable_idx",
+                condition=REVIEWABLE_ASSET_Q,
+            ),
+            # The transcribe and review lists are paginated in primary key order:
+            models.Index(
+                fields=["id"],
+                name="asset_transcribable_id_idx",
+                condition=TRANSCRIBABLE_ASSET_Q,
+            ),
+            models.Index(
+                fields=["id"],
+                name="asset_reviewable_id_idx",
+                condition=REVIEWABLE_ASSET_Q,
+            ),
         ]
 
     def __str__(self):
@@ -296,13 +481,10 @@ class Asset(MetricsModelMixin("asset"), models.Model):
             },
         )
 
-    def latest_transcription(self):
-        return self.transcription_set.order_by("-pk").first()
-
 
 class Tag(MetricsModelMixin("tag"), models.Model):
     TAG_VALIDATOR = RegexValidator(r"^[- _À-ž'\w]{1,50}$")
-    value = models.CharField(max_length=50, validators=[TAG_VALIDATOR])
+    value = models.CharField(max_length=50, unique=True, validators=[TAG_VALIDATOR])
 
     def __str__(self):
         return self.value
@@ -323,6 +505,24 @@ class UserAssetTagCollection(
         return "{} - {}".format(self.asset, self.user)
 
 
+class AssetTag(models.Model):
+    """
+    Number of users who have applied a tag to an asset
+
+    This is maintained from the UserAssetTagCollection records by
+    AssetQuerySet.update_tag_summaries() so an asset's tags can be displayed
+    and reported without combining every user's tag collection.
+    """
+
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+    user_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = (("asset", "tag"),)
+
+
 class Transcription(MetricsModelMixin("transcription"), models.Model):
     asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
 
@@ -389,6 +589,99 @@ class Transcription(MetricsModelMixin("transcription"), models.Model):
             return TranscriptionStatus.CHOICE_MAP[TranscriptionStatus.IN_PROGRESS]
 
 
+class ContributorTally(models.Model):
+    """
+    Records that a user has transcribed or reviewed at least one asset within a
+    campaign, project or item so the number of distinct contributors can be
+    counted without scanning every transcription.
+
+    Rows are added as transcriptions are saved and the full set can be rebuilt
+    from the transcription history using the reconcile_contributor_tallies
+    management command.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+
+    class Meta:
+        abstract = True
+
+
+class CampaignContributor(ContributorTally):
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = (("campaign", "user"),)
+
+
+class ProjectContributor(ContributorTally):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = (("project", "user"),)
+
+
+class ItemContributor(ContributorTally):
+    item = models.ForeignKey(Item, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = (("item", "user"),)
+
+
+class UserAssetActivity(models.Model):
+    """
+    Summary of a user's most recent transcription and review of an asset
+
+    This is maintained by the Transcription signal handlers so the account
+    profile page does not need to aggregate the user's transcription history.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
+
+    last_transcribed = models.DateTimeField(blank=True, null=True)
+    last_reviewed = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = (("user", "asset"),)
+
+
+class UserCampaignActivity(models.Model):
+    """
+    Number of transcriptions a user has created or reviewed in a campaign
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE)
+
+    action_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (("user", "campaign"),)
+
+
+class AssetSearchDocument(models.Model):
+    """
+    Full-text search vector for the latest transcription of an asset
+
+    This is kept in its own table so the vector is not loaded with every Asset
+    and is maintained by the Transcription signal handlers using
+    AssetQuerySet.update_search_documents().
+    """
+
+    asset = models.OneToOneField(
+        Asset,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    search_vector = SearchVectorField()
+
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"])]
+
+
 class AssetTranscriptionReservation(models.Model):
     """
     Records a user's reservation to transcribe a particular asset
@@ -517,3 +810,105 @@ class SiteReport(models.Model):
         "users_registered",
         "users_activated",
     ]
+
+
+class SearchIndexChange(models.Model):
+    """
+    Queue of records which need to be updated in the search indices
+
+    See concordia.search_index.QueuedSignalProcessor
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+
+    created_on = models.DateTimeField(editable=False, auto_now_add=True)
+
+    class Meta:
+        unique_together = (("content_type", "object_id"),)
+
+    def __str__(self):
+        return f"{self.content_type} #{self.object_id}"
+
+
+class TaskStatistics(models.Model):
+    """
+    Hourly totals for each Celery task, recorded by concordia.task_metrics and
+    summarized on the task health admin page
+    """
+
+    task_name = models.CharField(max_length=255)
+    period_start = models.DateTimeField(db_index=True)
+
+    runs = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    retries = models.PositiveIntegerField(default=0)
+
+    #: Seconds spent running the task
+    runtime = models.FloatField(default=0)
+    max_runtime = models.FloatField(default=0)
+    #: Seconds between the task being queued (or its ETA) and starting
+    queue_wait = models.FloatField(default=0)
+    max_queue_wait = models.FloatField(default=0)
+
+    db_queries = models.PositiveIntegerField(default=0)
+    db_duration = models.FloatField(default=0)
+
+    http_requests = models.PositiveIntegerField(default=0)
+    http_bytes = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = (("task_name", "period_start"),)
+        verbose_name_plural = "task statistics"
+
+    def __str__(self):
+        return f"{self.task_name} at {self.period_start}"
+
+
+class BulkActionJob(models.Model):
+    """
+    Records the progress of an admin action which is being applied to a large
+    selection in batches by a Celery task
+    """
+
+    created_on = models.DateTimeField(editable=False, auto_now_add=True)
+    created_by = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    action = models.CharField(max_length=20, choices=BulkAction.CHOICES)
+    description = models.CharField(max_length=255)
+
+    total = models.PositiveIntegerField(
+        default=0, help_text="Number of records which will be processed"
+    )
+    processed = models.PositiveIntegerField(
+        default=0, help_text="Number of records which have been processed"
+    )
+
+    last_started = models.DateTimeField(
+        help_text="Last time when a worker started processing this job",
+        null=True,
+        blank=True,
+    )
+    completed = models.DateTimeField(
+        help_text="Time when the job completed without error", null=True, blank=True
+    )
+    failed = models.DateTimeField(
+        help_text="Time when the job failed due to an error", null=True, blank=True
+    )
+    status = models.TextField(
+        help_text="Status message, if any, from the last worker", blank=True, default=""
+    )
+
+    class Meta:
+        ordering = ("-created_on",)
+
+    def __str__(self):
+        return self.description
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 1.0 if self.completed else 0.0
+        return min(self.processed / self.total, 1.0)
@@ -0,0 +1,331 @@
+"""
+Queued Elasticsearch index updates
+
+The default django_elasticsearch_dsl signal processor makes a request to
+Elasticsearch for every save of an indexed model, inside the web request or
+task which made the change. QueuedSignalProcessor instead records the changed
+(model, primary key) pairs in the SearchIndexChange table, where a unique
+constraint removes duplicates, and schedules the update_search_indices Celery
+task to index them in batches using the bulk API.
+
+Enable it by setting::
+
+    ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = "concordia.search_index.QueuedSignalProcessor"
+"""
+
+from logging import getLogger
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models import Max, Min
+from django_elasticsearch_dsl.apps import DEDConfig
+from django_elasticsearch_dsl.registries import registry
+from django_elasticsearch_dsl.signals import BaseSignalProcessor
+from more_itertools.more import chunked
+
+logger = getLogger(__name__)
+
+#: Cache key used to avoid scheduling more than one pending update task
+UPDATE_SCHEDULED_CACHE_KEY = "search-index-update-scheduled"
+
+
+class QueuedSignalProcessor(BaseSignalProcessor):
+    def setup(self):
+        models.signals.post_save.connect(self.handle_save)
+        models.signals.post_delete.connect(self.handle_delete)
+        models.signals.m2m_changed.connect(self.handle_m2m_changed)
+
+    def teardown(self):
+        models.signals.post_save.disconnect(self.handle_save)
+        models.signals.post_delete.disconnect(self.handle_delete)
+        models.signals.m2m_changed.disconnect(self.handle_m2m_changed)
+
+    def handle_save(self, sender, instance, **kwargs):
+        queue_search_index_changes([instance])
+
+    def handle_pre_delete(self, sender, instance, **kwargs):
+        # Deleted records are detected when the queue is processed:
+        pass
+
+    def handle_delete(self, sender, instance, **kwargs):
+        queue_search_index_changes([instance])
+
+
+def queue_search_index_changes(instances):
+    """
+    Record that the provided model instances need to be updated in the search
+    indices and schedule a task to process the queue after the current
+    transaction has been committed
+    """
+
+    if not DEDConfig.autosync_enabled():
+        return
+
+    indexed_models = registry.get_models()
+
+    # Sorting the changes means concurrent writers lock the existing queue
+    # entries in the same order:
+    changes = sorted(
+        {
+            (ContentType.objects.get_for_model(i).pk, i.pk)
+            for i in instances
+            if i.__class__ in indexed_models
+        }
+    )
+
+    if not changes:
+        return
+
+    # Updating an existing queue entry, rather than ignoring the conflict,
+    # locks it until this transaction commits. update_search_indices skips
+    # locked entries so it cannot remove one after reading the previous state
+    # of a record which is still being changed:
+    with connection.cursor() as cursor:
+        for chunk in chunked(changes, 1000):
+            cursor.execute(
+                f"""
+                INSERT INTO concordia_searchindexchange
+                    (content_type_id, object_id, created_on)
+                VALUES {", ".join(["(%s, %s, NOW())"] * len(chunk))}
+                ON CONFLICT (content_type_id, object_id)
+                DO UPDATE SET created_on = EXCLUDED.created_on
+                """,
+                [value for change in chunk for value in change],
+            )
+
+    # The flag is only set once the changes have been committed so a rolled
+    # back transaction cannot prevent other changes from being scheduled:
+    transaction.on_commit(schedule_search_index_update)
+
+
+def schedule_search_index_update():
+    """
+    Start the update_search_indices task unless a run is already pending
+
+    The CELERY_BEAT_SCHEDULE also runs the task periodically so changes which
+    were queued for a task which was lost or failed are still processed.
+    """
+
+    delay = settings.SEARCH_INDEX_UPDATE_DELAY
+    if cache.add(UPDATE_SCHEDULED_CACHE_KEY, True, delay):
+        from .tasks import update_search_indices
+
+        update_search_indices.apply_async(countdown=delay)
+
+
+def update_search_index(model, pks):
+    """
+    Update every document registered for the model with the current state of
+    the provided records. Records which no longer exist are removed from the
+    index.
+    """
+
+    pks = set(pks)
+
+    for document_class in registry.get_documents([model]):
+        document = document_class()
+
+        instances = list(document.get_queryset().filter(pk__in=pks))
+        if instances:
+            document.update(instances, refresh=False)
+
+        deleted_pks = pks.difference(i.pk for i in instances)
+        if deleted_pks:
+            document.update(
+                [model(pk=pk) for pk in deleted_pks],
+                action="delete",
+                refresh=False,
+                raise_on_error=False,
+            )
+
+            # An index which is being rebuilt may already have loaded these
+            # records and would otherwise keep them once it is activated:
+            for index_name in get_pending_indices(document_class):
+                pending_document = document_class()
+                pending_document._index = document_class._index.clone(name=index_name)
+                pending_document.update(
+                    [model(pk=pk) for pk in deleted_pks],
+                    action="delete",
+                    refresh=False,
+                    raise_on_error=False,
+                )
+
+        logger.info(
+            "Updated %d and deleted %d %s documents",
+            len(instances),
+            len(deleted_pks),
+            document_class.__name__,
+        )
+
+
+def update_search_indices_changed_since(since, document_classes=None):
+    """
+    Reindex every record which has been created or modified since the
+    provided timestamp, returning the number of records indexed
+    """
+
+    if document_classes is None:
+        document_classes = registry.get_documents()
+
+    count = 0
+
+    for document_class in document_classes:
+        document = document_class()
+
+        changed_qs = document.get_queryset_changed_since(since).order_by("pk")
+
+        # Keyset pagination keeps each batch query cheap for large indices:
+        last_pk = None
+        while True:
+            batch_qs = changed_qs
+            if last_pk is not None:
+                batch_qs = batch_qs.filter(pk__gt=last_pk)
+
+            batch = list(batch_qs[: settings.SEARCH_INDEX_BATCH_SIZE])
+            if not batch:
+                break
+
+            document.update(batch, refresh=False)
+            count += len(batch)
+            last_pk = batch[-1].pk
+
+    return count
+
+
+def get_document_class(name):
+    """Return the registered document class with the provided class name"""
+
+    for document_class in registry.get_documents():
+        if document_class.__name__ == name:
+            return document_class
+
+    raise LookupError(f"No search document named {name}")
+
+
+def create_versioned_index(document_class, version):
+    """
+    Create a new index for the document using the same settings and mappings
+    as the live index, returning the new index name
+
+    Refreshing is disabled until activate_versioned_index() is called since
+    nothing will search the new index until then.
+    """
+
+    alias = document_class._index._name
+    index_name = f"{alias}-{version}"
+
+    body = document_class._index.clone(name=index_name).to_dict()
+    body.setdefault("settings", {})["refresh_interval"] = "-1"
+
+    document_class._get_connection().indices.create(index=index_name, body=body)
+
+    return index_name
+
+
+def get_reindex_pk_ranges(document_class, chunk_size):
+    """
+    Return a list of (start, end) primary key ranges which cover all of the
+    document's records, for loading in parallel
+    """
+
+    pk_range = document_class().get_queryset().aggregate(Min("pk"), Max("pk"))
+
+    if pk_range["pk__min"] is None:
+        return []
+
+    return [
+        (start, start + chunk_size)
+        for start in range(pk_range["pk__min"], pk_range["pk__max"] + 1, chunk_size)
+    ]
+
+
+def populate_versioned_index(document_class, index_name, start, end):
+    """
+    Load the records with primary keys in the range [start, end) into the
+    provided index, returning the number of records loaded
+    """
+
+    document = document_class()
+    # The document instance will write to the new index instead of the alias:
+    document._index = document_class._index.clone(name=index_name)
+
+    chunk_qs = document.get_queryset().filter(pk__gte=start, pk__lt=end)
+    instances = list(chunk_qs)
+
+    if instances:
+        document.update(instances, refresh=False)
+
+        # A record deleted after it was read may have been removed from this
+        # index before the write above, so check again now that it is done:
+        loaded_pks = {i.pk for i in instances}
+        deleted_pks = loaded_pks.difference(
+            chunk_qs.filter(pk__in=loaded_pks).values_list("pk", flat=True)
+        )
+        if deleted_pks:
+            model = document.django.model
+            document.update(
+                [model(pk=pk) for pk in deleted_pks],
+                action="delete",
+                refresh=False,
+                raise_on_error=False,
+            )
+
+    return len(instances)
+
+
+def get_pending_indices(document_class):
+    """
+    Return the names of the versioned indices which are being built for the
+    document and which its alias does not refer to yet
+    """
+
+    connection = document_class._get_connection()
+    alias = document_class._index._name
+
+    versioned_indices = connection.indices.get_alias(
+        index=f"{alias}-*", ignore_unavailable=True, allow_no_indices=True
+    )
+
+    return sorted(
+        index_name
+        for index_name, index_info in versioned_indices.items()
+        if alias not in index_info.get("aliases", {})
+    )
+
+
+def activate_versioned_index(document_class, index_name):
+    """
+    Atomically point the document's alias at the provided index and delete
+    the indices it previously referred to
+
+    Before the first rebuild the live name is a regular index rather than an
+    alias, so it is removed in the same request which creates the alias.
+    """
+
+    connection = document_class._get_connection()
+    alias = document_class._index._name
+
+    connection.indices.put_settings(
+        index=index_name, body={"index": {"refresh_interval": None}}
+    )
+    connection.indices.refresh(index=index_name)
+
+    actions = [{"add": {"index": index_name, "alias": alias}}]
+    old_indices = []
+
+    if connection.indices.exists_alias(name=alias):
+        old_indices = [
+            i for i in connection.indices.get_alias(name=alias) if i != index_name
+        ]
+        actions.extend({"remove": {"index": i, "alias": alias}} for i in old_indices)
+    elif connection.indices.exists(index=alias):
+        actions.append({"remove_index": {"index": alias}})
+
+    connection.indices.update_aliases(body={"actions": actions})
+
+    for old_index in old_indices:
+        connection.indices.delete(index=old_index, ignore=404)
+
+    logger.info("Search alias %s now refers to %s", alias, index_name)
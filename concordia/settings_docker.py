@@ -11,9 +11,7 @@ ELASTICSEARCH_DSL_AUTOSYNC = os.getenv("ELASTICSEARCH_DSL_AUTOSYNC", False)
 
 INSTALLED_APPS += ["django_elasticsearch_dsl"]
 
-ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = (
-    "django_elasticsearch_dsl.signals.RealTimeSignalProcessor"
-)
+ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = "concordia.search_index.QueuedSignalProcessor"
 ELASTICSEARCH_DSL = {
     "default": {"hosts": os.getenv("ELASTICSEARCH_ENDPOINT", "elk:9200")}
 }
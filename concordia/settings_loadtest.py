@@ -0,0 +1,22 @@
+"""
+Settings for running a local server under the run_load_test command
+
+These are production settings apart from bypassing the captcha and rate
+limits, which would otherwise block the simulated volunteers, and adding the
+query count response headers.
+"""
+
+from .settings_template import *  # NOQA ignore=F405
+from .settings_template import MIDDLEWARE
+
+DEBUG = False
+
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]  # nosec
+
+EMAIL_BACKEND = "django.core.mail.backends.dummy.EmailBackend"
+
+CAPTCHA_TEST_MODE = True
+
+RATELIMIT_ENABLE = False
+
+MIDDLEWARE = ["concordia.middleware.QueryCountHeaderMiddleware"] + MIDDLEWARE
@@ -119,6 +119,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django_prometheus_metrics.middleware.PrometheusBeforeMiddleware",
+    "concordia.middleware.ViewMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     # WhiteNoise serves static files efficiently:
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -132,6 +133,21 @@ MIDDLEWARE = [
     "flags.middleware.FlagConditionsMiddleware",
 ]
 
+#: Warn when a view makes more database queries than this, keyed by URL name
+QUERY_BUDGETS = {
+    "transcriptions:asset-detail": 15,
+    "transcriptions:item-detail": 15,
+    "redirect-to-next-transcribable-asset": 15,
+    "redirect-to-next-reviewable-asset": 15,
+    "reserve-asset": 10,
+    "save-transcription": 40,
+    "submit-transcription": 40,
+    "review-transcription": 40,
+    "transcribe-asset-list": 10,
+    "review-asset-list": 10,
+    "user-profile": 15,
+}
+
 RATELIMIT_VIEW = "concordia.views.ratelimit_view"
 RATELIMIT_BLOCK = False
 
@@ -167,14 +183,14 @@ MEMCACHED_PORT = os.getenv("MEMCACHED_PORT", "")
 if MEMCACHED_ADDRESS and MEMCACHED_PORT:
     CACHES = {
         "default": {
-            "BACKEND": "django.core.cache.backends.memcached.MemcachedCache",
+            "BACKEND": "concordia.caches.MemcachedCache",
             "LOCATION": "{}:{}".format(MEMCACHED_ADDRESS, MEMCACHED_PORT),
         }
     }
 
     SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 else:
-    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    CACHES = {"default": {"BACKEND": "concordia.caches.LocMemCache"}}
 
     SESSION_ENGINE = "django.contrib.sessions.backends.db"
 
@@ -208,6 +224,23 @@ CELERY_BROKER_TRANSPORT_OPTIONS = {
     "interval_max": 0.5,
 }
 
+#: Periodic tasks which the site depends on. django_celery_beat adds these to
+#: the schedules which can be managed in the admin.
+CELERY_BEAT_SCHEDULE = {
+    "fill-captcha-pool": {
+        "task": "concordia.tasks.fill_captcha_pool",
+        "schedule": 300,
+    },
+    "remove-expired-captchas": {
+        "task": "concordia.tasks.remove_expired_captchas",
+        "schedule": 600,
+    },
+    "update-search-indices": {
+        "task": "concordia.tasks.update_search_indices",
+        "schedule": 300,
+    },
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -294,8 +327,15 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 CAPTCHA_CHALLENGE_FUNCT = "captcha.helpers.random_char_challenge"
+#: Accept "PASSED" as the answer to every captcha. Only enable this for testing!
+CAPTCHA_TEST_MODE = False
 #: Anonymous sessions require captcha validation every day by default:
 ANONYMOUS_CAPTCHA_VALIDATION_INTERVAL = 86400
+#: Number of captcha challenges generated ahead of time by the fill_captcha_pool
+#: task. Set this to 0 to generate every challenge when it is requested.
+CAPTCHA_POOL_SIZE = 500
+#: Seconds each pre-generated challenge is offered before it is replaced
+CAPTCHA_POOL_TIMEOUT = 1800
 
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 WHITENOISE_ROOT = os.path.join(SITE_ROOT_DIR, "static")
@@ -350,6 +390,25 @@ TRANSCRIPTION_RESERVATION_TOMBSTONE_LENGTH_HOURS = 48
 #: Web cache policy settings
 DEFAULT_PAGE_TTL = 5 * 60
 
+#: Number of seconds rendered SimplePage and SimpleContentBlock content will be
+#: cached. Saving or deleting a record clears its cache entry immediately.
+SIMPLE_CONTENT_CACHE_TTL = 60 * 60
+
+#: Number of seconds the list of published assets in an item will be cached
+#: for the asset page navigation. Saving an asset clears its item's entry.
+ASSET_NAVIGATION_CACHE_TTL = 15 * 60
+
+#: Number of seconds changes recorded by concordia.search_index.QueuedSignalProcessor
+#: will be collected before the update_search_indices task processes them
+SEARCH_INDEX_UPDATE_DELAY = 10
+
+#: Number of records sent to Elasticsearch in each bulk request
+SEARCH_INDEX_BATCH_SIZE = 500
+
+#: Number of primary keys covered by each parallel task when rebuilding a
+#: search index using the rebuild_search_indices management command
+SEARCH_INDEX_REBUILD_CHUNK_SIZE = 10000
+
 # Feature flags
 FLAGS = {
     "ACTIVITY_UI_ENABLED": [],
@@ -15,6 +15,9 @@ SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 
 RATELIMIT_ENABLE = False
 
+# There is no Celery worker to fill the captcha pool:
+CAPTCHA_POOL_SIZE = 0
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
@@ -5,21 +5,60 @@ from asgiref.sync import AsyncToSync
 from channels.layers import get_channel_layer
 from django.conf import settings
 from django.contrib.auth import login as auth_login
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import Group, User
 from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.core.cache import cache
 from django.core.mail import EmailMultiAlternatives
-from django.db.models.signals import post_save
+from django.db.models import F, Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.template import loader
 from django_registration.signals import user_activated, user_registered
 from flags.state import flag_enabled
-
-from ..models import Asset, Transcription, TranscriptionStatus
+from more_itertools.more import chunked
+
+from ..models import (
+    Asset,
+    CampaignContributor,
+    Item,
+    ItemContributor,
+    ProjectContributor,
+    SimpleContentBlock,
+    SimplePage,
+    Tag,
+    Transcription,
+    TranscriptionStatus,
+    UserAssetActivity,
+    UserAssetTagCollection,
+    UserCampaignActivity,
+)
 from ..tasks import calculate_difficulty_values
-from .signals import reservation_obtained, reservation_released
+from ..utils import (
+    ANONYMOUS_USERNAME,
+    clear_anonymous_user_cache,
+    clear_item_asset_navigation,
+    clear_tag_id_cache,
+    get_simple_content_block_cache_key,
+    get_simple_page_cache_key,
+)
+from .signals import (
+    assets_updated,
+    reservation_obtained,
+    reservation_released,
+    reservations_released,
+)
 
 ASSET_CHANNEL_LAYER = get_channel_layer()
 
+#: Asset fields which are stored in the per-item navigation index
+ASSET_NAVIGATION_FIELDS = {"item", "published", "sequence", "slug"}
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,6 +124,33 @@ def add_user_to_newsletter(sender, user, request, **kwargs):
         newsletter_group.save()
 
 
+@receiver(post_save, sender=Transcription)
+def update_latest_transcription(sender, *, instance, created, **kwargs):
+    if not created:
+        return
+
+    # The filter prevents a slower request from replacing a newer transcription:
+    updated = (
+        Asset.objects.filter(pk=instance.asset_id)
+        .filter(
+            Q(latest_transcription__isnull=True)
+            | Q(latest_transcription__lt=instance.pk)
+        )
+        .update(latest_transcription=instance)
+    )
+
+    if updated:
+        instance.asset.latest_transcription = instance
+
+
+@receiver(post_delete, sender=Transcription)
+def restore_latest_transcription(sender, *, instance, **kwargs):
+    # Deleting the latest transcription will have set the asset's pointer to NULL:
+    Asset.objects.filter(
+        pk=instance.asset_id, latest_transcription__isnull=True
+    ).update_latest_transcriptions()
+
+
 @receiver(post_save, sender=Transcription)
 def update_asset_status(sender, *, instance, **kwargs):
     new_status = TranscriptionStatus.IN_PROGRESS
@@ -97,22 +163,134 @@ def update_asset_status(sender, *, instance, **kwargs):
         new_status = TranscriptionStatus.SUBMITTED
 
     instance.asset.transcription_status = new_status
-    instance.asset.full_clean()
-    instance.asset.save()
+    instance.asset.full_clean(exclude=["latest_transcription"])
+    instance.asset.save(update_fields=["transcription_status"])
 
     calculate_difficulty_values(Asset.objects.filter(pk=instance.asset.pk))
 
 
+def get_asset_scope(asset):
+    """
+    Return the (item, project, campaign) primary keys for the provided asset
+
+    The result is stored on the asset instance so the handlers for a single
+    transcription save only need to look it up once.
+    """
+
+    try:
+        return asset._scope_pks
+    except AttributeError:
+        asset._scope_pks = (
+            Item.objects.filter(pk=asset.item_id)
+            .values_list("pk", "project_id", "project__campaign_id")
+            .get()
+        )
+        return asset._scope_pks
+
+
+@receiver(post_save, sender=Transcription)
+def update_contributor_tallies(sender, *, instance, **kwargs):
+    # Contributions to unpublished assets are not counted, matching the
+    # published assets the campaign, project and item pages report on:
+    if not instance.asset.published:
+        return
+
+    user_ids = {instance.user_id, instance.reviewed_by_id}
+    user_ids.discard(None)
+
+    item_id, project_id, campaign_id = get_asset_scope(instance.asset)
+
+    # Existing contributors are skipped by the unique constraints:
+    for model, scope in (
+        (ItemContributor, {"item_id": item_id}),
+        (ProjectContributor, {"project_id": project_id}),
+        (CampaignContributor, {"campaign_id": campaign_id}),
+    ):
+        model.objects.bulk_create(
+            [model(user_id=user_id, **scope) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+
+
+@receiver(pre_save, sender=Transcription)
+def record_previous_reviewer(sender, *, instance, **kwargs):
+    # update_user_activity needs to know whether the reviewer has changed:
+    if instance.pk:
+        instance._previous_reviewed_by_id = (
+            Transcription.objects.filter(pk=instance.pk)
+            .values_list("reviewed_by_id", flat=True)
+            .first()
+        )
+    else:
+        instance._previous_reviewed_by_id = None
+
+
+@receiver(post_save, sender=Transcription)
+def update_user_activity(sender, *, instance, created, **kwargs):
+    _, _, campaign_id = get_asset_scope(instance.asset)
+
+    if created:
+        update_user_asset_activity(
+            instance.user_id, instance.asset_id, last_transcribed=instance.created_on
+        )
+        add_user_campaign_actions(instance.user_id, campaign_id, 1)
+
+    reviewer_id = instance.reviewed_by_id
+    if reviewer_id:
+        update_user_asset_activity(
+            reviewer_id, instance.asset_id, last_reviewed=instance.updated_on
+        )
+
+    # A transcription counts once for each user who created or reviewed it:
+    previous_reviewer_id = getattr(instance, "_previous_reviewed_by_id", None)
+    if reviewer_id != previous_reviewer_id:
+        if reviewer_id and reviewer_id != instance.user_id:
+            add_user_campaign_actions(reviewer_id, campaign_id, 1)
+        if previous_reviewer_id and previous_reviewer_id != instance.user_id:
+            add_user_campaign_actions(previous_reviewer_id, campaign_id, -1)
+
+
+def update_user_asset_activity(user_id, asset_id, **timestamps):
+    activity_qs = UserAssetActivity.objects.filter(user_id=user_id, asset_id=asset_id)
+
+    if not activity_qs.update(**timestamps):
+        _, created = UserAssetActivity.objects.get_or_create(
+            user_id=user_id, asset_id=asset_id, defaults=timestamps
+        )
+        if not created:
+            # Another process created the record after our update:
+            activity_qs.update(**timestamps)
+
+
+def add_user_campaign_actions(user_id, campaign_id, count):
+    activity_qs = UserCampaignActivity.objects.filter(
+        user_id=user_id, campaign_id=campaign_id
+    )
+
+    if not activity_qs.update(action_count=F("action_count") + count):
+        _, created = UserCampaignActivity.objects.get_or_create(
+            user_id=user_id, campaign_id=campaign_id, defaults={"action_count": count}
+        )
+        if not created:
+            activity_qs.update(action_count=F("action_count") + count)
+
+
+@receiver(post_save, sender=Transcription)
+@receiver(post_delete, sender=Transcription)
+def update_asset_search_document(sender, *, instance, **kwargs):
+    Asset.objects.filter(pk=instance.asset_id).update_search_documents()
+
+
 @receiver(post_save, sender=Asset)
 def send_asset_update(*, instance, **kwargs):
     latest_trans = None
 
-    latest_transcription = instance.transcription_set.order_by("-pk").first()
+    latest_transcription = instance.latest_transcription
     if latest_transcription:
         latest_trans = {
             "text": latest_transcription.text,
             "id": latest_transcription.pk,
-            "submitted_by": latest_transcription.user.pk,
+            "submitted_by": latest_transcription.user_id,
         }
 
     AsyncToSync(ASSET_CHANNEL_LAYER.group_send)(
@@ -127,6 +305,129 @@ def send_asset_update(*, instance, **kwargs):
     )
 
 
+@receiver(assets_updated)
+def send_asset_updates(sender, *, asset_pks, **kwargs):
+    # This sends the same data as send_asset_update for each asset, batched so
+    # a bulk change doesn't send thousands of messages:
+    for pk_batch in chunked(asset_pks, 1000):
+        asset_qs = Asset.objects.filter(pk__in=pk_batch).values_list(
+            "pk",
+            "transcription_status",
+            "difficulty",
+            "latest_transcription_id",
+            "latest_transcription__text",
+            "latest_transcription__user_id",
+        )
+
+        updates = []
+        for pk, status, difficulty, trans_id, trans_text, trans_user_id in asset_qs:
+            latest_trans = None
+            if trans_id:
+                latest_trans = {
+                    "text": trans_text,
+                    "id": trans_id,
+                    "submitted_by": trans_user_id,
+                }
+
+            updates.append(
+                {
+                    "asset_pk": pk,
+                    "status": status,
+                    "difficulty": difficulty,
+                    "latest_transcription": latest_trans,
+                }
+            )
+
+        AsyncToSync(ASSET_CHANNEL_LAYER.group_send)(
+            "asset_updates",
+            {"type": "asset_updates", "updates": updates, "sent": time()},
+        )
+
+
+@receiver(pre_save, sender=SimplePage)
+def clear_previous_simple_page_path_cache(sender, *, instance, **kwargs):
+    # If the path is being changed the page must disappear from its old location:
+    if instance.pk:
+        old_paths = SimplePage.objects.filter(pk=instance.pk).values_list(
+            "path", flat=True
+        )
+        cache.delete_many([get_simple_page_cache_key(i) for i in old_paths])
+
+
+@receiver(post_save, sender=SimplePage)
+@receiver(post_delete, sender=SimplePage)
+def clear_simple_page_cache(sender, *, instance, **kwargs):
+    cache.delete(get_simple_page_cache_key(instance.path))
+
+
+@receiver(pre_save, sender=SimpleContentBlock)
+def clear_previous_simple_content_block_slug_cache(sender, *, instance, **kwargs):
+    if instance.pk:
+        old_slugs = SimpleContentBlock.objects.filter(pk=instance.pk).values_list(
+            "slug", flat=True
+        )
+        cache.delete_many([get_simple_content_block_cache_key(i) for i in old_slugs])
+
+
+@receiver(post_save, sender=SimpleContentBlock)
+@receiver(post_delete, sender=SimpleContentBlock)
+def clear_simple_content_block_cache(sender, *, instance, **kwargs):
+    cache.delete(get_simple_content_block_cache_key(instance.slug))
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+def clear_item_asset_navigation_cache(sender, *, instance, **kwargs):
+    # Status updates are saved frequently and do not change the navigation:
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not update_fields.intersection(ASSET_NAVIGATION_FIELDS):
+        return
+
+    clear_item_asset_navigation([instance.item_id])
+
+
+@receiver(m2m_changed, sender=UserAssetTagCollection.tags.through)
+def update_asset_tags(sender, *, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        # Clearing a tag's collections is not reported with their keys:
+        if pk_set is None:
+            assets = Asset.objects.filter(assettag__tag=instance)
+        else:
+            assets = Asset.objects.filter(userassettagcollection__pk__in=pk_set)
+    else:
+        assets = Asset.objects.filter(pk=instance.asset_id)
+
+    assets.update_tag_summaries()
+
+
+@receiver(post_delete, sender=UserAssetTagCollection)
+def remove_deleted_asset_tags(sender, *, instance, **kwargs):
+    Asset.objects.filter(pk=instance.asset_id).update_tag_summaries()
+
+
+@receiver(post_delete, sender=Tag)
+def clear_deleted_tag_ids(sender, *, instance, **kwargs):
+    # Other processes will find out when they next use the deleted tag:
+    clear_tag_id_cache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def clear_anonymous_user(sender, *, instance, **kwargs):
+    if instance.username == ANONYMOUS_USERNAME:
+        clear_anonymous_user_cache()
+
+
+@receiver(post_migrate)
+def clear_process_caches(sender, **kwargs):
+    # This is also sent after the flush command has emptied the database:
+    clear_anonymous_user_cache()
+    clear_tag_id_cache()
+
+
 @receiver(reservation_obtained)
 def send_asset_reservation_obtained(sender, **kwargs):
     send_asset_reservation_message(
@@ -147,6 +448,21 @@ def send_asset_reservation_released(sender, **kwargs):
     )
 
 
+@receiver(reservations_released)
+def send_asset_reservations_released(sender, *, reservations, **kwargs):
+    # Large batches are split so no single message exceeds the channel layer's
+    # limits:
+    for batch in chunked(reservations, 1000):
+        AsyncToSync(ASSET_CHANNEL_LAYER.group_send)(
+            "asset_updates",
+            {
+                "type": "asset_reservations_released",
+                "reservations": batch,
+                "sent": time(),
+            },
+        )
+
+
 def send_asset_reservation_message(
     *, sender, message_type, asset_pk, reservation_token
 ):
@@ -7,3 +7,11 @@ reservation_obtained = django.dispatch.Signal(
 reservation_released = django.dispatch.Signal(
     providing_args=["asset_pk", "reservation_token"]
 )
+
+#: Sent when reservations are released in bulk, e.g. when they expire, with a
+#: list of dictionaries containing the asset_pk and reservation_token
+reservations_released = django.dispatch.Signal(providing_args=["reservations"])
+
+#: Sent when assets are changed in bulk without being saved individually, e.g.
+#: by the reopen_assets task, with a list of the asset primary keys
+assets_updated = django.dispatch.Signal(providing_args=["asset_pks"])
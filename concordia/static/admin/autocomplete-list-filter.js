@@ -0,0 +1,24 @@
+/* global django */
+
+(function($) {
+    'use strict';
+
+    $(function() {
+        // The autocomplete list filters reload the changelist when the
+        // selection changes, like the links used by the other list filters:
+        $('.autocomplete-list-filter select').on('change', function() {
+            var queryString = this.dataset.queryString;
+            var selected = $(this).val() || [];
+
+            if (selected.length) {
+                queryString +=
+                    (queryString.length > 1 ? '&' : '') +
+                    encodeURIComponent(this.name) +
+                    '=' +
+                    encodeURIComponent(selected.join(','));
+            }
+
+            window.location.search = queryString;
+        });
+    });
+})(django.jQuery);
@@ -316,18 +316,16 @@ export class ActionApp {
             let assetId = message.asset_pk;
 
             switch (message.type) {
-                case 'asset_update': {
-                    let assetUpdate = {
-                        sent: data.sent,
-                        difficulty: message.difficulty,
-                        latest_transcription: message.latest_transcription,
-                        status: message.status
-                    };
-
-                    this.mergeAssetUpdate(assetId, assetUpdate);
-
+                case 'asset_update':
+                    this.applyAssetUpdate(assetId, message, data.sent);
                     break;
-                }
+                case 'asset_updates':
+                    // Assets changed in bulk are sent in batches:
+                    message.updates.forEach(update => {
+                        this.applyAssetUpdate(update.asset_pk, update, data.sent);
+                        this.refreshAssetDisplay(update.asset_pk);
+                    });
+                    return;
                 case 'asset_reservation_obtained':
                     /*
                     If the user is anonymous, or if the user is logged in and
@@ -341,39 +339,22 @@ export class ActionApp {
 
                     break;
                 case 'asset_reservation_released':
-                    this.mergeAssetUpdate(assetId, {
-                        reservationToken: null
-                    });
-
-                    if (this.openAssetId && this.openAssetId == assetId) {
-                        this.reserveAsset();
-                    }
-
+                    this.releaseAssetReservation(assetId);
                     break;
+                case 'asset_reservations_released':
+                    // Expired reservations are released in batches:
+                    message.reservations.forEach(reservation => {
+                        this.releaseAssetReservation(reservation.asset_pk);
+                        this.refreshAssetDisplay(reservation.asset_pk);
+                    });
+                    return;
                 default:
                     console.warn(
                         `Unknown message type ${message.type}: ${message}`
                     );
             }
 
-            if (this.openAssetId && assetId == this.openAssetId) {
-                // Someone may be looking at an asset even if they have not
-                // locked it and this provides real-time updates:
-                this.updateViewer();
-            }
-
-            if (typeof this.assetList.lookup == 'undefined') {
-                console.warn(
-                    `Expected this.assetList to be an initialized List but found ${this.assetList}`
-                );
-            } else {
-                let assetListItem = this.assetList.lookup[assetId];
-                if (assetListItem) {
-                    // If this is visible, we want to update the displayed asset
-                    // list icon using the current value:
-                    assetListItem.update(this.getAssetData(assetId));
-                }
-            }
+            this.refreshAssetDisplay(assetId);
         });
 
         assetSocket.addEventListener('error', event => {
@@ -386,6 +367,46 @@ export class ActionApp {
         };
     }
 
+    applyAssetUpdate(assetId, update, sent) {
+        this.mergeAssetUpdate(assetId, {
+            sent: sent,
+            difficulty: update.difficulty,
+            latest_transcription: update.latest_transcription,
+            status: update.status
+        });
+    }
+
+    releaseAssetReservation(assetId) {
+        this.mergeAssetUpdate(assetId, {
+            reservationToken: null
+        });
+
+        if (this.openAssetId && this.openAssetId == assetId) {
+            this.reserveAsset();
+        }
+    }
+
+    refreshAssetDisplay(assetId) {
+        if (this.openAssetId && assetId == this.openAssetId) {
+            // Someone may be looking at an asset even if they have not
+            // locked it and this provides real-time updates:
+            this.updateViewer();
+        }
+
+        if (typeof this.assetList.lookup == 'undefined') {
+            console.warn(
+                `Expected this.assetList to be an initialized List but found ${this.assetList}`
+            );
+        } else {
+            let assetListItem = this.assetList.lookup[assetId];
+            if (assetListItem) {
+                // If this is visible, we want to update the displayed asset
+                // list icon using the current value:
+                assetListItem.update(this.getAssetData(assetId));
+            }
+        }
+    }
+
     refreshData() {
         console.time('Refreshing asset editability');
 
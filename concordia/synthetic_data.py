@@ -0,0 +1,574 @@
+"""
+Synthetic data for benchmarking
+
+SyntheticDataGenerator fills the database with campaigns, topics, projects,
+items and assets with a realistic mix of transcription histories, including
+rejected submissions which are superseded by later transcriptions, along with
+reservations, tags and the users who created them. This allows views, tasks,
+exports and indexing to be measured against production-sized tables.
+
+Every value is derived from the seed so the same arguments always produce the
+same records, apart from the primary keys. Names are prefixed with the seed so
+datasets with different seeds can be loaded into the same database.
+
+Items, assets and everything attached to them are loaded using COPY with
+primary keys reserved from the table sequences beforehand, which avoids both
+the per-object cost of the ORM and any queries to find the generated keys.
+Signal handlers are not run, so the denormalized data which they maintain is
+generated alongside the records or updated in bulk afterwards.
+"""
+
+import datetime
+import json
+import random
+from collections import Counter
+from io import StringIO
+from logging import getLogger
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.transaction import atomic
+from django.utils.timezone import utc
+from more_itertools.more import chunked
+
+from .models import (
+    Asset,
+    AssetTranscriptionReservation,
+    Campaign,
+    CampaignContributor,
+    Item,
+    ItemContributor,
+    MediaType,
+    Project,
+    ProjectContributor,
+    Tag,
+    Topic,
+    Transcription,
+    TranscriptionStatus,
+    UserAssetActivity,
+    UserAssetTagCollection,
+    UserCampaignActivity,
+)
+
+logger = getLogger(__name__)
+
+#: Relative frequency of each asset status, based on the production database
+STATUS_WEIGHTS = {
+    TranscriptionStatus.NOT_STARTED: 25,
+    TranscriptionStatus.IN_PROGRESS: 10,
+    TranscriptionStatus.SUBMITTED: 10,
+    TranscriptionStatus.COMPLETED: 55,
+}
+
+#: Relative frequency of 0, 1, 2… rejected submissions before the current one
+REJECTION_WEIGHTS = (70, 20, 7, 3)
+
+#: Fraction of items which are unpublished
+UNPUBLISHED_ITEM_RATE = 0.05
+
+#: Fraction of in-progress assets which are currently reserved
+RESERVATION_RATE = 0.2
+
+#: Fraction of transcribed assets which have been tagged
+TAGGED_ASSET_RATE = 0.3
+
+#: All generated timestamps fall within the year after this date
+EPOCH = datetime.datetime(2019, 1, 1, tzinfo=utc)
+
+WORDS = (
+    "the and of to a in that is was he for it with as his on be at by had not "
+    "are but from or have an they which one you were her all she there would "
+    "their we him been has when who will more no if out so said what up its "
+    "about into than them can only other new some could time these two may "
+    "then do first any my now such like our over man me even most made after "
+    "also did many before must through back years where much your way well "
+    "down should because each just those people Mr how too little state good "
+    "very make world still own see men work long get here between both life "
+    "being under never day same another know while last might us great old "
+    "year off come since against go came right used take three regiment "
+    "letter dear mother father brother sister received army camp march "
+    "river town county war general colonel captain company soldiers orders "
+    "yours truly respectfully affectionately friend Washington Virginia "
+    "Pennsylvania Ohio Tennessee Richmond Boston ship cotton wheat dollars"
+).split()
+
+
+def split_reviewers(users):
+    """
+    Divide the users, in the order they were created, into the reviewers and
+    the transcribers
+    """
+
+    # Reviewers are a small group of experienced volunteers who cannot review
+    # their own transcriptions:
+    reviewer_count = max(1, len(users) // 20)
+
+    return users[:reviewer_count], users[reviewer_count:] or users
+
+
+def reserve_pks(model, count):
+    """Return the next count primary key values from the model's sequence"""
+
+    if not count:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s))"
+            " FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return [pk for pk, in cursor.fetchall()]
+
+
+def get_copy_value(value):
+    """Format a value for COPY's text format"""
+
+    if value is None:
+        return "\\N"
+
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_instances(instances):
+    """
+    Insert unsaved model instances, which must all be of the same model and
+    have their primary keys set, using COPY
+    """
+
+    if not instances:
+        return
+
+    model = instances[0].__class__
+    fields = model._meta.concrete_fields
+
+    buf = StringIO()
+    for instance in instances:
+        buf.write(
+            "\t".join(
+                get_copy_value(getattr(instance, field.attname)) for field in fields
+            )
+        )
+        buf.write("\n")
+    buf.seek(0)
+
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(quote_name(field.column) for field in fields)
+
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {quote_name(model._meta.db_table)} ({columns}) FROM STDIN", buf
+        )
+
+
+class SyntheticDataGenerator(object):
+    def __init__(
+        self,
+        seed=0,
+        *,
+        users=1000,
+        topics=5,
+        tags=500,
+        campaigns=10,
+        projects_per_campaign=5,
+        items_per_project=50,
+        assets_per_item=40,
+        password=None,
+        chunk_size=5000,
+    ):
+        self.random = random.Random(seed)
+        self.prefix = f"synthetic-{seed}"
+
+        self.user_count = users
+        self.topic_count = topics
+        self.tag_count = tags
+        self.campaign_count = campaigns
+        self.projects_per_campaign = projects_per_campaign
+        self.items_per_project = items_per_project
+        self.assets_per_item = assets_per_item
+        self.password = password
+        self.chunk_size = chunk_size
+
+        #: The number of records created for each model
+        self.counts = Counter()
+
+    def exists(self):
+        """Return whether data has already been generated using this seed"""
+
+        return Campaign.objects.filter(slug__startswith=f"{self.prefix}-").exists()
+
+    @atomic
+    def generate(self):
+        """Create the complete dataset, returning the number of each record"""
+
+        self.users = self.create_users()
+        self.tags = self.create_tags()
+        self.topics = self.create_topics()
+
+        for campaign_number in range(self.campaign_count):
+            campaign = self.create_campaign(campaign_number)
+            logger.info("Generated campaign %s", campaign.slug)
+
+        return self.counts
+
+    def get_timestamp(self, after=None, max_hours=24 * 365):
+        if after is None:
+            after = EPOCH
+        return after + datetime.timedelta(
+            seconds=self.random.randint(60, max_hours * 3600)
+        )
+
+    def get_text(self, min_words, max_words):
+        words = self.random.choices(WORDS, k=self.random.randint(min_words, max_words))
+
+        # Line breaks are placed like those in a handwritten letter:
+        lines = [" ".join(line) for line in chunked(words, self.random.randint(6, 12))]
+
+        return "\n".join(lines)
+
+    def create_users(self):
+        if self.password:
+            # Hashing is deliberately slow so every user shares one hash:
+            password = make_password(self.password)
+        else:
+            password = make_password(None)
+
+        users = User.objects.bulk_create(
+            User(
+                username=f"{self.prefix}-user-{i}",
+                email=f"{self.prefix}-user-{i}@example.com",
+                password=password,
+                date_joined=self.get_timestamp(),
+            )
+            for i in range(self.user_count)
+        )
+        self.counts["users"] += len(users)
+
+        self.reviewers, self.transcribers = split_reviewers(users)
+
+        return users
+
+    def create_tags(self):
+        tags = Tag.objects.bulk_create(
+            Tag(value=f"{self.random.choice(WORDS)}-{i}") for i in range(self.tag_count)
+        )
+        self.counts["tags"] += len(tags)
+        return tags
+
+    def create_topics(self):
+        topics = Topic.objects.bulk_create(
+            Topic(
+                title=f"Topic {i}",
+                slug=f"{self.prefix}-topic-{i}",
+                description=self.get_text(20, 60),
+                published=True,
+                ordering=i,
+            )
+            for i in range(self.topic_count)
+        )
+        self.counts["topics"] += len(topics)
+        return topics
+
+    def create_campaign(self, campaign_number):
+        campaign = Campaign.objects.create(
+            title=f"Synthetic Campaign {campaign_number}",
+            slug=f"{self.prefix}-campaign-{campaign_number}",
+            description=self.get_text(20, 60),
+            short_description=self.get_text(5, 20),
+            published=True,
+            ordering=campaign_number,
+        )
+        self.counts["campaigns"] += 1
+
+        projects = Project.objects.bulk_create(
+            Project(
+                campaign=campaign,
+                title=f"Project {i}",
+                slug=f"project-{i}",
+                description=self.get_text(20, 60),
+                published=True,
+            )
+            for i in range(self.projects_per_campaign)
+        )
+        self.counts["projects"] += len(projects)
+
+        if self.topics:
+            Project.topics.through.objects.bulk_create(
+                Project.topics.through(
+                    project_id=project.pk, topic_id=self.random.choice(self.topics).pk
+                )
+                for project in projects
+            )
+
+        self.campaign_activity = Counter()
+        self.campaign_contributors = set()
+
+        for project_number, project in enumerate(projects):
+            self.project_contributors = set()
+
+            for items in chunked(
+                self.create_items(
+                    project, f"{self.prefix}-{campaign_number}-{project_number}"
+                ),
+                max(1, self.chunk_size // max(1, self.assets_per_item)),
+            ):
+                self.create_assets(items)
+
+            ProjectContributor.objects.bulk_create(
+                ProjectContributor(project=project, user_id=user_id)
+                for user_id in self.project_contributors
+            )
+
+        CampaignContributor.objects.bulk_create(
+            CampaignContributor(campaign=campaign, user_id=user_id)
+            for user_id in self.campaign_contributors
+        )
+        UserCampaignActivity.objects.bulk_create(
+            UserCampaignActivity(campaign=campaign, user_id=user_id, action_count=count)
+            for user_id, count in self.campaign_activity.items()
+        )
+
+        Asset.objects.filter(item__project__campaign=campaign).update_search_documents()
+
+        return campaign
+
+    def create_items(self, project, item_id_prefix):
+        items = [
+            Item(
+                pk=pk,
+                project=project,
+                item_id=f"{item_id_prefix}-{i}",
+                title=self.get_text(3, 12).replace("\n", " ").capitalize(),
+                item_url=f"https://www.loc.gov/item/{item_id_prefix}-{i}/",
+                description=self.get_text(20, 60),
+                published=self.random.random() >= UNPUBLISHED_ITEM_RATE,
+            )
+            for i, pk in enumerate(reserve_pks(Item, self.items_per_project))
+        ]
+
+        copy_instances(items)
+        self.counts["items"] += len(items)
+
+        return items
+
+    def create_assets(self, items):
+        """Create the assets for the items and everything attached to them"""
+
+        assets = []
+        transcriptions = []
+        reservations = []
+        tag_collections = []
+        activity = {}
+        item_contributors = set()
+
+        asset_pks = iter(reserve_pks(Asset, len(items) * self.assets_per_item))
+
+        for item in items:
+            for sequence in range(1, self.assets_per_item + 1):
+                status = self.random.choices(
+                    list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+                )[0]
+
+                asset = Asset(
+                    pk=next(asset_pks),
+                    item=item,
+                    title=f"{item.item_id}-{sequence}",
+                    slug=f"{item.item_id}-{sequence}",
+                    media_url=f"{sequence}.jpg",
+                    media_type=MediaType.IMAGE,
+                    sequence=sequence,
+                    published=item.published,
+                    transcription_status=status,
+                    year=str(self.random.randint(1760, 1960)),
+                )
+                assets.append(asset)
+
+                if status == TranscriptionStatus.NOT_STARTED:
+                    continue
+
+                chain = self.get_transcription_chain(asset)
+                transcriptions.extend(chain)
+
+                for transcription in chain:
+                    for user_id, field, timestamp in (
+                        (transcription.user_id, 0, transcription.created_on),
+                        (transcription.reviewed_by_id, 1, transcription.updated_on),
+                    ):
+                        if user_id is None:
+                            continue
+
+                        dates = activity.setdefault((user_id, asset.pk), [None, None])
+                        dates[field] = timestamp
+                        self.campaign_activity[user_id] += 1
+                        # As in update_contributor_tallies, unpublished assets
+                        # are not counted:
+                        if asset.published:
+                            item_contributors.add((item.pk, user_id))
+
+                if (
+                    status == TranscriptionStatus.IN_PROGRESS
+                    and self.random.random() < RESERVATION_RATE
+                ):
+                    reservations.append(
+                        AssetTranscriptionReservation(
+                            asset=asset,
+                            reservation_token=f"{self.random.getrandbits(128):032x}",
+                            created_on=chain[-1].updated_on,
+                            updated_on=chain[-1].updated_on,
+                        )
+                    )
+
+                if self.tags and self.random.random() < TAGGED_ASSET_RATE:
+                    tag_collections.append(
+                        UserAssetTagCollection(
+                            asset=asset,
+                            user_id=chain[0].user_id,
+                            created_on=chain[0].created_on,
+                            updated_on=chain[-1].updated_on,
+                        )
+                    )
+
+        # Each chain is in order so the asset is left referring to the last:
+        for transcription, pk in zip(
+            transcriptions, reserve_pks(Transcription, len(transcriptions))
+        ):
+            transcription.pk = pk
+            transcription.asset.latest_transcription_id = pk
+            if transcription.supersedes:
+                transcription.supersedes_id = transcription.supersedes.pk
+
+        copy_instances(assets)
+        self.counts["assets"] += len(assets)
+
+        copy_instances(transcriptions)
+        self.counts["transcriptions"] += len(transcriptions)
+
+        for reservation, pk in zip(
+            reservations, reserve_pks(AssetTranscriptionReservation, len(reservations))
+        ):
+            reservation.pk = pk
+        copy_instances(reservations)
+        self.counts["reservations"] += len(reservations)
+
+        self.create_tag_collections(tag_collections)
+
+        activity_pks = iter(reserve_pks(UserAssetActivity, len(activity)))
+        copy_instances(
+            [
+                UserAssetActivity(
+                    pk=next(activity_pks),
+                    user_id=user_id,
+                    asset_id=asset_id,
+                    last_transcribed=last_transcribed,
+                    last_reviewed=last_reviewed,
+                )
+                for (user_id, asset_id), (last_transcribed, last_reviewed) in sorted(
+                    activity.items()
+                )
+            ]
+        )
+
+        ItemContributor.objects.bulk_create(
+            ItemContributor(item_id=item_id, user_id=user_id)
+            for item_id, user_id in sorted(item_contributors)
+        )
+        user_ids = {user_id for item_id, user_id in item_contributors}
+        self.project_contributors.update(user_ids)
+        self.campaign_contributors.update(user_ids)
+
+    def get_transcription_chain(self, asset):
+        """
+        Return the unsaved transcriptions of the asset, each superseding the
+        previous one, ending with one which matches the asset's status
+        """
+
+        status = asset.transcription_status
+        transcriber = self.random.choice(self.transcribers)
+
+        rejections = self.random.choices(
+            range(len(REJECTION_WEIGHTS)), REJECTION_WEIGHTS
+        )[0]
+
+        chain = []
+        created_on = self.get_timestamp()
+        text = self.get_text(20, 300)
+
+        for i in range(rejections + 1):
+            transcription = Transcription(
+                asset=asset,
+                user_id=transcriber.pk,
+                created_on=created_on,
+                updated_on=created_on,
+                supersedes=chain[-1] if chain else None,
+                text=text,
+            )
+            chain.append(transcription)
+
+            is_last = i == rejections
+            if is_last and status == TranscriptionStatus.IN_PROGRESS:
+                break
+
+            transcription.submitted = self.get_timestamp(created_on, max_hours=2)
+            transcription.updated_on = transcription.submitted
+
+            if is_last and status == TranscriptionStatus.SUBMITTED:
+                break
+
+            reviewer = self.random.choice(self.reviewers)
+            transcription.reviewed_by_id = reviewer.pk
+            transcription.updated_on = self.get_timestamp(
+                transcription.submitted, max_hours=24 * 14
+            )
+            if is_last:
+                transcription.accepted = transcription.updated_on
+            else:
+                transcription.rejected = transcription.updated_on
+
+            # The next attempt corrects some of the previous text:
+            created_on = self.get_timestamp(transcription.updated_on, max_hours=24 * 7)
+            text = f"{text}\n{self.get_text(5, 30)}"
+
+        return chain
+
+    def create_tag_collections(self, tag_collections):
+        tag_links = []
+
+        for tag_collection, pk in zip(
+            tag_collections,
+            reserve_pks(UserAssetTagCollection, len(tag_collections)),
+        ):
+            tag_collection.pk = pk
+
+            for tag in self.random.sample(
+                self.tags, min(len(self.tags), self.random.randint(1, 5))
+            ):
+                tag_links.append(
+                    UserAssetTagCollection.tags.through(
+                        userassettagcollection_id=pk, tag_id=tag.pk
+                    )
+                )
+
+        copy_instances(tag_collections)
+        self.counts["tag collections"] += len(tag_collections)
+
+        for tag_link, pk in zip(
+            tag_links, reserve_pks(UserAssetTagCollection.tags.through, len(tag_links))
+        ):
+            tag_link.pk = pk
+        copy_instances(tag_links)
+
+        # The copied links do not send m2m_changed so the summaries which the
+        # asset pages and reports use are built here:
+        Asset.objects.filter(
+            pk__in={i.asset_id for i in tag_collections}
+        ).update_tag_summaries()
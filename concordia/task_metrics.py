@@ -0,0 +1,243 @@
+"""
+Instrumentation for Celery tasks
+
+Every task run records its runtime, the time it spent waiting in the queue,
+whether it failed or was retried, the database queries it made and, for the
+importer tasks which report them using record_http_request, the HTTP requests
+it made. These are exported as Prometheus metrics from the worker process (see
+concordia.celery) and added to the hourly TaskStatistics totals which are
+summarized on the task health admin page.
+
+The signal handlers are connected when this module is imported by
+ConcordiaAppConfig.ready().
+"""
+
+from contextvars import ContextVar
+from logging import getLogger
+from time import time
+from timeit import default_timer
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from django.db import DatabaseError, connection
+from django.db.transaction import atomic
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+from prometheus_client import Counter, Histogram
+
+from .middleware import QueryCounter
+from .models import TaskStatistics
+
+logger = getLogger(__name__)
+
+#: Tasks range from sub-second queue maintenance to hour-long reports
+TASK_DURATION_BUCKETS = (
+    0.01,
+    0.1,
+    0.5,
+    1,
+    5,
+    15,
+    60,
+    300,
+    900,
+    3600,
+    float("inf"),
+)
+
+task_runtime = Histogram(
+    "celery_task_runtime_seconds",
+    "Histogram of the time spent running each task",
+    ["task", "state"],
+    buckets=TASK_DURATION_BUCKETS,
+)
+task_queue_wait = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Histogram of the time between each task being queued and starting",
+    ["task"],
+    buckets=TASK_DURATION_BUCKETS,
+)
+task_retries = Counter(
+    "celery_task_retries_total", "Total count of task retries", ["task"]
+)
+task_db_queries = Histogram(
+    "celery_task_db_queries",
+    "Histogram of the number of database queries made by each task",
+    ["task"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000, float("inf")),
+)
+task_db_duration = Histogram(
+    "celery_task_db_duration_seconds",
+    "Histogram of the time spent waiting for the database by each task",
+    ["task"],
+    buckets=TASK_DURATION_BUCKETS,
+)
+task_http_requests = Counter(
+    "celery_task_http_requests_total",
+    "Total count of HTTP requests made by each task",
+    ["task"],
+)
+task_http_bytes = Counter(
+    "celery_task_http_response_bytes_total",
+    "Total size of the HTTP responses received by each task",
+    ["task"],
+)
+
+#: The TaskRun for the task being executed by the current thread
+_current_task_run = ContextVar("current_task_run", default=None)
+
+
+class TaskRun(object):
+    def __init__(self, task_id, parent=None):
+        self.task_id = task_id
+        self.parent = parent
+        self.started = time()
+        self.start_time = default_timer()
+        self.query_counter = QueryCounter()
+        self.http_requests = 0
+        self.http_bytes = 0
+
+
+def record_http_request(response_bytes):
+    """
+    Count an HTTP request, and the size of its response body, towards the
+    metrics for the task which is currently running
+    """
+
+    task_run = _current_task_run.get()
+
+    while task_run is not None:
+        task_run.http_requests += 1
+        task_run.http_bytes += response_bytes
+        task_run = task_run.parent
+
+
+def get_queue_wait(request, started):
+    """
+    Return the seconds between a task being published, or the ETA it was
+    scheduled for, and starting or None if the publication time is unknown
+    """
+
+    published_at = getattr(request, "published_at", None)
+    if published_at is None:
+        return None
+
+    queued_at = published_at
+
+    eta = request.eta
+    if isinstance(eta, str):
+        eta = parse_datetime(eta)
+    if eta is not None and eta.tzinfo is not None:
+        queued_at = max(queued_at, eta.timestamp())
+
+    return max(0, started - queued_at)
+
+
+def record_task_statistics(
+    task_name,
+    *,
+    state,
+    runtime,
+    queue_wait,
+    db_queries,
+    db_duration,
+    http_requests,
+    http_bytes,
+):
+    """
+    Add a task run to the TaskStatistics totals for the current hour using a
+    single upsert so concurrent workers never contend on a read
+    """
+
+    period_start = now().replace(minute=0, second=0, microsecond=0)
+
+    with atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {TaskStatistics._meta.db_table} AS stats (
+                task_name, period_start, runs, failures, retries,
+                runtime, max_runtime, queue_wait, max_queue_wait,
+                db_queries, db_duration, http_requests, http_bytes
+            ) VALUES (%s, %s, 1, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (task_name, period_start) DO UPDATE SET
+                runs = stats.runs + 1,
+                failures = stats.failures + EXCLUDED.failures,
+                retries = stats.retries + EXCLUDED.retries,
+                runtime = stats.runtime + EXCLUDED.runtime,
+                max_runtime = GREATEST(stats.max_runtime, EXCLUDED.max_runtime),
+                queue_wait = stats.queue_wait + EXCLUDED.queue_wait,
+                max_queue_wait = GREATEST(
+                    stats.max_queue_wait, EXCLUDED.max_queue_wait
+                ),
+                db_queries = stats.db_queries + EXCLUDED.db_queries,
+                db_duration = stats.db_duration + EXCLUDED.db_duration,
+                http_requests = stats.http_requests + EXCLUDED.http_requests,
+                http_bytes = stats.http_bytes + EXCLUDED.http_bytes
+            """,
+            [
+                task_name,
+                period_start,
+                int(state == "FAILURE"),
+                int(state == "RETRY"),
+                runtime,
+                runtime,
+                queue_wait or 0,
+                queue_wait or 0,
+                db_queries,
+                db_duration,
+                http_requests,
+                http_bytes,
+            ],
+        )
+
+
+@before_task_publish.connect
+def add_published_at_header(headers=None, **kwargs):
+    # Retries are published again so this is reset for every attempt:
+    if headers is not None:
+        headers["published_at"] = time()
+
+
+@task_prerun.connect
+def start_task_run(task_id=None, task=None, **kwargs):
+    task_run = TaskRun(task_id, parent=_current_task_run.get())
+    connection.execute_wrappers.append(task_run.query_counter)
+    _current_task_run.set(task_run)
+
+
+@task_postrun.connect
+def finish_task_run(task_id=None, task=None, state=None, **kwargs):
+    task_run = _current_task_run.get()
+    if task_run is None or task_run.task_id != task_id:
+        logger.warning("Task %s finished without a matching task_prerun", task_id)
+        return
+
+    _current_task_run.set(task_run.parent)
+    connection.execute_wrappers.remove(task_run.query_counter)
+
+    runtime = default_timer() - task_run.start_time
+    queue_wait = get_queue_wait(task.request, task_run.started)
+    counter = task_run.query_counter
+
+    task_runtime.labels(task.name, state).observe(runtime)
+    if queue_wait is not None:
+        task_queue_wait.labels(task.name).observe(queue_wait)
+    if state == "RETRY":
+        task_retries.labels(task.name).inc()
+    task_db_queries.labels(task.name).observe(counter.count)
+    task_db_duration.labels(task.name).observe(counter.duration)
+    task_http_requests.labels(task.name).inc(task_run.http_requests)
+    task_http_bytes.labels(task.name).inc(task_run.http_bytes)
+
+    try:
+        record_task_statistics(
+            task.name,
+            state=state,
+            runtime=runtime,
+            queue_wait=queue_wait,
+            db_queries=counter.count,
+            db_duration=counter.duration,
+            http_requests=task_run.http_requests,
+            http_bytes=task_run.http_bytes,
+        )
+    except DatabaseError:
+        logger.exception("Unable to record statistics for task %s", task_id)
@@ -1,92 +1,128 @@
 import datetime
+from collections import Counter, defaultdict
+from functools import wraps
 from logging import getLogger
 
-from celery import task
+from captcha.models import CaptchaStore
+from celery import chord, task
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.management import call_command
-from django.db.models import Count
+from django.db import connection
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.transaction import atomic
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+from django_elasticsearch_dsl.registries import registry
 from more_itertools.more import chunked
 
+from concordia.captcha_pool import FILL_SCHEDULED_CACHE_KEY, fill_pool
 from concordia.models import (
     Asset,
+    AssetTag,
     AssetTranscriptionReservation,
+    BulkActionJob,
     Campaign,
+    CampaignContributor,
     Item,
+    ItemContributor,
     Project,
+    ProjectContributor,
     SiteReport,
     Tag,
     Topic,
     Transcription,
+    TranscriptionStatus,
+    UserAssetActivity,
     UserAssetTagCollection,
+    UserCampaignActivity,
 )
-from concordia.signals.signals import reservation_released
-from concordia.utils import get_anonymous_user
+from concordia.search_index import (
+    UPDATE_SCHEDULED_CACHE_KEY,
+    activate_versioned_index,
+    create_versioned_index,
+    get_document_class,
+    get_reindex_pk_ranges,
+    populate_versioned_index,
+    queue_search_index_changes,
+    update_search_index,
+    update_search_indices_changed_since,
+)
+from concordia.signals.signals import assets_updated, reservations_released
+from concordia.storage import ASSET_STORAGE
+from concordia.utils import clear_item_asset_navigation, get_anonymous_user_id
 
 logger = getLogger(__name__)
 
 
 @task
 def expire_inactive_asset_reservations():
-    timestamp = datetime.datetime.now()
-
     # Clear old reservations, with a grace period:
-    cutoff = timestamp - (
+    cutoff = now() - (
         datetime.timedelta(seconds=2 * settings.TRANSCRIPTION_RESERVATION_SECONDS)
     )
 
-    logger.debug("Clearing reservations with last reserve time older than %s" % cutoff)
-    expired_reservations = AssetTranscriptionReservation.objects.filter(
-        updated_on__lt=cutoff, tombstoned__in=(None, False)
-    )
+    logger.debug("Clearing reservations with last reserve time older than %s", cutoff)
 
-    for reservation in expired_reservations:
-        logger.debug(
-            "Expired reservation with token %s" % reservation.reservation_token
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            DELETE FROM concordia_assettranscriptionreservation
+            WHERE updated_on < %s AND tombstoned IS NOT TRUE
+            RETURNING asset_id, reservation_token
+            """,
+            [cutoff],
         )
-        reservation_released.send(
-            sender="reserve_asset",
-            asset_pk=reservation.asset.pk,
-            reservation_token=reservation.reservation_token,
+        expired_reservations = [
+            {"asset_pk": asset_pk, "reservation_token": reservation_token}
+            for asset_pk, reservation_token in cursor.fetchall()
+        ]
+
+    if expired_reservations:
+        logger.debug("Expired %d reservations", len(expired_reservations))
+        reservations_released.send(
+            sender="reserve_asset", reservations=expired_reservations
         )
-        reservation.delete()
 
 
 @task
 def tombstone_old_active_asset_reservations():
-    timestamp = datetime.datetime.now()
+    timestamp = now()
 
     cutoff = timestamp - (
         datetime.timedelta(hours=settings.TRANSCRIPTION_RESERVATION_TOMBSTONE_HOURS)
     )
 
-    old_reservations = AssetTranscriptionReservation.objects.filter(
+    # The tombstone period is measured from updated_on so this must be set
+    # explicitly since QuerySet.update() does not apply auto_now:
+    tombstoned = AssetTranscriptionReservation.objects.filter(
         created_on__lt=cutoff, tombstoned__in=(None, False)
-    )
-    for reservation in old_reservations:
-        logger.debug("Tombstoning reservation %s " % reservation.reservation_token)
-        reservation.tombstoned = True
-        reservation.save()
+    ).update(tombstoned=True, updated_on=timestamp)
+
+    logger.debug("Tombstoned %d reservations", tombstoned)
 
 
 @task
 def delete_old_tombstoned_reservations():
-    timestamp = datetime.datetime.now()
-
-    cutoff = timestamp - (
+    cutoff = now() - (
         datetime.timedelta(
             hours=settings.TRANSCRIPTION_RESERVATION_TOMBSTONE_LENGTH_HOURS
         )
     )
 
-    old_reservations = AssetTranscriptionReservation.objects.filter(
-        tombstoned__exact=True, updated_on__lt=cutoff
-    )
-    for reservation in old_reservations:
-        logger.debug(
-            "Deleting old tombstoned reservation %s" % reservation.reservation_token
+    # This avoids QuerySet.delete() because the search index signal handlers
+    # would cause every reservation to be loaded before deleting it:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            DELETE FROM concordia_assettranscriptionreservation
+            WHERE tombstoned AND updated_on < %s
+            """,
+            [cutoff],
         )
-        reservation.delete()
+        logger.debug("Deleted %d old tombstoned reservations", cursor.rowcount)
 
 
 @task
@@ -123,12 +159,12 @@ def site_report():
     users_activated = User.objects.filter(is_active=True).count()
 
     anonymous_transcriptions = Transcription.objects.filter(
-        user=get_anonymous_user()
+        user_id=get_anonymous_user_id()
     ).count()
     transcriptions_saved = Transcription.objects.all().count()
 
-    stats = UserAssetTagCollection.objects.aggregate(Count("tags"))
-    tag_count = stats["tags__count"]
+    stats = AssetTag.objects.aggregate(Sum("user_count"))
+    tag_count = stats["user_count__sum"] or 0
 
     distinct_tag_count = Tag.objects.all().count()
 
@@ -194,25 +230,17 @@ def topic_report(topic):
     projects_unpublished = Project.objects.unpublished().filter(topics=topic).count()
 
     anonymous_transcriptions = Transcription.objects.filter(
-        asset__item__project__topics=topic, user=get_anonymous_user()
+        asset__item__project__topics=topic, user_id=get_anonymous_user_id()
     ).count()
     transcriptions_saved = Transcription.objects.filter(
         asset__item__project__topics=topic
     ).count()
 
-    asset_tag_collections = UserAssetTagCollection.objects.filter(
-        asset__item__project__topics=topic
+    stats = AssetTag.objects.filter(asset__item__project__topics=topic).aggregate(
+        tag_count=Sum("user_count"), distinct_tag_count=Count("tag", distinct=True)
     )
-
-    stats = asset_tag_collections.order_by().aggregate(tag_count=Count("tags"))
-    tag_count = stats["tag_count"]
-
-    distinct_tag_list = set()
-
-    for tag_collection in asset_tag_collections:
-        distinct_tag_list.update(tag_collection.tags.values_list("pk", flat=True))
-
-    distinct_tag_count = len(distinct_tag_list)
+    tag_count = stats["tag_count"] or 0
+    distinct_tag_count = stats["distinct_tag_count"]
 
     site_report = SiteReport()
     site_report.topic = topic
@@ -273,25 +301,17 @@ def campaign_report(campaign):
     )
 
     anonymous_transcriptions = Transcription.objects.filter(
-        asset__item__project__campaign=campaign, user=get_anonymous_user()
+        asset__item__project__campaign=campaign, user_id=get_anonymous_user_id()
     ).count()
     transcriptions_saved = Transcription.objects.filter(
         asset__item__project__campaign=campaign
     ).count()
 
-    asset_tag_collections = UserAssetTagCollection.objects.filter(
-        asset__item__project__campaign=campaign
+    stats = AssetTag.objects.filter(asset__item__project__campaign=campaign).aggregate(
+        tag_count=Sum("user_count"), distinct_tag_count=Count("tag", distinct=True)
     )
-
-    stats = asset_tag_collections.order_by().aggregate(tag_count=Count("tags"))
-    tag_count = stats["tag_count"]
-
-    distinct_tag_list = set()
-
-    for tag_collection in asset_tag_collections:
-        distinct_tag_list.update(tag_collection.tags.values_list("pk", flat=True))
-
-    distinct_tag_count = len(distinct_tag_list)
+    tag_count = stats["tag_count"] or 0
+    distinct_tag_count = stats["distinct_tag_count"]
 
     site_report = SiteReport()
     site_report.campaign = campaign
@@ -352,6 +372,477 @@ def calculate_difficulty_values(asset_qs=None):
     return updated_count
 
 
+@task
+def reconcile_contributor_tallies(campaign_pks=None):
+    """
+    Rebuild the campaign, project and item contributor tallies from the full
+    transcription history of the published assets, correcting any drift from
+    the incremental updates
+
+    If a list of campaign primary keys is provided, only the tallies for those
+    campaigns and their projects and items are rebuilt.
+    """
+
+    tally_count = 0
+
+    for model, scope_field, lookup, campaign_lookup in (
+        (
+            CampaignContributor,
+            "campaign_id",
+            "asset__item__project__campaign",
+            "campaign__in",
+        ),
+        (
+            ProjectContributor,
+            "project_id",
+            "asset__item__project",
+            "project__campaign__in",
+        ),
+        (ItemContributor, "item_id", "asset__item", "item__project__campaign__in"),
+    ):
+        tally_qs = model.objects.all()
+        transcription_qs = Transcription.objects.filter(asset__published=True)
+
+        if campaign_pks is not None:
+            tally_qs = tally_qs.filter(**{campaign_lookup: campaign_pks})
+            transcription_qs = transcription_qs.filter(
+                asset__item__project__campaign__in=campaign_pks
+            )
+
+        with atomic():
+            tally_qs.delete()
+
+            for user_field in ("user", "reviewed_by"):
+                contributor_qs = (
+                    transcription_qs.filter(**{f"{user_field}__isnull": False})
+                    .values_list(lookup, user_field)
+                    .order_by()
+                    .distinct()
+                )
+
+                for chunk in chunked(contributor_qs.iterator(), 1000):
+                    model.objects.bulk_create(
+                        [
+                            model(user_id=user_id, **{scope_field: scope_id})
+                            for scope_id, user_id in chunk
+                        ],
+                        ignore_conflicts=True,
+                    )
+
+            tally_count += tally_qs.count()
+
+    return tally_count
+
+
+@task
+def backfill_latest_transcriptions(batch_size=5000):
+    """
+    Set Asset.latest_transcription from the Transcription records in batches
+    of primary keys, returning the number of assets processed
+
+    Each batch is a separate set-based UPDATE so the row locks are held
+    briefly on large tables.
+    """
+
+    pk_range = Asset.objects.aggregate(Min("pk"), Max("pk"))
+    if pk_range["pk__min"] is None:
+        return 0
+
+    updated_count = 0
+
+    for start in range(pk_range["pk__min"], pk_range["pk__max"] + 1, batch_size):
+        with atomic():
+            updated_count += Asset.objects.filter(
+                pk__gte=start, pk__lt=start + batch_size
+            ).update_latest_transcriptions()
+
+    return updated_count
+
+
+@task
+def reopen_assets(asset_pks, user_pk):
+    """
+    Reopen the completed assets from the provided list by rejecting each
+    asset's latest transcription on behalf of the provided user, returning the
+    number of assets which were reopened
+
+    This has the same effect as saving a new rejected Transcription for each
+    asset, which is prohibitively slow for large selections because every
+    save runs the post_save handlers, so the transcriptions are created using
+    bulk_create and the rollups are updated using set-based queries.
+    """
+
+    timestamp = now()
+
+    with atomic():
+        # The locks prevent two overlapping requests from both reopening an asset:
+        asset_qs = (
+            Asset.objects.filter(
+                pk__in=asset_pks,
+                transcription_status=TranscriptionStatus.COMPLETED,
+                latest_transcription__isnull=False,
+            )
+            .select_for_update(of=("self",))
+            .values_list(
+                "pk",
+                "latest_transcription_id",
+                "latest_transcription__text",
+                "item_id",
+                "item__project_id",
+                "item__project__campaign_id",
+                "published",
+            )
+        )
+        assets = list(asset_qs)
+
+        if not assets:
+            return 0
+
+        reopened_pks = [asset_pk for asset_pk, *_ in assets]
+
+        transcriptions = Transcription.objects.bulk_create(
+            [
+                Transcription(
+                    asset_id=asset_pk,
+                    supersedes_id=latest_transcription_pk,
+                    text=text,
+                    user_id=user_pk,
+                    reviewed_by_id=user_pk,
+                    rejected=timestamp,
+                )
+                for asset_pk, latest_transcription_pk, text, *_ in assets
+            ],
+            batch_size=1000,
+        )
+
+        reopened_qs = Asset.objects.filter(pk__in=reopened_pks)
+        reopened_qs.update_latest_transcriptions()
+        reopened_qs.update(transcription_status=TranscriptionStatus.IN_PROGRESS)
+
+        # The full-text search documents don't need to be updated because each
+        # new transcription has the same text as the one it supersedes but the
+        # Elasticsearch documents include the status:
+        queue_search_index_changes(
+            [Asset(pk=asset_pk) for asset_pk in reopened_pks] + transcriptions
+        )
+
+        calculate_difficulty_values(reopened_qs)
+
+        # As in update_contributor_tallies, unpublished assets are not counted:
+        published_assets = [i for i in assets if i[6]]
+        for model, scope_field, scope_pks in (
+            (ItemContributor, "item_id", {i[3] for i in published_assets}),
+            (ProjectContributor, "project_id", {i[4] for i in published_assets}),
+            (CampaignContributor, "campaign_id", {i[5] for i in published_assets}),
+        ):
+            model.objects.bulk_create(
+                [model(user_id=user_pk, **{scope_field: pk}) for pk in scope_pks],
+                ignore_conflicts=True,
+            )
+
+        UserAssetActivity.objects.bulk_create(
+            [
+                UserAssetActivity(user_id=user_pk, asset_id=asset_pk)
+                for asset_pk in reopened_pks
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        UserAssetActivity.objects.filter(
+            user_id=user_pk, asset_id__in=reopened_pks
+        ).update(last_transcribed=timestamp, last_reviewed=timestamp)
+
+        # Each transcription counts as one action since the user is both the
+        # transcriber and reviewer:
+        campaign_actions = Counter(i[5] for i in assets)
+        UserCampaignActivity.objects.bulk_create(
+            [
+                UserCampaignActivity(user_id=user_pk, campaign_id=campaign_pk)
+                for campaign_pk in campaign_actions
+            ],
+            ignore_conflicts=True,
+        )
+        for campaign_pk, count in campaign_actions.items():
+            UserCampaignActivity.objects.filter(
+                user_id=user_pk, campaign_id=campaign_pk
+            ).update(action_count=F("action_count") + count)
+
+    assets_updated.send(sender="reopen_assets", asset_pks=reopened_pks)
+
+    return len(reopened_pks)
+
+
+def update_bulk_action_job(f):
+    """
+    Decorator for tasks which process a BulkActionJob, whose primary key is
+    their first argument, to record when the job was started, completed or
+    failed
+    """
+
+    @wraps(f)
+    def inner(job_pk, *args, **kwargs):
+        job = BulkActionJob.objects.get(pk=job_pk)
+        job.last_started = now()
+        job.save()
+
+        try:
+            f(job, *args, **kwargs)
+        except Exception as exc:
+            job.failed = now()
+            job.status = f"{job.status}\n\nUnhandled exception: {exc}".strip()
+            job.save()
+            raise
+        else:
+            job.completed = now()
+            job.save()
+
+    return inner
+
+
+@task(acks_late=True)
+@update_bulk_action_job
+def publish_items(job, item_pks, published, batch_size=2000):
+    """
+    Publish or unpublish the provided items and their assets
+
+    The assets are updated in batches of primary keys so each transaction only
+    holds locks briefly and the job progress is updated after each batch along
+    with the caches and search documents for the changed assets. Running the
+    job again resumes where it stopped since assets which already have the
+    requested state are skipped.
+    """
+
+    items = Item.objects.filter(pk__in=item_pks)
+    assets = Asset.objects.filter(item__in=item_pks).exclude(published=published)
+
+    job.total = assets.count()
+    job.processed = 0
+    job.save(update_fields=["total", "processed"])
+
+    # Unpublished items are hidden before their assets are and published items
+    # are not visible until their assets are ready:
+    if not published:
+        items.filter(published=True).update(published=False)
+
+    last_pk = 0
+    while True:
+        with atomic():
+            changed = list(
+                assets.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "item_id")[:batch_size]
+            )
+            if not changed:
+                break
+
+            asset_pks = [pk for pk, _ in changed]
+            Asset.objects.filter(pk__in=asset_pks).update(published=published)
+            queue_search_index_changes([Asset(pk=pk) for pk in asset_pks])
+
+        clear_item_asset_navigation({item_pk for _, item_pk in changed})
+
+        last_pk = asset_pks[-1]
+        job.processed += len(asset_pks)
+        job.save(update_fields=["processed"])
+
+    if published:
+        items.filter(published=False).update(published=True)
+
+    clear_item_asset_navigation(item_pks)
+
+    # Only work on published assets is included in the contributor tallies:
+    if job.processed:
+        reconcile_contributor_tallies(
+            list(
+                items.values_list("project__campaign", flat=True).order_by().distinct()
+            )
+        )
+
+
+#: Tables which reference assets, emptied for each batch of deleted assets
+#: before the assets themselves. The tag collections' tags and the search
+#: documents are handled separately since they are also reindexed:
+ASSET_DEPENDENT_TABLES = (
+    "concordia_assettag",
+    "concordia_assettranscriptionreservation",
+    "concordia_userassetactivity",
+    "concordia_assetsearchdocument",
+    "importer_importitemasset",
+)
+
+
+def delete_asset_batch(asset_pks):
+    """
+    Delete the provided assets and every record which depends on them using
+    one set-based statement per table rather than the ORM's cascade, which
+    loads each related object to send its signals
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            DELETE FROM concordia_userassettagcollection_tags
+            WHERE userassettagcollection_id IN (
+                SELECT id FROM concordia_userassettagcollection
+                WHERE asset_id = ANY(%s)
+            )
+            """,
+            [asset_pks],
+        )
+
+        cursor.execute(
+            """
+            DELETE FROM concordia_userassettagcollection
+            WHERE asset_id = ANY(%s) RETURNING id
+            """,
+            [asset_pks],
+        )
+        tag_collection_pks = [pk for pk, in cursor.fetchall()]
+
+        for table in ASSET_DEPENDENT_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE asset_id = ANY(%s)", [asset_pks])
+
+        # The foreign keys are checked when the transaction is committed so the
+        # assets' references to their latest transcription do not need to be
+        # cleared first:
+        cursor.execute(
+            "DELETE FROM concordia_transcription WHERE asset_id = ANY(%s) RETURNING id",
+            [asset_pks],
+        )
+        transcription_pks = [pk for pk, in cursor.fetchall()]
+
+        cursor.execute("DELETE FROM concordia_asset WHERE id = ANY(%s)", [asset_pks])
+
+    # The deleted records are removed from the search indices when the queue
+    # is processed:
+    queue_search_index_changes(
+        [Asset(pk=pk) for pk in asset_pks]
+        + [Transcription(pk=pk) for pk in transcription_pks]
+        + [UserAssetTagCollection(pk=pk) for pk in tag_collection_pks]
+    )
+
+
+def delete_asset_images(storage_names):
+    """
+    Remove asset images from storage, returning the number which could not be
+    deleted
+    """
+
+    failures = 0
+
+    for name in storage_names:
+        try:
+            ASSET_STORAGE.delete(name)
+        except Exception:
+            logger.exception("Unable to delete asset image %s", name)
+            failures += 1
+
+    return failures
+
+
+def delete_assets_in_batches(job, assets, batch_size):
+    """
+    Delete the assets in batches of primary keys, each in its own transaction,
+    followed by their images and update the job progress after each batch
+    """
+
+    job.total = assets.count()
+    job.processed = 0
+    job.save(update_fields=["total", "processed"])
+
+    image_failures = 0
+
+    while True:
+        with atomic():
+            batch = list(
+                assets.order_by("pk").values_list(
+                    "pk",
+                    "item_id",
+                    "item__project__campaign__slug",
+                    "item__project__slug",
+                    "item__item_id",
+                    "media_url",
+                )[:batch_size]
+            )
+            if not batch:
+                break
+
+            delete_asset_batch([asset_pk for asset_pk, *_ in batch])
+
+        clear_item_asset_navigation({item_pk for _, item_pk, *_ in batch})
+
+        # The images are removed after the transaction has been committed so a
+        # failed batch never leaves assets without their images:
+        image_failures += delete_asset_images(
+            "/".join(storage_path) for _, _, *storage_path in batch
+        )
+
+        job.processed += len(batch)
+        job.save(update_fields=["processed"])
+
+    if image_failures:
+        job.status = f"Unable to delete {image_failures} asset images from storage"
+        job.save(update_fields=["status"])
+
+
+@task(acks_late=True)
+@update_bulk_action_job
+def delete_items(job, item_pks, batch_size=1000):
+    """
+    Delete the provided items, their assets and everything which depends on
+    them, in batches so the site is not blocked by one large transaction
+
+    The items are unpublished first so volunteers are not sent to them while
+    the job is running. Running the job again resumes where it stopped.
+    """
+
+    items = Item.objects.filter(pk__in=item_pks)
+    items.update(published=False)
+
+    campaign_pks = list(
+        items.values_list("project__campaign", flat=True).order_by().distinct()
+    )
+
+    delete_assets_in_batches(job, Asset.objects.filter(item__in=item_pks), batch_size)
+
+    # The items no longer have any assets so the cascade is now cheap:
+    items.delete()
+
+    clear_item_asset_navigation(item_pks)
+
+    # The campaigns' tallies still include the volunteers who only worked on
+    # the deleted items:
+    reconcile_contributor_tallies(campaign_pks)
+
+
+@task(acks_late=True)
+@update_bulk_action_job
+def delete_projects(job, project_pks, batch_size=1000):
+    """
+    Delete the provided projects, their items and assets and everything which
+    depends on them in the same way as delete_items
+    """
+
+    projects = Project.objects.filter(pk__in=project_pks)
+    projects.update(published=False)
+
+    campaign_pks = list(
+        projects.values_list("campaign", flat=True).order_by().distinct()
+    )
+
+    item_pks = list(
+        Item.objects.filter(project__in=project_pks).values_list("pk", flat=True)
+    )
+
+    delete_assets_in_batches(job, Asset.objects.filter(item__in=item_pks), batch_size)
+
+    projects.delete()
+
+    clear_item_asset_navigation(item_pks)
+
+    reconcile_contributor_tallies(campaign_pks)
+
+
 @task
 def populate_asset_years():
     """
@@ -395,6 +886,150 @@ def populate_elasticsearch_indices():
     call_command("search_index", action="populate")
 
 
+@task(ignore_result=True)
+def update_search_indices():
+    """
+    Process the queue of records recorded by
+    concordia.search_index.QueuedSignalProcessor in batches
+    """
+
+    # Changes queued from now on will schedule another run if this one has
+    # already passed them:
+    cache.delete(UPDATE_SCHEDULED_CACHE_KEY)
+
+    processed_count = 0
+
+    while True:
+        with atomic():
+            # Each batch is claimed by deleting it before the records are read
+            # so a change queued while they are being indexed adds a new entry
+            # rather than being removed with the batch. Entries locked by a
+            # transaction which is still changing the record are skipped:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    DELETE FROM concordia_searchindexchange
+                    WHERE id IN (
+                        SELECT id FROM concordia_searchindexchange
+                        ORDER BY id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING content_type_id, object_id
+                    """,
+                    [settings.SEARCH_INDEX_BATCH_SIZE],
+                )
+                changes = cursor.fetchall()
+
+            if not changes:
+                break
+
+            pks_by_model = defaultdict(set)
+            for content_type_id, object_id in changes:
+                model = ContentType.objects.get_for_id(content_type_id).model_class()
+                pks_by_model[model].add(object_id)
+
+            for model, pks in pks_by_model.items():
+                update_search_index(model, pks)
+
+        processed_count += len(changes)
+
+    logger.info("Processed %d queued search index changes", processed_count)
+
+    return processed_count
+
+
+@task
+def rebuild_search_indices():
+    """
+    Rebuild every search index without interrupting searches of the live data
+    """
+
+    for document_class in registry.get_documents():
+        rebuild_search_index.delay(document_class.__name__)
+
+
+@task
+def rebuild_search_index(document_name):
+    """
+    Build a new versioned index for the named document, loading it in parallel
+    using one task for each chunk of primary keys, and then swap the live alias
+    to point at it
+    """
+
+    document_class = get_document_class(document_name)
+
+    started = now()
+    index_name = create_versioned_index(
+        document_class, started.strftime("%Y%m%d%H%M%S")
+    )
+
+    pk_ranges = get_reindex_pk_ranges(
+        document_class, settings.SEARCH_INDEX_REBUILD_CHUNK_SIZE
+    )
+
+    logger.info(
+        "Rebuilding %s in %s using %d chunks",
+        document_name,
+        index_name,
+        len(pk_ranges),
+    )
+
+    activate = activate_search_index.si(document_name, index_name, started.isoformat())
+
+    if pk_ranges:
+        chord(
+            populate_search_index_chunk.si(document_name, index_name, start, end)
+            for start, end in pk_ranges
+        )(activate)
+    else:
+        activate.delay()
+
+    return index_name
+
+
+@task(acks_late=True)
+def populate_search_index_chunk(document_name, index_name, start, end):
+    document_class = get_document_class(document_name)
+    return populate_versioned_index(document_class, index_name, start, end)
+
+
+@task
+def activate_search_index(document_name, index_name, started):
+    document_class = get_document_class(document_name)
+
+    activate_versioned_index(document_class, index_name)
+
+    # Deletions are only recorded in the queue so any which have not been
+    # processed yet need to be applied to the new index now:
+    processed_count = update_search_indices()
+
+    # Changes made while the new index was being loaded went to the old index:
+    return processed_count + update_search_indices_changed_since(
+        parse_datetime(started), document_classes=[document_class]
+    )
+
+
 @task
 def delete_elasticsearch_indices():
     call_command("search_index", "-f", action="delete")
+
+
+@task(ignore_result=True)
+def fill_captcha_pool():
+    """
+    Generate captcha challenges for the empty slots in the pool used by
+    concordia.captcha_pool.get_captcha_key()
+    """
+
+    # Slots emptied from now on will schedule another run:
+    cache.delete(FILL_SCHEDULED_CACHE_KEY)
+
+    generated = fill_pool()
+    logger.info("Generated %d captcha challenges", generated)
+    return generated
+
+
+@task(ignore_result=True)
+def remove_expired_captchas():
+    CaptchaStore.remove_expired()
@@ -3,10 +3,17 @@ Tests for user account-related views
 """
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils.timezone import now
 
-from concordia.models import User
+from concordia.models import Transcription, User
 
-from .utils import CacheControlAssertions, CreateTestUsers, JSONAssertMixin
+from .utils import (
+    CacheControlAssertions,
+    CreateTestUsers,
+    JSONAssertMixin,
+    create_asset,
+    create_item,
+)
 
 
 @override_settings(RATELIMIT_ENABLE=False)
@@ -34,6 +41,53 @@ class ConcordiaViewTests(
         self.assertContains(response, self.user.username)
         self.assertContains(response, self.user.email)
 
+    def test_AccountProfileView_activity(self):
+        """
+        Confirm that the profile lists the user's most recent action on each
+        asset and the number of actions in each campaign
+        """
+
+        self.login_user()
+        other_user = self.create_test_user("other")
+
+        transcribed_asset = create_asset()
+        reviewed_asset = create_asset(
+            item=create_item(
+                project=transcribed_asset.item.project, item_id="reviewed-item"
+            )
+        )
+
+        for i in range(2):
+            t = Transcription(asset=transcribed_asset, user=self.user)
+            t.full_clean()
+            t.save()
+
+        t = Transcription(asset=reviewed_asset, user=other_user, submitted=now())
+        t.full_clean()
+        t.save()
+        t.accepted = now()
+        t.reviewed_by = self.user
+        t.full_clean()
+        t.save()
+
+        response = self.client.get(reverse("user-profile"))
+        self.assertEqual(response.status_code, 200)
+
+        interactions = {
+            asset.pk: asset.last_interaction_type
+            for _, _, _, asset in response.context["object_list"]
+        }
+        self.assertEqual(
+            interactions,
+            {transcribed_asset.pk: "transcribed", reviewed_asset.pk: "reviewed"},
+        )
+
+        contributed_campaigns = response.context["contributed_campaigns"]
+        self.assertEqual(
+            contributed_campaigns, [transcribed_asset.item.project.campaign]
+        )
+        self.assertEqual(contributed_campaigns[0].action_count, 3)
+
     def test_AccountProfileView_post(self):
         """
         This unit test tests the post entry for the route account/profile
@@ -0,0 +1,154 @@
+"""
+Tests for the changelists of the large tables in the admin
+"""
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from concordia.admin import AssetAdmin
+from concordia.admin.changelists import EstimatedCountPaginator
+from concordia.models import Asset, Transcription, User
+
+from .utils import create_asset, create_item, create_project
+
+
+class LargeTableAdminTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_login(self.user)
+
+        self.item = create_item(item_id="first-item")
+        self.assets = [
+            create_asset(item=self.item, title=f"Asset {i}", slug=f"asset-{i}")
+            for i in range(5)
+        ]
+
+        self.changelist_url = reverse("admin:concordia_asset_changelist")
+
+    def test_estimated_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE concordia_asset")
+
+        paginator = EstimatedCountPaginator(Asset.objects.order_by("pk"), 100)
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.count_is_estimate)
+
+        with mock.patch.object(EstimatedCountPaginator, "estimate_threshold", 1):
+            paginator = EstimatedCountPaginator(Asset.objects.order_by("pk"), 100)
+            self.assertEqual(paginator.count, 5)
+            self.assertTrue(paginator.count_is_estimate)
+
+            # Filtered querysets are always counted:
+            paginator = EstimatedCountPaginator(
+                Asset.objects.filter(title="Asset 1").order_by("pk"), 100
+            )
+            self.assertEqual(paginator.count, 1)
+            self.assertFalse(paginator.count_is_estimate)
+
+    def test_keyset_pagination(self):
+        with mock.patch.object(AssetAdmin, "list_per_page", 2):
+            response = self.client.get(self.changelist_url)
+            self.assertEqual(response.status_code, 200)
+
+            cl = response.context["cl"]
+            self.assertEqual(list(cl.result_list), self.assets[:2])
+            self.assertEqual(cl.next_page_query_string, f"?after={self.assets[1].pk}")
+
+            response = self.client.get(self.changelist_url + cl.next_page_query_string)
+            cl = response.context["cl"]
+            self.assertEqual(list(cl.result_list), self.assets[2:4])
+            self.assertContains(response, "First page")
+
+            response = self.client.get(self.changelist_url, {"after": "invalid"})
+            self.assertRedirects(response, self.changelist_url + "?e=1")
+
+            # Other orderings use the standard page numbers:
+            response = self.client.get(self.changelist_url, {"o": "5"})
+            cl = response.context["cl"]
+            self.assertIsNone(cl.keyset_ordering)
+            self.assertEqual(cl.paginator.num_pages, 3)
+
+    def test_search(self):
+        other_item = create_item(item_id="second-item", project=self.item.project)
+        other_asset = create_asset(item=other_item, slug="other-asset")
+
+        response = self.client.get(self.changelist_url, {"q": "SECOND"})
+        self.assertEqual(list(response.context["cl"].result_list), [other_asset])
+
+        response = self.client.get(self.changelist_url, {"q": "asset 1"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.assets[1]])
+
+    def test_transcription_search(self):
+        transcriptions = []
+        for text in ("The original draft", "The revised text"):
+            transcription = Transcription(
+                asset=self.assets[0],
+                user=self.user,
+                text=text,
+                supersedes=transcriptions[-1] if transcriptions else None,
+            )
+            transcription.full_clean()
+            transcription.save()
+            transcriptions.append(transcription)
+
+        changelist_url = reverse("admin:concordia_transcription_changelist")
+
+        # Only the asset's latest transcription is matched by its text:
+        response = self.client.get(changelist_url, {"q": "revised"})
+        self.assertEqual(list(response.context["cl"].result_list), [transcriptions[1]])
+
+        response = self.client.get(changelist_url, {"q": "draft"})
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+        # The user matches include every revision:
+        response = self.client.get(changelist_url, {"q": "admin@example"})
+        self.assertEqual(set(response.context["cl"].result_list), set(transcriptions))
+
+    def test_autocomplete_list_filters(self):
+        other_project = create_project(
+            campaign=self.item.project.campaign, slug="other-project"
+        )
+        other_item = create_item(project=other_project, item_id="other-item")
+        other_asset = create_asset(item=other_item, slug="other-asset")
+
+        response = self.client.get(
+            self.changelist_url, {"item__project__in": other_project.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["cl"].result_list), [other_asset])
+
+        # The projects are loaded by the autocomplete view except for the one
+        # which is selected:
+        self.assertContains(
+            response, reverse("admin:concordia_project_autocomplete"), count=1
+        )
+        self.assertContains(
+            response, f'<option value="{other_project.pk}" selected>', count=1
+        )
+        self.assertNotContains(response, f'<option value="{self.item.project.pk}"')
+
+        response = self.client.get(
+            self.changelist_url,
+            {"item__project__in": f"{self.item.project.pk},{other_project.pk}"},
+        )
+        self.assertEqual(response.context["cl"].result_count, 6)
+
+    def test_other_changelists(self):
+        campaign = self.item.project.campaign
+
+        for url, params in (
+            (reverse("admin:concordia_item_changelist"), "project__campaign__in"),
+            (
+                reverse("admin:concordia_transcription_changelist"),
+                "asset__item__project__campaign__in",
+            ),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url, {params: campaign.pk})
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(
+                    response, reverse("admin:concordia_campaign_autocomplete")
+                )
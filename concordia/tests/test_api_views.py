@@ -72,6 +72,8 @@ class ConcordiaViewTests(JSONAssertMixin, TestCase):
                 )
 
         Transcription.objects.bulk_create(cls.transcriptions)
+        # bulk_create() does not send the signals which maintain this:
+        Asset.objects.update_latest_transcriptions()
 
         submitted_t = cls.transcriptions[-1]
         submitted_t.submitted = now()
@@ -0,0 +1,104 @@
+"""
+Tests for the HTTP load test of the volunteer workflow
+"""
+
+from timeit import default_timer
+
+from django.test import LiveServerTestCase, TestCase, modify_settings, override_settings
+
+from concordia.load_testing import LoadTestResults, Reviewer, Transcriber, percentile
+from concordia.models import Asset, Transcription, TranscriptionStatus, User
+
+from .utils import create_asset, create_item
+
+
+class LoadTestResultsTests(TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 90), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summary(self):
+        results = LoadTestResults()
+        results.add("reserve_asset", 200, 0.1, 2, 0.01)
+        results.add("reserve_asset", 409, 0.3, 4, 0.03)
+        results.add("submit_transcription", 500, 0.2, None, None)
+
+        reserve_asset, submit_transcription = results.get_summary()
+
+        self.assertEqual(reserve_asset["endpoint"], "reserve_asset")
+        self.assertEqual(reserve_asset["requests"], 2)
+        self.assertEqual(reserve_asset["error_rate"], 0)
+        self.assertEqual(reserve_asset["max"], 0.3)
+        self.assertEqual(reserve_asset["queries"], 3)
+
+        self.assertEqual(submit_transcription["error_rate"], 1)
+        self.assertIsNone(submit_transcription["queries"])
+
+
+@modify_settings(
+    MIDDLEWARE={"prepend": "concordia.middleware.QueryCountHeaderMiddleware"}
+)
+class QueryCountHeaderMiddlewareTests(TestCase):
+    def test_headers(self):
+        asset = create_asset()
+
+        response = self.client.get(asset.get_absolute_url())
+
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertGreater(float(response["X-Query-Duration"]), 0)
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+@modify_settings(
+    MIDDLEWARE={"prepend": "concordia.middleware.QueryCountHeaderMiddleware"}
+)
+class VolunteerWorkflowTests(LiveServerTestCase):
+    def run_volunteer(self, volunteer_class, username, duration=3):
+        results = LoadTestResults()
+
+        volunteer = volunteer_class(
+            self.live_server_url,
+            results,
+            deadline=default_timer() + duration,
+            think_time=0,
+            seed=0,
+            username=username,
+            password="benchmark",
+        )
+        volunteer.run()
+
+        summary = {i["endpoint"]: i for i in results.get_summary()}
+
+        for endpoint in summary.values():
+            self.assertEqual(endpoint["error_rate"], 0, endpoint)
+            self.assertIsNotNone(endpoint["queries"], endpoint)
+
+        return summary
+
+    def test_transcribe_and_review(self):
+        for username in ("transcriber", "reviewer"):
+            User.objects.create_user(username=username, password="benchmark")
+
+        item = create_item()
+        for i in range(3):
+            create_asset(item=item, slug=f"asset-{i}", sequence=i)
+
+        summary = self.run_volunteer(Transcriber, "transcriber")
+
+        self.assertEqual(summary["submit_transcription"]["requests"], 3)
+        self.assertFalse(
+            Asset.objects.exclude(
+                transcription_status=TranscriptionStatus.SUBMITTED
+            ).exists()
+        )
+
+        summary = self.run_volunteer(Reviewer, "reviewer")
+
+        self.assertEqual(summary["review_transcription"]["requests"], 3)
+        self.assertEqual(
+            Transcription.objects.filter(reviewed_by__username="reviewer").count(), 3
+        )
@@ -0,0 +1,95 @@
+"""
+Tests for the per-view metrics middleware
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+
+from concordia.models import SimplePage
+
+from .utils import create_asset
+
+
+def get_sample_value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class ViewMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_database_queries(self):
+        asset = create_asset()
+
+        queries_before = get_sample_value(
+            "django_view_db_queries_sum", view="asset_detail"
+        )
+        requests_before = get_sample_value(
+            "django_view_db_queries_count", view="asset_detail"
+        )
+        size_before = get_sample_value(
+            "django_view_response_size_bytes_sum", view="asset_detail"
+        )
+
+        response = self.client.get(asset.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            get_sample_value("django_view_db_queries_count", view="asset_detail"),
+            requests_before + 1,
+        )
+        self.assertGreater(
+            get_sample_value("django_view_db_queries_sum", view="asset_detail"),
+            queries_before,
+        )
+        self.assertEqual(
+            get_sample_value(
+                "django_view_response_size_bytes_sum", view="asset_detail"
+            ),
+            size_before + len(response.content),
+        )
+
+    def test_cache_lookups(self):
+        SimplePage.objects.create(title="About", path="/about/", body="# About")
+
+        hits_before = get_sample_value(
+            "django_view_cache_lookups_total", view="about", result="hit"
+        )
+        misses_before = get_sample_value(
+            "django_view_cache_lookups_total", view="about", result="miss"
+        )
+
+        for i in range(2):
+            self.assertEqual(self.client.get("/about/").status_code, 200)
+
+        self.assertEqual(
+            get_sample_value(
+                "django_view_cache_lookups_total", view="about", result="miss"
+            ),
+            misses_before + 1,
+        )
+        self.assertEqual(
+            get_sample_value(
+                "django_view_cache_lookups_total", view="about", result="hit"
+            ),
+            hits_before + 1,
+        )
+
+    def test_query_budget(self):
+        asset = create_asset()
+
+        with override_settings(QUERY_BUDGETS={"transcriptions:asset-detail": 1}):
+            with self.assertLogs("concordia.middleware", "WARNING") as logs:
+                self.client.get(asset.get_absolute_url())
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("transcriptions:asset-detail", logs.output[0])
+
+        with override_settings(QUERY_BUDGETS={"transcriptions:asset-detail": 1000}):
+            with mock.patch("concordia.middleware.logger") as logger:
+                self.client.get(asset.get_absolute_url())
+
+        logger.warning.assert_not_called()
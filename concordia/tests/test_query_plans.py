@@ -0,0 +1,343 @@
+"""
+Query plan regression tests
+
+These seed enough data for the Postgres planner to make realistic choices and
+then use EXPLAIN to confirm that the queries behind the volunteer workflow use
+indexes rather than scanning the large tables.
+"""
+
+import json
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+
+from concordia.authentication_backends import EmailOrUsernameModelBackend
+from concordia.models import (
+    Asset,
+    Campaign,
+    Item,
+    MediaType,
+    Project,
+    Transcription,
+    TranscriptionStatus,
+    User,
+    UserAssetActivity,
+)
+from concordia.views import (
+    filter_and_order_reviewable_assets,
+    filter_and_order_transcribable_assets,
+)
+
+from .utils import create_campaign, create_item, create_project
+
+#: Tables which are seeded with enough rows that a sequential scan is a problem
+LARGE_TABLES = {
+    "concordia_asset",
+    "concordia_transcription",
+    "concordia_userassetactivity",
+}
+
+
+def get_full_scans(plan, partial_indexes=()):
+    """
+    Return the names of the tables read in full by an EXPLAIN plan
+
+    This includes index scans which filter every row because they have no
+    index condition, which are as expensive as a sequential scan unless the
+    index is a partial index covering a small part of the table.
+    """
+
+    tables = []
+
+    node_type = plan.get("Node Type")
+    if node_type == "Seq Scan" or (
+        node_type in ("Index Scan", "Index Only Scan")
+        and "Filter" in plan
+        and "Index Cond" not in plan
+        and plan["Index Name"] not in partial_indexes
+    ):
+        tables.append(plan["Relation Name"])
+
+    for child in plan.get("Plans", []):
+        tables.extend(get_full_scans(child, partial_indexes))
+
+    return tables
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.transcriber = User.objects.create_user(
+            username="transcriber", email="transcriber@example.com"
+        )
+        cls.reviewer = User.objects.create_user(
+            username="reviewer", email="reviewer@example.com"
+        )
+
+        # Most assets in a real database have been completed so the open
+        # assets are a small fraction of the table:
+        statuses = [TranscriptionStatus.COMPLETED] * 16 + [
+            TranscriptionStatus.NOT_STARTED,
+            TranscriptionStatus.IN_PROGRESS,
+            TranscriptionStatus.SUBMITTED,
+            TranscriptionStatus.SUBMITTED,
+        ]
+
+        for c in range(5):
+            campaign = create_campaign(title=f"Campaign {c}")
+
+            for p in range(2):
+                project = create_project(campaign=campaign, title=f"Project {p}")
+
+                items = Item.objects.bulk_create(
+                    create_item(
+                        project=project,
+                        item_id=f"c{c}-p{p}-i{i}",
+                        title=f"Item {i}",
+                        do_save=False,
+                    )
+                    for i in range(20)
+                )
+
+                Asset.objects.bulk_create(
+                    Asset(
+                        item=item,
+                        title=f"Asset {s}",
+                        slug=f"asset-{s}",
+                        media_type=MediaType.IMAGE,
+                        media_url=f"{s}.jpg",
+                        published=True,
+                        sequence=s,
+                        transcription_status=statuses[s % len(statuses)],
+                    )
+                    for item in items
+                    for s in range(1, 51)
+                )
+
+        # The transcriptions are spread across many users as they would be in
+        # a real database, so searching for a user is selective:
+        transcribers = [
+            cls.transcriber,
+            *User.objects.bulk_create(
+                User(username=f"volunteer-{i}", email=f"volunteer-{i}@example.com")
+                for i in range(499)
+            ),
+        ]
+
+        transcriptions = []
+        for asset_id, status in Asset.objects.exclude(
+            transcription_status=TranscriptionStatus.NOT_STARTED
+        ).values_list("pk", "transcription_status"):
+            reviewed = status == TranscriptionStatus.COMPLETED
+            transcriptions.append(
+                Transcription(
+                    asset_id=asset_id,
+                    user=transcribers[asset_id % len(transcribers)],
+                    text=f"Transcription of asset {asset_id}",
+                    submitted=now()
+                    if status != TranscriptionStatus.IN_PROGRESS
+                    else None,
+                    accepted=now() if reviewed else None,
+                    reviewed_by=cls.reviewer if reviewed else None,
+                )
+            )
+        Transcription.objects.bulk_create(transcriptions)
+        Asset.objects.update_latest_transcriptions()
+        Asset.objects.update_search_documents()
+
+        UserAssetActivity.objects.bulk_create(
+            UserAssetActivity(user=user, asset_id=t.asset_id, **{field: now()})
+            for user, field in (
+                (cls.transcriber, "last_transcribed"),
+                (cls.reviewer, "last_reviewed"),
+            )
+            for t in transcriptions
+            if field == "last_transcribed" or t.reviewed_by_id
+        )
+
+        cls.campaign = Campaign.objects.get(slug="campaign-2")
+        cls.project = Project.objects.get(campaign=cls.campaign, slug="project-1")
+        cls.asset = Asset.objects.filter(item__project=cls.project).first()
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute(
+                "SELECT indexrelid::regclass::text FROM pg_index"
+                " WHERE indpred IS NOT NULL"
+            )
+            cls.partial_indexes = {i for i, in cursor.fetchall()}
+
+    def get_plan(self, sql, params=()):
+        with connection.cursor() as cursor:
+            # The captured queries have their parameters interpolated already:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params or None)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return plan[0]["Plan"]
+
+    def get_full_scans(self, sql, params=()):
+        return LARGE_TABLES.intersection(
+            get_full_scans(self.get_plan(sql, params), self.partial_indexes)
+        )
+
+    def assertQuerySetUsesIndexes(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        full_scans = self.get_full_scans(sql, params)
+        self.assertFalse(full_scans, f"Full scan of {full_scans} for {sql}")
+
+    def assertQueriesUseIndexes(self, captured_queries):
+        checked = 0
+
+        for query in captured_queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT") or not any(
+                table in sql for table in LARGE_TABLES
+            ):
+                continue
+
+            full_scans = self.get_full_scans(sql)
+            self.assertFalse(full_scans, f"Full scan of {full_scans} for {sql}")
+            checked += 1
+
+        self.assertGreater(checked, 0, "No queries of the large tables were run")
+
+    def get_campaign_assets(self):
+        return Asset.objects.select_for_update(skip_locked=True, of=("self",)).filter(
+            item__project__campaign=self.campaign,
+            item__project__published=True,
+            item__published=True,
+            published=True,
+        )
+
+    def test_filter_and_order_transcribable_assets(self):
+        asset_qs = filter_and_order_transcribable_assets(
+            self.get_campaign_assets(),
+            self.project.slug,
+            self.asset.item.item_id,
+            self.asset.pk,
+        )
+        self.assertQuerySetUsesIndexes(asset_qs[:1])
+
+    def test_filter_and_order_reviewable_assets(self):
+        asset_qs = filter_and_order_reviewable_assets(
+            self.get_campaign_assets(),
+            self.project.slug,
+            self.asset.item.item_id,
+            self.asset.pk,
+            self.reviewer.pk,
+        )
+        self.assertQuerySetUsesIndexes(asset_qs[:1])
+
+    def test_transcribe_list_view(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                reverse("transcribe-asset-list"),
+                {"campaign_filter": self.campaign.pk},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertQueriesUseIndexes(ctx.captured_queries)
+
+    def test_review_list_view(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                reverse("review-asset-list"),
+                {"campaign_filter": self.campaign.pk},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertQueriesUseIndexes(ctx.captured_queries)
+
+    def test_save_transcription(self):
+        asset = Asset.objects.filter(
+            item__project=self.project,
+            transcription_status=TranscriptionStatus.IN_PROGRESS,
+        ).first()
+
+        self.client.force_login(self.transcriber)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse("save-transcription", args=(asset.pk,)),
+                {"text": "Updated", "supersedes": asset.latest_transcription_id},
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertQueriesUseIndexes(ctx.captured_queries)
+
+    def test_account_profile_view(self):
+        self.client.force_login(self.transcriber)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("user-profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertQueriesUseIndexes(ctx.captured_queries)
+
+    def test_admin_asset_changelist(self):
+        admin_user = User.objects.create_superuser(
+            "admin", "admin@example.com", "admin"
+        )
+        self.client.force_login(admin_user)
+
+        changelist_url = reverse("admin:concordia_asset_changelist")
+        last_asset = Asset.objects.order_by("pk")[99]
+
+        for params in (
+            {},
+            {"after": last_asset.pk},
+            {"q": "c2-p1-i19"},
+            {"item__project__in": self.project.pk},
+        ):
+            with self.subTest(params=params):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(changelist_url, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertQueriesUseIndexes(ctx.captured_queries)
+
+    def test_admin_transcription_changelist(self):
+        admin_user = User.objects.create_superuser(
+            "admin", "admin@example.com", "admin"
+        )
+        self.client.force_login(admin_user)
+
+        changelist_url = reverse("admin:concordia_transcription_changelist")
+
+        for params in ({"q": "reviewer"}, {"q": str(self.asset.pk)}):
+            with self.subTest(params=params):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(changelist_url, params)
+                self.assertEqual(response.status_code, 200)
+
+                # The joined tables are small enough here for the planner to
+                # prefer reading them in full, so the sequential scan is
+                # disabled to confirm that the search can use the indexes:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                try:
+                    self.assertQueriesUseIndexes(ctx.captured_queries)
+                finally:
+                    with connection.cursor() as cursor:
+                        cursor.execute("RESET enable_seqscan")
+
+    def test_login_email_lookup(self):
+        users = EmailOrUsernameModelBackend().get_matching_users(
+            "Transcriber@Example.com"
+        )
+        sql, params = users.query.sql_with_params()
+
+        # auth_user is too small here for the planner to prefer an index so the
+        # sequential scan is disabled to confirm that the index can be used:
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        try:
+            plan = json.dumps(self.get_plan(sql, params))
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("RESET enable_seqscan")
+
+        self.assertIn("auth_user_email_lower_idx", plan)
+        self.assertEqual(list(users), [self.transcriber])
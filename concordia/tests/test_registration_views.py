@@ -4,8 +4,9 @@ Tests for user registration-related views
 import unittest
 from logging import getLogger
 from secrets import token_hex
+from unittest import mock
 
-from django.contrib.auth import get_user_model
+from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.core import mail
 from django.test import TestCase, override_settings
@@ -48,6 +49,26 @@ class ConcordiaViewTests(
 
         self.assertEqual(len(mail.outbox), 1)
 
+    def test_login_with_email_address(self):
+        user = self.create_user("tester")
+
+        for username in (user.username, user.email, user.email.upper()):
+            with self.subTest(username=username):
+                self.assertEqual(
+                    authenticate(username=username, password=user.password), user
+                )
+
+        self.assertIsNone(authenticate(username="TESTER", password=user.password))
+        self.assertIsNone(authenticate(username=user.email, password="wrong"))
+
+    def test_login_with_unknown_user_hashes_password(self):
+        with mock.patch.object(User, "set_password") as set_password:
+            self.assertIsNone(
+                authenticate(username="nobody@example.com", password="password")
+            )
+
+        set_password.assert_called_once_with("password")
+
     @unittest.skip
     def test_password_reset_will_activate_user(self):
         self.user = self.create_inactive_user("tester2")
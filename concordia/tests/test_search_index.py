@@ -0,0 +1,456 @@
+"""
+Tests for the queued search index updates
+"""
+
+import threading
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.db import connections as db_connections
+from django.db.transaction import atomic
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from django_elasticsearch_dsl.registries import registry
+from elasticsearch_dsl.connections import connections
+
+# Importing the documents registers them with django_elasticsearch_dsl:
+from concordia import documents  # NOQA: F401
+from concordia.models import (
+    Asset,
+    SearchIndexChange,
+    Tag,
+    Transcription,
+    UserAssetTagCollection,
+)
+from concordia.search_index import (
+    UPDATE_SCHEDULED_CACHE_KEY,
+    QueuedSignalProcessor,
+    activate_versioned_index,
+    create_versioned_index,
+    get_reindex_pk_ranges,
+    populate_versioned_index,
+    queue_search_index_changes,
+    update_search_index,
+    update_search_indices_changed_since,
+)
+from concordia.tasks import activate_search_index, update_search_indices
+
+from .utils import CreateTestUsers, create_asset, create_item
+
+
+class BulkRecorder(object):
+    """
+    Replacement for the Elasticsearch bulk helper which records the actions
+    instead of sending them to a server
+    """
+
+    def __init__(self):
+        self.actions = []
+
+    def __call__(self, client, actions, **kwargs):
+        actions = list(actions)
+        self.actions.extend(actions)
+        return len(actions), []
+
+    def get_ids(self, index, op_type="index"):
+        return {
+            i["_id"]
+            for i in self.actions
+            if i["_index"] == index and i["_op_type"] == op_type
+        }
+
+
+@patch("django_elasticsearch_dsl.documents.DocType._get_connection")
+class QueuedSignalProcessorTests(CreateTestUsers, TestCase):
+    def setUp(self):
+        cache.clear()
+
+        processor = QueuedSignalProcessor(connections)
+        self.addCleanup(processor.teardown)
+
+        self.bulk = BulkRecorder()
+        bulk_patcher = patch("django_elasticsearch_dsl.documents.bulk", self.bulk)
+        bulk_patcher.start()
+        self.addCleanup(bulk_patcher.stop)
+
+    def get_queued(self, model):
+        content_type = ContentType.objects.get_for_model(model)
+        return set(
+            SearchIndexChange.objects.filter(content_type=content_type).values_list(
+                "object_id", flat=True
+            )
+        )
+
+    def test_changes_are_deduplicated(self, get_connection):
+        asset = create_asset()
+        user = self.create_test_user("transcriber")
+
+        transcription = Transcription(asset=asset, user=user)
+        transcription.full_clean()
+        transcription.save()
+        transcription.text = "Updated"
+        transcription.save()
+
+        self.assertEqual(self.get_queued(Transcription), {transcription.pk})
+        self.assertEqual(self.get_queued(Asset), {asset.pk})
+
+        # Nothing should have been sent to Elasticsearch during the request:
+        self.assertEqual(self.bulk.actions, [])
+
+    def test_update_is_scheduled_after_commit(self, get_connection):
+        on_commit_callbacks = []
+
+        with patch(
+            "concordia.search_index.transaction.on_commit",
+            on_commit_callbacks.append,
+        ), patch("concordia.tasks.update_search_indices.apply_async") as apply_async:
+            asset = create_asset()
+            asset.title = "Updated"
+            asset.save()
+
+            # A transaction which is rolled back never runs its callbacks:
+            self.assertIsNone(cache.get(UPDATE_SCHEDULED_CACHE_KEY))
+
+            for callback in on_commit_callbacks:
+                callback()
+
+        self.assertTrue(cache.get(UPDATE_SCHEDULED_CACHE_KEY))
+        apply_async.assert_called_once_with(
+            countdown=settings.SEARCH_INDEX_UPDATE_DELAY
+        )
+
+    def test_update_search_indices(self, get_connection):
+        asset = create_asset()
+        deleted_asset = create_asset(item=asset.item, slug="deleted-asset")
+        deleted_asset_pk = deleted_asset.pk
+        deleted_asset.delete()
+
+        self.assertEqual(self.get_queued(Asset), {asset.pk, deleted_asset_pk})
+
+        self.assertEqual(update_search_indices(), 2)
+
+        self.assertFalse(SearchIndexChange.objects.exists())
+        self.assertIsNone(cache.get(UPDATE_SCHEDULED_CACHE_KEY))
+
+        self.assertEqual(self.bulk.get_ids("assets"), {asset.pk})
+        self.assertEqual(self.bulk.get_ids("assets", "delete"), {deleted_asset_pk})
+
+    def test_reindex_changed_since(self, get_connection):
+        asset = create_asset()
+        user = self.create_test_user("transcriber")
+
+        transcription = Transcription(asset=asset, user=user)
+        transcription.full_clean()
+        transcription.save()
+
+        indexed_count = update_search_indices_changed_since(transcription.updated_on)
+
+        self.assertEqual(self.bulk.get_ids("transcriptions"), {transcription.pk})
+        self.assertEqual(self.bulk.get_ids("assets"), {asset.pk})
+        self.assertEqual(self.bulk.get_ids("users"), {user.pk})
+        self.assertEqual(indexed_count, 3)
+
+    def test_unindexed_models_are_ignored(self, get_connection):
+        self.assertNotIn(ContentType, registry.get_models())
+
+        ContentType.objects.get_or_create(app_label="concordia", model="example")
+
+        self.assertFalse(SearchIndexChange.objects.exists())
+
+
+@patch("concordia.search_index.schedule_search_index_update")
+class SearchIndexQueueTransactionTests(TransactionTestCase):
+    def setUp(self):
+        self.asset = create_asset()
+        SearchIndexChange.objects.all().delete()
+
+    def is_queued(self):
+        return SearchIndexChange.objects.filter(
+            content_type=ContentType.objects.get_for_model(Asset),
+            object_id=self.asset.pk,
+        ).exists()
+
+    def run_in_thread(self, target):
+        def run():
+            try:
+                target()
+            finally:
+                db_connections.close_all()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def test_change_queued_while_indexing(self, schedule_update):
+        queue_search_index_changes([self.asset])
+
+        queued = threading.Event()
+        committed = threading.Event()
+        threads = []
+
+        def change_asset():
+            with atomic():
+                queue_search_index_changes([self.asset])
+                queued.set()
+                committed.wait(timeout=10)
+
+        def index_batch(model, pks):
+            # The batch has been claimed so the change has to wait for this
+            # transaction to commit and is then queued again:
+            threads.append(self.run_in_thread(change_asset))
+            self.assertFalse(queued.wait(timeout=0.5))
+
+        with patch("concordia.tasks.update_search_index", side_effect=index_batch):
+            self.assertEqual(update_search_indices(), 1)
+
+        self.assertTrue(queued.wait(timeout=10))
+        committed.set()
+        threads[0].join()
+
+        self.assertTrue(self.is_queued())
+
+    def test_uncommitted_changes_are_skipped(self, schedule_update):
+        processed_counts = []
+
+        with atomic():
+            queue_search_index_changes([self.asset])
+
+            with patch("concordia.tasks.update_search_index"):
+                self.run_in_thread(
+                    lambda: processed_counts.append(update_search_indices())
+                ).join()
+
+        self.assertEqual(processed_counts, [0])
+        self.assertTrue(self.is_queued())
+
+
+@patch("django_elasticsearch_dsl.documents.DocType._get_connection")
+class BulkPreparedDocumentTests(CreateTestUsers, TestCase):
+    def setUp(self):
+        self.bulk = BulkRecorder()
+        bulk_patcher = patch("django_elasticsearch_dsl.documents.bulk", self.bulk)
+        bulk_patcher.start()
+        self.addCleanup(bulk_patcher.stop)
+
+    def get_update_query_count(self, document, queryset):
+        with CaptureQueriesContext(connection) as queries:
+            document.update(queryset, refresh=False)
+        return len(queries)
+
+    def test_user_document_query_count(self, get_connection):
+        asset = create_asset()
+
+        for i in range(5):
+            user = self.create_test_user(f"user-{i}")
+            for j in range(i):
+                Transcription.objects.create(asset=asset, user=user)
+
+        document = documents.UserDocument()
+        users = User.objects.order_by("pk")
+
+        single_query_count = self.get_update_query_count(document, users[:1])
+        self.bulk.actions.clear()
+        self.assertEqual(
+            single_query_count, self.get_update_query_count(document, users)
+        )
+
+        self.assertEqual(
+            [i["_source"]["transcription_count"] for i in self.bulk.actions],
+            [0, 1, 2, 3, 4],
+        )
+
+    def test_asset_document_query_count(self, get_connection):
+        user = self.create_test_user("transcriber")
+        item = create_item()
+
+        for i in range(5):
+            asset = create_asset(item=item, slug=f"asset-{i}", sequence=i)
+            for j in range(i):
+                Transcription.objects.create(asset=asset, user=user, text=f"{j}")
+
+        document = documents.AssetDocument()
+        assets = document.get_queryset()
+
+        single_query_count = self.get_update_query_count(document, assets[:1])
+        self.bulk.actions.clear()
+        self.assertEqual(
+            single_query_count, self.get_update_query_count(document, assets)
+        )
+
+        sources = [i["_source"] for i in self.bulk.actions]
+        self.assertEqual([i["submission_count"] for i in sources], [0, 1, 2, 3, 4])
+        self.assertIsNone(sources[0]["latest_transcription"])
+
+        latest = Transcription.objects.order_by("pk").last()
+        self.assertEqual(
+            sources[-1]["latest_transcription"]["created_on"], latest.created_on
+        )
+
+    def test_tag_collection_document_query_count(self, get_connection):
+        item = create_item()
+        tags = [Tag.objects.create(value=f"tag-{i}") for i in range(5)]
+
+        for i in range(5):
+            asset = create_asset(item=item, slug=f"asset-{i}", sequence=i)
+            user = self.create_test_user(f"user-{i}")
+            collection = UserAssetTagCollection.objects.create(asset=asset, user=user)
+            collection.tags.set(tags[:i])
+
+        document = documents.TagCollectionDocument()
+        collections = document.get_queryset()
+
+        single_query_count = self.get_update_query_count(document, collections[:1])
+        self.bulk.actions.clear()
+        self.assertEqual(
+            single_query_count, self.get_update_query_count(document, collections)
+        )
+
+        sources = [i["_source"] for i in self.bulk.actions]
+        self.assertEqual([len(i["tags"]) for i in sources], [0, 1, 2, 3, 4])
+        self.assertEqual(sources[-1]["tags"][0], {"value": "tag-0"})
+        self.assertEqual(
+            sources[-1]["asset"]["item"]["project"]["campaign"]["slug"],
+            item.project.campaign.slug,
+        )
+
+
+@patch("django_elasticsearch_dsl.documents.DocType._get_connection")
+class VersionedIndexTests(TestCase):
+    def setUp(self):
+        self.bulk = BulkRecorder()
+        bulk_patcher = patch("django_elasticsearch_dsl.documents.bulk", self.bulk)
+        bulk_patcher.start()
+        self.addCleanup(bulk_patcher.stop)
+
+    def test_create_versioned_index(self, get_connection):
+        index_name = create_versioned_index(documents.AssetDocument, "20200101")
+
+        self.assertEqual(index_name, "assets-20200101")
+
+        create = get_connection.return_value.indices.create
+        create.assert_called_once()
+        self.assertEqual(create.call_args[1]["index"], index_name)
+
+        body = create.call_args[1]["body"]
+        self.assertEqual(body["settings"]["refresh_interval"], "-1")
+        self.assertIn("transcription_status", str(body["mappings"]))
+
+    def test_pk_ranges(self, get_connection):
+        item = create_item()
+        assets = [
+            create_asset(item=item, slug=f"asset-{i}", sequence=i) for i in range(5)
+        ]
+
+        pk_ranges = get_reindex_pk_ranges(documents.AssetDocument, 2)
+
+        self.assertEqual(len(pk_ranges), 3)
+        self.assertEqual(pk_ranges[0][0], assets[0].pk)
+        self.assertGreater(pk_ranges[-1][1], assets[-1].pk)
+
+        for start, end in pk_ranges:
+            populate_versioned_index(
+                documents.AssetDocument, "assets-20200101", start, end
+            )
+
+        self.assertEqual(self.bulk.get_ids("assets-20200101"), {i.pk for i in assets})
+        self.assertEqual(self.bulk.get_ids("assets"), set())
+
+    def test_record_deleted_while_loading_chunk(self, get_connection):
+        asset = create_asset()
+        deleted_asset = create_asset(item=asset.item, slug="deleted-asset")
+        deleted_asset_pk = deleted_asset.pk
+
+        def bulk(client, actions, **kwargs):
+            # The deletion is processed after the chunk was read but before it
+            # was written to the new index:
+            if deleted_asset.pk:
+                deleted_asset.delete()
+            return self.bulk(client, actions, **kwargs)
+
+        with patch("django_elasticsearch_dsl.documents.bulk", bulk):
+            populate_versioned_index(
+                documents.AssetDocument, "assets-20200101", asset.pk, asset.pk + 2
+            )
+
+        self.assertEqual(
+            self.bulk.get_ids("assets-20200101"), {asset.pk, deleted_asset_pk}
+        )
+        self.assertEqual(
+            self.bulk.get_ids("assets-20200101", "delete"), {deleted_asset_pk}
+        )
+
+    def test_deletions_reach_pending_index(self, get_connection):
+        get_connection.return_value.indices.get_alias.return_value = {
+            "assets-20190101": {"aliases": {"assets": {}}},
+            "assets-20200101": {"aliases": {}},
+        }
+
+        asset = create_asset()
+        deleted_asset = create_asset(item=asset.item, slug="deleted-asset")
+        deleted_asset_pk = deleted_asset.pk
+        deleted_asset.delete()
+
+        update_search_index(Asset, [asset.pk, deleted_asset_pk])
+
+        self.assertEqual(self.bulk.get_ids("assets"), {asset.pk})
+        self.assertEqual(self.bulk.get_ids("assets", "delete"), {deleted_asset_pk})
+        self.assertEqual(self.bulk.get_ids("assets-20200101"), set())
+        self.assertEqual(
+            self.bulk.get_ids("assets-20200101", "delete"), {deleted_asset_pk}
+        )
+        self.assertEqual(self.bulk.get_ids("assets-20190101", "delete"), set())
+
+    def test_activate_processes_queued_deletions(self, get_connection):
+        started = now()
+
+        asset = create_asset()
+        queue_search_index_changes([asset])
+        asset_pk = asset.pk
+        asset.delete()
+
+        activate_search_index("AssetDocument", "assets-20200101", started.isoformat())
+
+        self.assertFalse(SearchIndexChange.objects.exists())
+        self.assertEqual(self.bulk.get_ids("assets", "delete"), {asset_pk})
+
+    def test_pk_ranges_without_records(self, get_connection):
+        self.assertEqual(get_reindex_pk_ranges(documents.AssetDocument, 2), [])
+
+    def test_activate_replaces_existing_alias(self, get_connection):
+        indices = get_connection.return_value.indices
+        indices.exists_alias.return_value = True
+        indices.get_alias.return_value = {"assets-20190101": {"aliases": {}}}
+
+        activate_versioned_index(documents.AssetDocument, "assets-20200101")
+
+        indices.update_aliases.assert_called_once_with(
+            body={
+                "actions": [
+                    {"add": {"index": "assets-20200101", "alias": "assets"}},
+                    {"remove": {"index": "assets-20190101", "alias": "assets"}},
+                ]
+            }
+        )
+        indices.delete.assert_called_once_with(index="assets-20190101", ignore=404)
+
+    def test_activate_replaces_concrete_index(self, get_connection):
+        indices = get_connection.return_value.indices
+        indices.exists_alias.return_value = False
+        indices.exists.return_value = True
+
+        activate_versioned_index(documents.AssetDocument, "assets-20200101")
+
+        indices.update_aliases.assert_called_once_with(
+            body={
+                "actions": [
+                    {"add": {"index": "assets-20200101", "alias": "assets"}},
+                    {"remove_index": {"index": "assets"}},
+                ]
+            }
+        )
+        indices.delete.assert_not_called()
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.template import Context, Template
 from django.test import TestCase
@@ -51,3 +52,26 @@ class TestSimpleContentBlockTags(TestCase):
         rendered = template.render(context)
 
         self.assertEqual(rendered.strip(), "")
+
+    def test_block_caching(self):
+        cache.clear()
+
+        block = SimpleContentBlock.objects.create(slug="cached-block", body="First")
+        template = Template(
+            """
+            {% load concordia_simple_content_blocks %}
+            {% simple_content_block "cached-block" %}
+            """
+        )
+
+        with self.assertNumQueries(1):
+            self.assertIn("First", template.render(Context()))
+
+        with self.assertNumQueries(0):
+            self.assertIn("First", template.render(Context()))
+
+        # Saving the block must invalidate the cached body:
+        block.body = "Second"
+        block.save()
+
+        self.assertIn("Second", template.render(Context()))
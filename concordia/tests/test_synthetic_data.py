@@ -0,0 +1,114 @@
+"""
+Tests for the synthetic benchmarking dataset
+"""
+
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+from django.db.transaction import atomic, set_rollback
+from django.test import TestCase
+
+from concordia.models import (
+    Asset,
+    AssetSearchDocument,
+    AssetTag,
+    ItemContributor,
+    Transcription,
+    TranscriptionStatus,
+    UserAssetActivity,
+    UserAssetTagCollection,
+)
+from concordia.synthetic_data import SyntheticDataGenerator
+
+
+class SyntheticDataTests(TestCase):
+    def get_generator(self, seed=0):
+        return SyntheticDataGenerator(
+            seed,
+            users=10,
+            topics=2,
+            tags=10,
+            campaigns=2,
+            projects_per_campaign=2,
+            items_per_project=3,
+            assets_per_item=10,
+        )
+
+    def get_dataset(self):
+        return (
+            list(
+                Asset.objects.order_by("pk").values_list(
+                    "slug", "published", "transcription_status"
+                )
+            ),
+            list(
+                Transcription.objects.order_by("pk").values_list(
+                    "user__username", "text", "created_on", "accepted", "rejected"
+                )
+            ),
+        )
+
+    def test_generate(self):
+        counts = self.get_generator().generate()
+
+        self.assertEqual(counts["assets"], 120)
+        self.assertEqual(Asset.objects.count(), 120)
+        self.assertEqual(Transcription.objects.count(), counts["transcriptions"])
+
+        for asset in Asset.objects.select_related("latest_transcription"):
+            latest = asset.latest_transcription
+
+            if asset.transcription_status == TranscriptionStatus.NOT_STARTED:
+                self.assertIsNone(latest)
+                continue
+
+            self.assertEqual(
+                latest, Transcription.objects.filter(asset=asset).latest("pk")
+            )
+            self.assertEqual(latest.status, asset.get_transcription_status_display())
+            self.assertFalse(latest.superseded_by.exists())
+            self.assertNotEqual(latest.user_id, latest.reviewed_by_id)
+
+            if latest.supersedes:
+                self.assertIsNotNone(latest.supersedes.rejected)
+
+        self.assertEqual(
+            AssetSearchDocument.objects.count(),
+            Asset.objects.filter(latest_transcription__isnull=False).count(),
+        )
+        self.assertEqual(
+            AssetTag.objects.aggregate(Sum("user_count"))["user_count__sum"],
+            UserAssetTagCollection.tags.through.objects.count(),
+        )
+        self.assertEqual(
+            UserAssetActivity.objects.filter(last_transcribed__isnull=False).count(),
+            Transcription.objects.values("user", "asset").distinct().count(),
+        )
+        published_transcriptions = Transcription.objects.filter(asset__published=True)
+        self.assertEqual(
+            ItemContributor.objects.count(),
+            published_transcriptions.values("user", "asset__item").distinct().count()
+            + published_transcriptions.exclude(reviewed_by=None)
+            .values("reviewed_by", "asset__item")
+            .distinct()
+            .count(),
+        )
+
+    def test_seed_is_repeatable(self):
+        datasets = []
+
+        for i in range(2):
+            with atomic():
+                self.get_generator(seed=1).generate()
+                datasets.append(self.get_dataset())
+                set_rollback(True)
+
+        self.assertEqual(datasets[0], datasets[1])
+
+        self.get_generator(seed=2).generate()
+        self.assertNotEqual(datasets[0], self.get_dataset())
+
+    def test_command_refuses_existing_seed(self):
+        call_command("generate_synthetic_data", campaigns=1, users=2, verbosity=0)
+
+        with self.assertRaises(CommandError):
+            call_command("generate_synthetic_data", campaigns=1, users=2, verbosity=0)
@@ -0,0 +1,101 @@
+"""
+Tests for the Celery task instrumentation
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from concordia.celery import app
+from concordia.models import TaskStatistics, User
+from concordia.task_metrics import get_queue_wait, record_http_request
+
+
+@app.task
+def instrumented_test_task(fail=False):
+    User.objects.count()
+    record_http_request(1024)
+
+    if fail:
+        raise ValueError("Failed as requested")
+
+
+class TaskMetricsTests(TestCase):
+    task_name = "concordia.tests.test_task_metrics.instrumented_test_task"
+
+    def test_task_statistics(self):
+        runs_before = (
+            REGISTRY.get_sample_value(
+                "celery_task_runtime_seconds_count",
+                {"task": self.task_name, "state": "SUCCESS"},
+            )
+            or 0
+        )
+
+        instrumented_test_task.apply()
+        instrumented_test_task.apply()
+        instrumented_test_task.apply(kwargs={"fail": True})
+
+        stats = TaskStatistics.objects.get(task_name=self.task_name)
+        self.assertEqual(stats.runs, 3)
+        self.assertEqual(stats.failures, 1)
+        self.assertEqual(stats.retries, 0)
+        self.assertGreater(stats.runtime, 0)
+        self.assertGreaterEqual(stats.runtime, stats.max_runtime)
+        self.assertGreaterEqual(stats.db_queries, 3)
+        self.assertEqual(stats.http_requests, 3)
+        self.assertEqual(stats.http_bytes, 3 * 1024)
+
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "celery_task_runtime_seconds_count",
+                {"task": self.task_name, "state": "SUCCESS"},
+            ),
+            runs_before + 2,
+        )
+
+    def test_queue_wait(self):
+        request = SimpleNamespace(published_at=100.0, eta=None)
+        self.assertEqual(get_queue_wait(request, 102.5), 2.5)
+
+        # Tasks scheduled for later are measured from their ETA:
+        eta = datetime.fromtimestamp(200, tz=timezone.utc)
+        request = SimpleNamespace(published_at=100.0, eta=eta.isoformat())
+        self.assertEqual(get_queue_wait(request, 203), 3)
+
+        request = SimpleNamespace(eta=None)
+        self.assertIsNone(get_queue_wait(request, 100))
+
+    def test_task_health_view(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_login(user)
+
+        TaskStatistics.objects.create(
+            task_name="concordia.tasks.site_report",
+            period_start=datetime.now(timezone.utc) - timedelta(hours=1),
+            runs=4,
+            failures=1,
+            runtime=100,
+            max_runtime=40,
+        )
+        TaskStatistics.objects.create(
+            task_name="concordia.tasks.site_report",
+            period_start=datetime.now(timezone.utc) - timedelta(days=3),
+            runs=1,
+            runtime=25,
+        )
+
+        response = self.client.get(reverse("admin:task-health"))
+        self.assertEqual(response.status_code, 200)
+
+        (task,) = response.context["tasks"]
+        self.assertEqual(task["total_runs"], 4)
+        self.assertEqual(task["average_runtime"], 25)
+        self.assertEqual(task["failure_rate"], 0.25)
+
+        response = self.client.get(reverse("admin:task-health"), {"hours": 24 * 7})
+        (task,) = response.context["tasks"]
+        self.assertEqual(task["total_runs"], 5)
@@ -2,6 +2,7 @@
 Tests for for the top-level & “CMS” views
 """
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -130,3 +131,30 @@ class TopLevelViewTests(
         self.assertHTMLEqual(
             resp.context["body"], f"<p>This is <em>not</em> the real page</p>"
         )
+
+    def test_simple_page_caching(self):
+        cache.clear()
+
+        s = SimplePage.objects.create(
+            title="Help Center", body="Original body", path=reverse("help-center")
+        )
+
+        resp = self.client.get(reverse("help-center"))
+        self.assertEqual(resp.context["body"], "<p>Original body</p>")
+
+        # Bulk updates do not send signals so the cached version should be used:
+        SimplePage.objects.filter(pk=s.pk).update(body="Updated body")
+        resp = self.client.get(reverse("help-center"))
+        self.assertEqual(resp.context["body"], "<p>Original body</p>")
+
+        # Saving the page will invalidate the cache:
+        s.refresh_from_db()
+        s.save()
+        resp = self.client.get(reverse("help-center"))
+        self.assertEqual(resp.context["body"], "<p>Updated body</p>")
+
+        # Moving the page must remove it from the old path:
+        s.path = reverse("welcome-guide")
+        s.save()
+        self.assertEqual(404, self.client.get(reverse("help-center")).status_code)
+        self.assertEqual(200, self.client.get(reverse("welcome-guide")).status_code)
@@ -2,26 +2,67 @@
 Tests for the core application features
 """
 
+import threading
 from datetime import datetime, timedelta
+from unittest import mock
 
 from captcha.models import CaptchaStore
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.transaction import atomic
 from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 
+from concordia.captcha_pool import (
+    POOL_COUNTER_CACHE_KEY,
+    get_captcha_claim_cache_key,
+    get_captcha_key,
+    get_pool_slot_cache_key,
+)
 from concordia.models import (
     Asset,
+    AssetTag,
     AssetTranscriptionReservation,
+    BulkAction,
+    BulkActionJob,
+    CampaignContributor,
+    Item,
+    ItemContributor,
+    Project,
+    ProjectContributor,
+    SiteReport,
+    Tag,
     Transcription,
     TranscriptionStatus,
+    UserAssetActivity,
+    UserAssetTagCollection,
+    UserCampaignActivity,
 )
+from concordia.signals.signals import reservations_released
 from concordia.tasks import (
+    backfill_latest_transcriptions,
+    campaign_report,
+    delete_items,
     delete_old_tombstoned_reservations,
     expire_inactive_asset_reservations,
+    fill_captcha_pool,
+    publish_items,
+    reconcile_contributor_tallies,
+    remove_expired_captchas,
+    reopen_assets,
     tombstone_old_active_asset_reservations,
 )
-from concordia.utils import get_anonymous_user, get_or_create_reservation_token
+from concordia.utils import (
+    clear_tag_id_cache,
+    get_anonymous_user,
+    get_anonymous_user_id,
+    get_or_create_reservation_token,
+)
+from concordia.views import save_user_tags
+from importer.models import ImportItem, ImportItemAsset, ImportJob
 
 from .utils import (
     CreateTestUsers,
@@ -268,6 +309,131 @@ class ConcordiaViewTests(CreateTestUsers, JSONAssertMixin, TestCase):
         self.assertEqual(20, response.context["submitted_percent"])
         self.assertEqual(10, response.context["completed_percent"])
 
+    def test_contributor_counts(self):
+        """
+        Confirm that transcribers and reviewers are counted once for each
+        campaign, project and item and that the tallies can be rebuilt
+        """
+
+        transcriber = self.create_test_user("transcriber")
+        reviewer = self.create_test_user("reviewer")
+
+        asset = create_asset()
+        other_item = create_item(project=asset.item.project, item_id="other-item")
+        other_asset = create_asset(item=other_item)
+
+        t = Transcription(asset=asset, user=transcriber, submitted=now())
+        t.full_clean()
+        t.save()
+        t.accepted = now()
+        t.reviewed_by = reviewer
+        t.full_clean()
+        t.save()
+
+        t = Transcription(asset=other_asset, user=transcriber)
+        t.full_clean()
+        t.save()
+
+        def get_contributor_counts():
+            return [
+                self.client.get(obj.get_absolute_url()).context["contributor_count"]
+                for obj in (
+                    asset.item,
+                    other_item,
+                    asset.item.project,
+                    asset.item.project.campaign,
+                )
+            ]
+
+        self.assertEqual(get_contributor_counts(), [2, 1, 2, 2])
+
+        ItemContributor.objects.all().delete()
+        self.assertEqual(get_contributor_counts(), [0, 0, 2, 2])
+
+        reconcile_contributor_tallies()
+        self.assertEqual(get_contributor_counts(), [2, 1, 2, 2])
+
+    def test_contributor_counts_exclude_unpublished_content(self):
+        asset = create_asset()
+        project = asset.item.project
+        hidden_asset = create_asset(
+            item=asset.item, slug="hidden-asset", published=False
+        )
+        other_item = create_item(project=project, item_id="other-item")
+        other_asset = create_asset(item=other_item)
+
+        for i, a in enumerate((asset, hidden_asset, other_asset)):
+            t = Transcription(asset=a, user=self.create_test_user(f"user-{i}"))
+            t.full_clean()
+            t.save()
+
+        def get_contributor_counts():
+            return [
+                self.client.get(obj.get_absolute_url()).context["contributor_count"]
+                for obj in (project, project.campaign)
+            ]
+
+        self.assertEqual(get_contributor_counts(), [2, 2])
+
+        other_item.published = False
+        other_item.save()
+        self.assertEqual(get_contributor_counts(), [1, 1])
+
+        reconcile_contributor_tallies()
+        self.assertEqual(get_contributor_counts(), [1, 1])
+
+        other_item.published = True
+        other_item.save()
+        project.published = False
+        project.save()
+        self.assertEqual(
+            self.client.get(project.campaign.get_absolute_url()).context[
+                "contributor_count"
+            ],
+            0,
+        )
+
+    def test_asset_publication_changes_contributor_counts(self):
+        admin = self.create_test_user("admin", is_staff=True, is_superuser=True)
+
+        asset = create_asset()
+        other_asset = create_asset(item=asset.item, slug="other-asset", sequence=2)
+        item = asset.item
+        campaign = item.project.campaign
+
+        for i, a in enumerate((asset, other_asset)):
+            t = Transcription(asset=a, user=self.create_test_user(f"user-{i}"))
+            t.full_clean()
+            t.save()
+
+        def get_contributor_counts():
+            return [
+                self.client.get(obj.get_absolute_url()).context["contributor_count"]
+                for obj in (item, item.project, campaign)
+            ]
+
+        self.assertEqual(get_contributor_counts(), [2, 2, 2])
+
+        self.client.login(username=admin.username, password=admin.password)
+        with mock.patch(
+            "concordia.admin.actions.reconcile_contributor_tallies.delay"
+        ) as delay:
+            self.client.post(
+                reverse("admin:concordia_asset_changelist"),
+                {"action": "unpublish_action", "_selected_action": [asset.pk]},
+            )
+        self.client.logout()
+
+        delay.assert_called_once_with([campaign.pk])
+        reconcile_contributor_tallies(*delay.call_args[0])
+        self.assertEqual(get_contributor_counts(), [1, 1, 1])
+
+        job = BulkActionJob.objects.create(
+            action=BulkAction.PUBLISH_ITEMS, description="Publish items: 1 items"
+        )
+        publish_items(job.pk, [item.pk], True)
+        self.assertEqual(get_contributor_counts(), [2, 2, 2])
+
     def test_asset_unicode_slug(self):
         """Confirm that Unicode characters are usable in Asset URLs"""
 
@@ -307,6 +473,88 @@ class ConcordiaViewTests(CreateTestUsers, JSONAssertMixin, TestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    def test_asset_detail_view_query_count(self):
+        """
+        Confirm that the number of queries used to render an asset page does
+        not depend on the number of tag collections and that only the tags for
+        this asset are displayed
+        """
+
+        asset = create_asset()
+        create_asset(item=asset.item, slug="test-asset-2", sequence=2)
+
+        # This asset has the same slug in a different item and its tags must
+        # not be displayed:
+        other_asset = create_asset(
+            item=create_item(project=asset.item.project, item_id="other-item")
+        )
+        other_tags = UserAssetTagCollection.objects.create(
+            asset=other_asset, user=self.create_test_user("other-tagger")
+        )
+        other_tags.tags.add(Tag.objects.create(value="unrelated"))
+
+        url = asset.get_absolute_url()
+
+        def add_tag_collection(username, *values):
+            collection = UserAssetTagCollection.objects.create(
+                asset=asset, user=self.create_test_user(username)
+            )
+            for value in values:
+                tag, _ = Tag.objects.get_or_create(value=value)
+                collection.tags.add(tag)
+
+        add_tag_collection("tagger-0", "foo")
+
+        # Prime the per-item navigation cache:
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as initial_queries:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["tags"], ["foo"])
+
+        for i in range(1, 6):
+            add_tag_collection(f"tagger-{i}", "foo", f"bar-{i}")
+
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as final_queries:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.context["tags"], ["bar-1", "bar-2", "bar-3", "bar-4", "bar-5", "foo"]
+        )
+        self.assertIn("next_asset_url", resp.context)
+        self.assertNotIn("previous_asset_url", resp.context)
+
+        self.assertEqual(len(initial_queries), len(final_queries))
+
+    def test_asset_detail_view_navigation(self):
+        """
+        Confirm that the previous and next links skip unpublished assets and
+        are updated when an asset's publication status changes
+        """
+
+        asset = create_asset(sequence=2)
+        first_asset = create_asset(item=asset.item, slug="test-asset-1", sequence=1)
+        last_asset = create_asset(
+            item=asset.item, slug="test-asset-3", sequence=3, published=False
+        )
+
+        resp = self.client.get(asset.get_absolute_url())
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.context["previous_asset_url"], first_asset.get_absolute_url()
+        )
+        self.assertNotIn("next_asset_url", resp.context)
+
+        last_asset.published = True
+        last_asset.save()
+
+        resp = self.client.get(asset.get_absolute_url())
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["next_asset_url"], last_asset.get_absolute_url())
+
     def test_project_detail_view(self):
         """
         Test GET on route /campaigns/<slug-value> (campaign)
@@ -362,6 +610,313 @@ class ConcordiaViewTests(CreateTestUsers, JSONAssertMixin, TestCase):
         self.assertEqual(ctx["title"], item.project.campaign.title)
         self.assertEqual(ctx["total_asset_count"], 10)
 
+    def test_latest_transcription(self):
+        user = self.create_test_user("transcriber")
+        asset = create_asset()
+
+        first = Transcription.objects.create(asset=asset, user=user, text="First")
+        second = Transcription.objects.create(
+            asset=asset, user=user, text="Second", supersedes=first
+        )
+
+        asset.refresh_from_db()
+        self.assertEqual(asset.latest_transcription, second)
+
+        # Saving an older transcription must not replace the latest one:
+        first.text = "Edited"
+        first.save()
+        asset.refresh_from_db()
+        self.assertEqual(asset.latest_transcription, second)
+
+        second.delete()
+        asset.refresh_from_db()
+        self.assertEqual(asset.latest_transcription, first)
+
+        Asset.objects.filter(pk=asset.pk).update(latest_transcription=None)
+        self.assertEqual(backfill_latest_transcriptions(batch_size=1), 1)
+        asset.refresh_from_db()
+        self.assertEqual(asset.latest_transcription, first)
+
+        first.delete()
+        asset.refresh_from_db()
+        self.assertIsNone(asset.latest_transcription)
+
+    def test_reopen_assets(self):
+        transcriber = self.create_test_user("transcriber")
+        reviewer = self.create_test_user("reviewer")
+        admin = self.create_test_user("admin", is_staff=True, is_superuser=True)
+
+        item = create_item()
+        assets = [
+            create_asset(item=item, slug=f"asset-{i}", sequence=i) for i in range(3)
+        ]
+
+        for asset in assets:
+            t = Transcription(
+                asset=asset, user=transcriber, text=f"{asset.slug}", submitted=now()
+            )
+            t.full_clean()
+            t.save()
+
+            if asset is not assets[2]:
+                t.accepted = now()
+                t.reviewed_by = reviewer
+                t.full_clean()
+                t.save()
+
+        self.client.login(username=admin.username, password=admin.password)
+        changelist_url = reverse("admin:concordia_asset_changelist")
+        data = {
+            "action": "reopen_asset_action",
+            "_selected_action": [i.pk for i in assets],
+        }
+
+        with mock.patch("concordia.admin.actions.reopen_assets.delay") as delay:
+            with mock.patch("concordia.admin.actions.REOPEN_ASSETS_TASK_THRESHOLD", 1):
+                self.client.post(changelist_url, data)
+
+        delay.assert_called_once()
+        asset_pks, user_pk = delay.call_args[0]
+        self.assertEqual(sorted(asset_pks), [assets[0].pk, assets[1].pk])
+        self.assertEqual(user_pk, admin.pk)
+
+        self.client.post(changelist_url, data)
+
+        statuses = dict(Asset.objects.values_list("slug", "transcription_status"))
+        self.assertEqual(
+            statuses,
+            {
+                "asset-0": TranscriptionStatus.IN_PROGRESS,
+                "asset-1": TranscriptionStatus.IN_PROGRESS,
+                "asset-2": TranscriptionStatus.SUBMITTED,
+            },
+        )
+
+        for asset in assets[:2]:
+            asset.refresh_from_db()
+            latest_transcription = asset.latest_transcription
+            self.assertEqual(latest_transcription.text, asset.slug)
+            self.assertEqual(latest_transcription.user, admin)
+            self.assertEqual(latest_transcription.reviewed_by, admin)
+            self.assertIsNotNone(latest_transcription.rejected)
+            self.assertEqual(
+                latest_transcription.supersedes.accepted.date(), now().date()
+            )
+            # Two transcriptions by two transcribers and two reviewers:
+            self.assertEqual(asset.difficulty, 2 * (2 + 2))
+
+        self.assertEqual(
+            UserAssetActivity.objects.filter(user=admin).count(),
+            2,
+        )
+        self.assertEqual(UserCampaignActivity.objects.get(user=admin).action_count, 2)
+        self.assertTrue(ItemContributor.objects.filter(user=admin, item=item).exists())
+
+        # Reopened assets are no longer completed so they are not reopened again:
+        self.assertEqual(reopen_assets([i.pk for i in assets], admin.pk), 0)
+
+    def test_publish_items(self):
+        admin = self.create_test_user("admin", is_staff=True, is_superuser=True)
+
+        item = create_item(published=False)
+        for i in range(3):
+            create_asset(item=item, slug=f"asset-{i}", sequence=i, published=False)
+
+        job = BulkActionJob.objects.create(
+            action=BulkAction.PUBLISH_ITEMS, description="Publish items: 1 items"
+        )
+        publish_items(job.pk, [item.pk], True, batch_size=2)
+
+        item.refresh_from_db()
+        self.assertTrue(item.published)
+        self.assertFalse(Asset.objects.filter(published=False).exists())
+
+        job.refresh_from_db()
+        self.assertEqual((job.processed, job.total), (3, 3))
+        self.assertIsNotNone(job.completed)
+        self.assertIsNone(job.failed)
+
+        self.client.login(username=admin.username, password=admin.password)
+        changelist_url = reverse("admin:concordia_item_changelist")
+        data = {"action": "unpublish_item_action", "_selected_action": [item.pk]}
+
+        with mock.patch("concordia.admin.actions.publish_items.delay") as delay:
+            with mock.patch("concordia.admin.actions.PUBLISH_ITEMS_TASK_THRESHOLD", 1):
+                self.client.post(changelist_url, data)
+
+        job = BulkActionJob.objects.get(action=BulkAction.UNPUBLISH_ITEMS)
+        delay.assert_called_once_with(job.pk, [item.pk], False)
+        self.assertIsNone(job.last_started)
+
+        response = self.client.get(
+            reverse("admin:concordia_bulkactionjob_change", args=(job.pk,))
+        )
+        self.assertContains(response, "0 of 0 (0%)")
+        response = self.client.get(reverse("admin:concordia_bulkactionjob_changelist"))
+        self.assertContains(response, "Unpublish items: 1 items")
+
+        self.client.post(changelist_url, data)
+
+        item.refresh_from_db()
+        self.assertFalse(item.published)
+        self.assertFalse(Asset.objects.filter(published=True).exists())
+
+    def test_delete_items(self):
+        admin = self.create_test_user("admin", is_staff=True, is_superuser=True)
+        user = self.create_test_user("transcriber")
+
+        item = create_item()
+        other_item = create_item(item_id="other-item", project=item.project)
+        other_asset = create_asset(item=other_item, slug="other-asset")
+        other_user = self.create_test_user("other-transcriber")
+        Transcription.objects.create(asset=other_asset, user=other_user)
+
+        import_job = ImportJob.objects.create(project=item.project)
+        import_item = ImportItem.objects.create(job=import_job, item=item, url="")
+        tag = Tag.objects.create(value="letter")
+
+        for i in range(3):
+            asset = create_asset(item=item, slug=f"asset-{i}", sequence=i)
+            transcription = Transcription.objects.create(asset=asset, user=user)
+            Transcription.objects.create(
+                asset=asset, user=user, supersedes=transcription
+            )
+            UserAssetTagCollection.objects.create(asset=asset, user=user).tags.add(tag)
+            AssetTranscriptionReservation.objects.create(
+                asset=asset, reservation_token="token"
+            )
+            ImportItemAsset.objects.create(
+                import_item=import_item, asset=asset, url="", sequence_number=i
+            )
+
+        job = BulkActionJob.objects.create(
+            action=BulkAction.DELETE_ITEMS, description="Delete items: 1 items"
+        )
+
+        campaign = item.project.campaign
+        self.assertEqual(
+            CampaignContributor.objects.filter(campaign=campaign).count(), 2
+        )
+
+        with mock.patch("concordia.tasks.ASSET_STORAGE") as storage:
+            delete_items(job.pk, [item.pk], batch_size=2)
+
+        # The foreign keys are not checked until the transaction is committed:
+        connection.check_constraints()
+
+        self.assertFalse(Item.objects.filter(pk=item.pk).exists())
+        self.assertEqual(list(Asset.objects.all()), [other_asset])
+        self.assertEqual(
+            list(Transcription.objects.values_list("user", flat=True)), [other_user.pk]
+        )
+        self.assertEqual(
+            list(
+                CampaignContributor.objects.filter(campaign=campaign).values_list(
+                    "user", flat=True
+                )
+            ),
+            [other_user.pk],
+        )
+        self.assertEqual(
+            list(ProjectContributor.objects.values_list("user", flat=True)),
+            [other_user.pk],
+        )
+        self.assertEqual(
+            list(UserAssetActivity.objects.values_list("user", flat=True)),
+            [other_user.pk],
+        )
+        self.assertFalse(UserAssetTagCollection.objects.exists())
+        self.assertFalse(ImportItem.objects.exists())
+        self.assertTrue(Tag.objects.filter(pk=tag.pk).exists())
+
+        prefix = f"{item.project.campaign.slug}/{item.project.slug}/{item.item_id}"
+        self.assertEqual(
+            [i.args for i in storage.delete.call_args_list],
+            [(f"{prefix}/1.jpg",)] * 3,
+        )
+
+        job.refresh_from_db()
+        self.assertEqual((job.processed, job.total), (3, 3))
+        self.assertIsNotNone(job.completed)
+
+        self.client.login(username=admin.username, password=admin.password)
+        changelist_url = reverse("admin:concordia_project_changelist")
+        data = {
+            "action": "delete_selected",
+            "_selected_action": [item.project.pk],
+        }
+
+        response = self.client.post(changelist_url, data)
+        self.assertEqual(
+            dict(response.context["model_count"]),
+            {"projects": 1, "items": 1, "assets": 1},
+        )
+
+        with mock.patch("concordia.admin.actions.delete_projects.delay") as delay:
+            with mock.patch("concordia.admin.actions.DELETE_TASK_THRESHOLD", 0):
+                self.client.post(changelist_url, {**data, "post": "yes"})
+
+        job = BulkActionJob.objects.get(action=BulkAction.DELETE_PROJECTS)
+        delay.assert_called_once_with(job.pk, [item.project.pk])
+
+        with mock.patch("concordia.tasks.ASSET_STORAGE"):
+            self.client.post(changelist_url, {**data, "post": "yes"})
+
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(Asset.objects.exists())
+
+    def test_transcription_search(self):
+        user = self.create_test_user("transcriber")
+        asset = create_asset()
+        other_asset = create_asset(item=asset.item, slug="other-asset", sequence=2)
+
+        transcription = Transcription.objects.create(
+            asset=asset, user=user, text="Dear <Mother>, the harvest was late"
+        )
+        Transcription.objects.create(
+            asset=other_asset, user=user, text="The harvest was late"
+        )
+        # Only the latest transcription for each asset is searched:
+        Transcription.objects.create(
+            asset=other_asset, user=user, text="Nothing to see"
+        )
+
+        response = self.client.get(reverse("transcription-search"), {"q": "harvests"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "transcriptions/transcription_search.html")
+        self.assertEqual(list(response.context["assets"]), [asset])
+        self.assertContains(response, "<mark>harvest</mark>")
+        self.assertNotContains(response, "<Mother>")
+
+        data = self.assertValidJSON(
+            self.client.get(
+                reverse("transcription-search"),
+                {
+                    "q": "harvest",
+                    "format": "json",
+                    "transcription_status": TranscriptionStatus.IN_PROGRESS,
+                },
+            )
+        )
+        self.assertEqual([i["id"] for i in data["objects"]], [asset.pk])
+
+        data = self.assertValidJSON(
+            self.client.get(
+                reverse("transcription-search"),
+                {
+                    "q": "harvest",
+                    "format": "json",
+                    "transcription_status": TranscriptionStatus.SUBMITTED,
+                },
+            )
+        )
+        self.assertEqual(data["objects"], [])
+
+        transcription.delete()
+
+        response = self.client.get(reverse("transcription-search"), {"q": "harvest"})
+        self.assertEqual(list(response.context["assets"]), [])
+
     @override_settings(FLAGS={"ACTIVITY_UI_ENABLED": [("boolean", True)]})
     def test_activity_ui_anonymous(self):
         response = self.client.get(reverse("action-app"))
@@ -379,6 +934,11 @@ class ConcordiaViewTests(CreateTestUsers, JSONAssertMixin, TestCase):
     RATELIMIT_ENABLE=False, SESSION_ENGINE="django.contrib.sessions.backends.cache"
 )
 class TransactionalViewTests(CreateTestUsers, JSONAssertMixin, TransactionTestCase):
+    def setUp(self):
+        # Tags created by earlier tests were removed without sending
+        # post_delete so their cached primary keys are no longer valid:
+        clear_tag_id_cache()
+
     def completeCaptcha(self, key=None):
         """Submit a CAPTCHA response using the provided challenge key"""
 
@@ -408,6 +968,23 @@ class TransactionalViewTests(CreateTestUsers, JSONAssertMixin, TransactionTestCa
         self.login_user()
         self._asset_reservation_test_payload(self.user.pk)
 
+    def test_anonymous_user_cache(self):
+        anon = get_anonymous_user()
+        self.assertFalse(anon.has_usable_password())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_anonymous_user(), anon)
+            self.assertEqual(get_anonymous_user_id(), anon.pk)
+
+        # Each caller receives its own copy of the cached user:
+        self.assertIsNot(get_anonymous_user(), get_anonymous_user())
+
+        anon.delete()
+
+        new_anon = get_anonymous_user()
+        self.assertNotEqual(new_anon.pk, anon.pk)
+        self.assertEqual(get_anonymous_user_id(), new_anon.pk)
+
     def test_asset_reservation_anonymously(self):
         """
         Test the basic Asset reservation process as an anonymous user
@@ -651,6 +1228,47 @@ class TransactionalViewTests(CreateTestUsers, JSONAssertMixin, TransactionTestCa
         self.assertEqual(reservation.reservation_token, data["reservation_token"])
         self.assertEqual(reservation.tombstoned, False)
 
+    def test_expire_inactive_asset_reservations_in_bulk(self):
+        item = create_item()
+        assets = [
+            create_asset(item=item, slug=f"asset-{i}", sequence=i) for i in range(3)
+        ]
+
+        for i, asset in enumerate(assets):
+            AssetTranscriptionReservation.objects.create(
+                asset=asset, reservation_token=f"token-{i}"
+            )
+
+        old_timestamp = datetime.now() - timedelta(minutes=15)
+        AssetTranscriptionReservation.objects.exclude(asset=assets[2]).update(
+            updated_on=old_timestamp
+        )
+
+        released = []
+
+        def receiver(sender, reservations, **kwargs):
+            released.append(reservations)
+
+        reservations_released.connect(receiver)
+        self.addCleanup(reservations_released.disconnect, receiver)
+
+        with self.assertNumQueries(1):
+            expire_inactive_asset_reservations()
+
+        self.assertEqual(len(released), 1)
+        self.assertEqual(
+            sorted(released[0], key=lambda i: i["asset_pk"]),
+            [
+                {"asset_pk": assets[0].pk, "reservation_token": "token-0"},
+                {"asset_pk": assets[1].pk, "reservation_token": "token-1"},
+            ],
+        )
+        self.assertQuerysetEqual(
+            AssetTranscriptionReservation.objects.all(),
+            ["token-2"],
+            transform=lambda i: i.reservation_token,
+        )
+
     def test_anonymous_transcription_save_captcha(self):
         asset = create_asset()
 
@@ -668,6 +1286,95 @@ class TransactionalViewTests(CreateTestUsers, JSONAssertMixin, TransactionTestCa
         )
         data = self.assertValidJSON(resp, expected_status=201)
 
+    def test_captcha_test_mode(self):
+        key = self.assertValidJSON(
+            self.client.get(reverse("ajax-captcha")), expected_status=401
+        )["key"]
+        data = {"key": key, "response": "passed"}
+
+        self.assertValidJSON(
+            self.client.post(reverse("ajax-captcha"), data=data), expected_status=401
+        )
+
+        with self.settings(CAPTCHA_TEST_MODE=True):
+            self.assertValidJSON(self.client.post(reverse("ajax-captcha"), data=data))
+
+        self.assertFalse(CaptchaStore.objects.filter(hashkey=key).exists())
+
+    @override_settings(CAPTCHA_POOL_SIZE=2)
+    def test_captcha_pool(self):
+        cache.clear()
+
+        self.assertEqual(fill_captcha_pool(), 2)
+        self.assertEqual(fill_captcha_pool(), 0)
+        pooled_keys = set(CaptchaStore.objects.values_list("hashkey", flat=True))
+
+        served_keys = set()
+        for i in range(2):
+            data = self.assertValidJSON(
+                self.client.get(reverse("ajax-captcha")), expected_status=401
+            )
+            served_keys.add(data["key"])
+
+            # The image was rendered when the pool was filled:
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(data["image"])
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp["Content-Type"], "image/png")
+            self.assertEqual(len(ctx.captured_queries), 0)
+
+        self.assertEqual(served_keys, pooled_keys)
+
+        # Once the pool is empty challenges are generated on demand and the
+        # pool is refilled in the background:
+        with mock.patch("concordia.tasks.fill_captcha_pool.delay") as delay:
+            data = self.assertValidJSON(
+                self.client.get(reverse("ajax-captcha")), expected_status=401
+            )
+        self.assertNotIn(data["key"], pooled_keys)
+        delay.assert_called_once_with()
+        self.assertEqual(self.client.get(data["image"]).status_code, 200)
+
+        self.completeCaptcha(data["key"])
+
+    @override_settings(CAPTCHA_POOL_SIZE=2)
+    def test_captcha_pool_contention(self):
+        cache.clear()
+
+        fill_captcha_pool()
+        pooled_keys = [cache.get(get_pool_slot_cache_key(i)) for i in range(2)]
+
+        # Another request read the next slot's key and claimed it first:
+        cache.add(get_captcha_claim_cache_key(pooled_keys[1]), True)
+        self.assertNotIn(get_captcha_key(), pooled_keys)
+
+        def evict_counter(key, delta=1):
+            cache.delete(key)
+            raise ValueError
+
+        # An evicted counter is restored instead of using the first slot:
+        with mock.patch.object(cache, "incr", side_effect=evict_counter):
+            self.assertNotIn(get_captcha_key(), pooled_keys)
+        self.assertEqual(cache.get(POOL_COUNTER_CACHE_KEY), 0)
+        self.assertEqual(cache.get(get_pool_slot_cache_key(0)), pooled_keys[0])
+
+    def test_expired_captchas(self):
+        key = CaptchaStore.generate_key()
+        CaptchaStore.objects.filter(hashkey=key).update(
+            expiration=now() - timedelta(minutes=1)
+        )
+        response = CaptchaStore.objects.get(hashkey=key).response
+
+        self.assertValidJSON(
+            self.client.post(
+                reverse("ajax-captcha"), data={"key": key, "response": response}
+            ),
+            expected_status=401,
+        )
+
+        remove_expired_captchas()
+        self.assertFalse(CaptchaStore.objects.filter(hashkey=key).exists())
+
     def test_transcription_save(self):
         asset = create_asset()
 
@@ -1038,6 +1745,142 @@ class TransactionalViewTests(CreateTestUsers, JSONAssertMixin, TransactionTestCa
         self.assertEqual(["bar", "foo", "quux"], data["user_tags"])
         self.assertEqual(["baaz", "bar", "foo", "quux"], data["all_tags"])
 
+    def test_tag_submission_changes(self):
+        asset = create_asset()
+        self.login_user()
+        submit_url = reverse("submit-tags", kwargs={"asset_pk": asset.pk})
+
+        data = self.assertValidJSON(
+            self.client.post(submit_url, data={"tags": ["foo", "bar"]})
+        )
+        self.assertEqual(["bar", "foo"], data["user_tags"])
+
+        data = self.assertValidJSON(
+            self.client.post(submit_url, data={"tags": ["bar", "baaz"]})
+        )
+        self.assertEqual(["baaz", "bar"], data["user_tags"])
+        self.assertEqual(
+            ["baaz", "bar"],
+            sorted(
+                UserAssetTagCollection.objects.get(
+                    asset=asset, user=self.user
+                ).tags.values_list("value", flat=True)
+            ),
+        )
+
+        # The values of recently used tags are cached so only the all_tags
+        # query needs to read the tag table:
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.assertValidJSON(
+                self.client.post(submit_url, data={"tags": ["baaz"]})
+            )
+        self.assertEqual(["baaz"], data["user_tags"])
+        self.assertEqual(
+            1, sum('"concordia_tag"' in i["sql"] for i in ctx.captured_queries)
+        )
+
+        data = self.assertValidJSON(
+            self.client.post(submit_url, data={"tags": ["baaz", "not valid!"]}),
+            expected_status=400,
+        )
+        self.assertIn("error", data)
+        self.assertFalse(Tag.objects.filter(value="not valid!").exists())
+
+        # Deleting a tag removes it from the cache:
+        Tag.objects.filter(value="baaz").delete()
+        data = self.assertValidJSON(
+            self.client.post(submit_url, data={"tags": ["baaz"]})
+        )
+        self.assertEqual(["baaz"], data["user_tags"])
+        self.assertEqual(["baaz"], data["all_tags"])
+
+        # Tags deleted by another process are looked up again:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM concordia_userassettagcollection_tags; "
+                "DELETE FROM concordia_assettag; "
+                "DELETE FROM concordia_tag"
+            )
+        data = self.assertValidJSON(
+            self.client.post(submit_url, data={"tags": ["baaz"]})
+        )
+        self.assertEqual(["baaz"], data["user_tags"])
+        self.assertTrue(Tag.objects.filter(value="baaz").exists())
+
+    def test_asset_tag_summary(self):
+        asset = create_asset()
+        submit_url = reverse("submit-tags", kwargs={"asset_pk": asset.pk})
+
+        self.login_user()
+        self.client.post(submit_url, data={"tags": ["foo", "bar"]})
+
+        second_user = self.create_test_user(username="second_tester")
+        self.client.login(username=second_user.username, password=second_user.password)
+        data = self.assertValidJSON(
+            self.client.post(submit_url, data={"tags": ["foo", "quux"]})
+        )
+        self.assertEqual(["bar", "foo", "quux"], data["all_tags"])
+
+        def get_summary():
+            return dict(
+                AssetTag.objects.filter(asset=asset).values_list(
+                    "tag__value", "user_count"
+                )
+            )
+
+        self.assertEqual({"bar": 1, "foo": 2, "quux": 1}, get_summary())
+
+        data = self.assertValidJSON(
+            self.client.post(submit_url, data={"tags": ["quux"]})
+        )
+        self.assertEqual(["bar", "foo", "quux"], data["all_tags"])
+        self.assertEqual({"bar": 1, "foo": 1, "quux": 1}, get_summary())
+
+        resp = self.client.get(asset.get_absolute_url())
+        self.assertEqual(["bar", "foo", "quux"], resp.context["tags"])
+
+        campaign_report(asset.item.project.campaign)
+        site_report = SiteReport.objects.get(campaign=asset.item.project.campaign)
+        self.assertEqual(site_report.distinct_tags, 3)
+        self.assertEqual(site_report.tag_uses, 3)
+
+        # Changes made outside of submit_tags are also summarized:
+        UserAssetTagCollection.objects.get(asset=asset, user=self.user).delete()
+        self.assertEqual({"quux": 1}, get_summary())
+
+        user_tags = UserAssetTagCollection.objects.get(asset=asset, user=second_user)
+        user_tags.tags.add(Tag.objects.get(value="foo"))
+        self.assertEqual({"foo": 1, "quux": 1}, get_summary())
+
+        Tag.objects.get(value="quux").userassettagcollection_set.clear()
+        self.assertEqual({"foo": 1}, get_summary())
+
+    def test_concurrent_tag_summary_updates(self):
+        asset = create_asset()
+        tag = Tag.objects.create(value="foo")
+        first_user = self.create_test_user(username="first_tester")
+        second_user = self.create_test_user(username="second_tester")
+
+        def save_second_user_tags():
+            try:
+                save_user_tags(asset, second_user, {tag.pk})
+            finally:
+                connections.close_all()
+
+        # The second save has to wait for the first to commit before it
+        # summarizes the asset's tags so it includes both users:
+        with atomic():
+            save_user_tags(asset, first_user, {tag.pk})
+
+            thread = threading.Thread(target=save_second_user_tags)
+            thread.start()
+            thread.join(timeout=1)
+            self.assertTrue(thread.is_alive())
+
+        thread.join()
+
+        self.assertEqual(AssetTag.objects.get(asset=asset, tag=tag).user_count, 2)
+
     def test_find_next_transcribable_no_campaign(self):
         asset1 = create_asset(slug="test-asset-1")
         asset2 = create_asset(item=asset1.item, slug="test-asset-2")
@@ -121,7 +121,7 @@ def create_item(
         title=title,
         item_id=item_id,
         item_url=item_url,
-        published=True,
+        published=published,
         **kwargs,
     )
     item.full_clean()
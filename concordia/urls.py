@@ -166,6 +166,9 @@ urlpatterns = [
         "transcribe/", views.TranscribeListView.as_view(), name="transcribe-asset-list"
     ),
     path("review/", views.ReviewListView.as_view(), name="review-asset-list"),
+    path(
+        "search/", views.TranscriptionSearchView.as_view(), name="transcription-search"
+    ),
     path("account/ajax-status/", views.ajax_session_status, name="ajax-session-status"),
     path("account/ajax-messages/", views.ajax_messages, name="ajax-messages"),
     path(
@@ -194,6 +197,9 @@ urlpatterns = [
         RedirectView.as_view(pattern_name="password_change"),
     ),
     path("captcha/ajax/", views.ajax_captcha, name="ajax-captcha"),
+    # This replaces the image view from captcha.urls, which uses the same URL
+    # name, so pre-rendered images from the captcha pool can be served:
+    path("captcha/image/<slug:key>/", views.captcha_image, name="captcha-image"),
     path("captcha/", include("captcha.urls")),
     path("admin/", admin.site.urls),
     # Internal support assists:
@@ -1,21 +1,73 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from copy import copy
+from hashlib import sha256
 from secrets import token_hex
+from threading import Lock
 
+import markdown
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
 
+from .models import Asset, SimpleContentBlock, SimplePage, Tag
 from .templatetags.concordia_media_tags import asset_media_url
 
+#: The username of the user which anonymous contributions are recorded as
+ANONYMOUS_USERNAME = "anonymous"
+
+#: The anonymous User, cached for the life of the process by
+#: get_anonymous_user() once it is known to have been committed
+_anonymous_user = None
+
 
 def get_anonymous_user():
     """
     Get the user called "anonymous" if it exist. Create the user if it doesn't
     exist This is the default concordia user if someone is working on the site
     without logging in first.
+
+    The user is cached by each process after the first lookup. Concurrent
+    first requests can safely race to create it because usernames are unique.
     """
 
-    try:
-        return User.objects.get(username="anonymous")
-    except User.DoesNotExist:
-        return User.objects.create_user(username="anonymous")
+    if _anonymous_user is None:
+        user, created = User.objects.get_or_create(
+            username=ANONYMOUS_USERNAME,
+            defaults={"password": make_password(None)},
+        )
+
+        def cache_anonymous_user():
+            global _anonymous_user
+            _anonymous_user = user
+
+        # The user may be created in a transaction which is later rolled back
+        # so it is only cached after the current transaction commits:
+        transaction.on_commit(cache_anonymous_user)
+
+        return user
+
+    # Callers may modify the instance so each one receives its own copy:
+    return copy(_anonymous_user)
+
+
+def get_anonymous_user_id():
+    """
+    Return the primary key of the anonymous user, which is cached by each
+    process so queries can filter on it without a lookup
+    """
+
+    if _anonymous_user is not None:
+        return _anonymous_user.pk
+
+    return get_anonymous_user().pk
+
+
+def clear_anonymous_user_cache():
+    global _anonymous_user
+    _anonymous_user = None
 
 
 def request_accepts_json(request):
@@ -45,3 +97,228 @@ def get_image_urls_from_asset(asset):
         thumbnail_url = image_url
 
     return image_url, thumbnail_url
+
+
+def get_simple_page_cache_key(path):
+    # Paths are admin-entered and may contain characters which memcached does
+    # not allow in keys so we'll use a digest instead:
+    return "simple-page:%s" % sha256(path.encode("utf-8")).hexdigest()
+
+
+def get_cached_simple_page(path):
+    """
+    Return a dictionary with the title, rendered HTML body and timestamps for
+    the SimplePage at the provided path, or None if no such page exists
+
+    The Markdown conversion is cached until the page is saved or deleted (see
+    the signal handlers) so normal page views don't touch the database.
+    """
+
+    cache_key = get_simple_page_cache_key(path)
+
+    page_data = cache.get(cache_key)
+    if page_data is not None:
+        return page_data
+
+    try:
+        page = SimplePage.objects.get(path=path)
+    except SimplePage.DoesNotExist:
+        return None
+
+    md = markdown.Markdown(extensions=["meta"])
+
+    page_data = {
+        "title": page.title,
+        "body": md.convert(page.body),
+        "created_on": page.created_on,
+        "updated_on": page.updated_on,
+    }
+
+    cache.set(cache_key, page_data, settings.SIMPLE_CONTENT_CACHE_TTL)
+
+    return page_data
+
+
+def get_simple_content_block_cache_key(slug):
+    return "simple-content-block:%s" % slug
+
+
+def get_simple_content_blocks(slugs):
+    """
+    Return a dictionary of slug: body for the requested SimpleContentBlocks
+
+    Cache misses are loaded in a single query and missing blocks are cached as
+    empty strings so templates referring to optional blocks stay cheap.
+    """
+
+    cache_keys = {get_simple_content_block_cache_key(slug): slug for slug in slugs}
+
+    cached = cache.get_many(cache_keys.keys())
+    blocks = {cache_keys[k]: v for k, v in cached.items()}
+
+    missing_slugs = set(cache_keys.values()).difference(blocks)
+    if missing_slugs:
+        loaded = dict(
+            SimpleContentBlock.objects.filter(slug__in=missing_slugs).values_list(
+                "slug", "body"
+            )
+        )
+
+        for slug in missing_slugs:
+            blocks[slug] = loaded.get(slug, "")
+
+        cache.set_many(
+            {get_simple_content_block_cache_key(i): blocks[i] for i in missing_slugs},
+            settings.SIMPLE_CONTENT_CACHE_TTL,
+        )
+
+    return blocks
+
+
+class ItemAssetNavigation(object):
+    """
+    Compact index of the published assets in an item: a sorted list of
+    sequence numbers with a parallel list of slugs
+
+    Iterating yields (sequence, slug) tuples for the page selector and the
+    neighbouring assets are found with a binary search.
+    """
+
+    __slots__ = ("sequences", "slugs")
+
+    def __init__(self, sequences, slugs):
+        self.sequences = sequences
+        self.slugs = slugs
+
+    def __iter__(self):
+        return zip(self.sequences, self.slugs)
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def previous(self, sequence):
+        """Return the (sequence, slug) tuple before the provided sequence"""
+
+        idx = bisect_left(self.sequences, sequence)
+        if idx > 0:
+            return self.sequences[idx - 1], self.slugs[idx - 1]
+        return None
+
+    def next(self, sequence):  # NOQA: A003
+        """Return the (sequence, slug) tuple after the provided sequence"""
+
+        idx = bisect_right(self.sequences, sequence)
+        if idx < len(self.sequences):
+            return self.sequences[idx], self.slugs[idx]
+        return None
+
+
+def get_item_asset_navigation_cache_key(item_pk):
+    return "item-asset-navigation:%d" % item_pk
+
+
+def get_item_asset_navigation_indexes(item_pks):
+    """
+    Return a dictionary of item pk: ItemAssetNavigation for the provided items
+
+    The indexes are cached until one of the item's assets is saved, published,
+    unpublished or re-imported (see clear_item_asset_navigation). Cache misses
+    for any number of items are loaded with a single query.
+    """
+
+    cache_keys = {get_item_asset_navigation_cache_key(pk): pk for pk in item_pks}
+
+    cached = cache.get_many(cache_keys.keys())
+    indexes = {cache_keys[k]: ItemAssetNavigation(*v) for k, v in cached.items()}
+
+    missing_pks = set(cache_keys.values()).difference(indexes)
+    if missing_pks:
+        loaded = {pk: ([], []) for pk in missing_pks}
+
+        asset_qs = (
+            Asset.objects.published()
+            .filter(item__in=missing_pks)
+            .order_by("item", "sequence")
+            .values_list("item_id", "sequence", "slug")
+        )
+        for item_pk, sequence, slug in asset_qs.iterator():
+            sequences, slugs = loaded[item_pk]
+            sequences.append(sequence)
+            slugs.append(slug)
+
+        cache.set_many(
+            {get_item_asset_navigation_cache_key(k): v for k, v in loaded.items()},
+            settings.ASSET_NAVIGATION_CACHE_TTL,
+        )
+
+        for item_pk, (sequences, slugs) in loaded.items():
+            indexes[item_pk] = ItemAssetNavigation(sequences, slugs)
+
+    return indexes
+
+
+def get_item_asset_navigation(item_pk):
+    return get_item_asset_navigation_indexes([item_pk])[item_pk]
+
+
+def clear_item_asset_navigation(item_pks):
+    cache.delete_many([get_item_asset_navigation_cache_key(i) for i in item_pks])
+
+
+#: The number of tag values whose primary keys each process remembers
+TAG_ID_CACHE_SIZE = 10000
+
+#: Tag primary keys keyed by value, in least to most recently used order
+_tag_id_cache = OrderedDict()
+_tag_id_cache_lock = Lock()
+
+
+def get_tag_ids(values):
+    """
+    Return a dictionary mapping each of the provided tag values to the primary
+    key of its Tag, creating tags which do not exist yet
+
+    Tags are never renamed so the primary keys of recently used values are
+    kept in a per-process LRU cache, which means popular tags are usually
+    resolved without a query. New values are validated before they are
+    created and a ValidationError is raised if any of them are invalid.
+    """
+
+    tag_ids = {}
+
+    with _tag_id_cache_lock:
+        for value in values:
+            if value in _tag_id_cache:
+                _tag_id_cache.move_to_end(value)
+                tag_ids[value] = _tag_id_cache[value]
+
+    missing = set(values).difference(tag_ids)
+
+    if missing:
+        tag_ids.update(Tag.objects.filter(value__in=missing).values_list("value", "pk"))
+        missing.difference_update(tag_ids)
+
+    if missing:
+        new_tags = [Tag(value=i) for i in sorted(missing)]
+        for tag in new_tags:
+            tag.clean_fields()
+
+        # Another request may create the same tags concurrently so conflicts
+        # are ignored and the primary keys are loaded afterwards:
+        Tag.objects.bulk_create(new_tags, ignore_conflicts=True)
+        tag_ids.update(Tag.objects.filter(value__in=missing).values_list("value", "pk"))
+
+    with _tag_id_cache_lock:
+        for value, pk in tag_ids.items():
+            _tag_id_cache[value] = pk
+            _tag_id_cache.move_to_end(value)
+
+        while len(_tag_id_cache) > TAG_ID_CACHE_SIZE:
+            _tag_id_cache.popitem(last=False)
+
+    return tag_ids
+
+
+def clear_tag_id_cache():
+    with _tag_id_cache_lock:
+        _tag_id_cache.clear()
@@ -8,7 +8,7 @@ from smtplib import SMTPException
 from time import time
 from urllib.parse import urlencode
 
-import markdown
+from captcha import views as captcha_views
 from captcha.fields import CaptchaField
 from captcha.helpers import captcha_image_url
 from captcha.models import CaptchaStore
@@ -22,18 +22,35 @@ from django.contrib.auth.views import (
     PasswordResetView,
 )
 from django.contrib.messages import get_messages
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.mail import EmailMultiAlternatives, send_mail
 from django.core.paginator import Paginator
-from django.db import connection
-from django.db.models import Case, Count, IntegerField, Max, OuterRef, Q, Subquery, When
+from django.db import IntegrityError, connection
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    Func,
+    IntegerField,
+    Q,
+    Subquery,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
 from django.db.transaction import atomic
 from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template import loader
 from django.urls import reverse, reverse_lazy
 from django.utils.decorators import method_decorator
+from django.utils.html import escape
 from django.utils.http import http_date
+from django.utils.safestring import mark_safe
 from django.utils.timezone import now
 from django.views.decorators.cache import cache_control, never_cache
 from django.views.decorators.csrf import csrf_exempt
@@ -47,6 +64,7 @@ from ratelimit.mixins import RatelimitMixin
 from ratelimit.utils import is_ratelimited
 
 from concordia.api_views import APIDetailView, APIListView
+from concordia.captcha_pool import get_captcha_image_cache_key, get_captcha_key
 from concordia.forms import (
     ActivateAndSetPasswordForm,
     AllowInactivePasswordResetForm,
@@ -56,25 +74,35 @@ from concordia.forms import (
     UserRegistrationForm,
 )
 from concordia.models import (
+    TRANSCRIPTION_SEARCH_CONFIG,
     Asset,
+    AssetTag,
     AssetTranscriptionReservation,
     Campaign,
     CarouselSlide,
     Item,
+    ItemContributor,
     Project,
-    SimplePage,
+    ProjectContributor,
     Tag,
     Topic,
     Transcription,
     TranscriptionStatus,
+    UserAssetActivity,
     UserAssetTagCollection,
+    UserCampaignActivity,
 )
 from concordia.signals.signals import reservation_obtained, reservation_released
 from concordia.templatetags.concordia_media_tags import asset_media_url
 from concordia.utils import (
+    clear_tag_id_cache,
     get_anonymous_user,
+    get_cached_simple_page,
     get_image_urls_from_asset,
+    get_item_asset_navigation,
+    get_item_asset_navigation_indexes,
     get_or_create_reservation_token,
+    get_tag_ids,
     request_accepts_json,
 )
 from concordia.version import get_concordia_version
@@ -137,10 +165,9 @@ def simple_page(request, path=None):
     if not path:
         path = request.path
 
-    page = get_object_or_404(SimplePage, path=path)
-
-    md = markdown.Markdown(extensions=["meta"])
-    html = md.convert(page.body)
+    page = get_cached_simple_page(path)
+    if page is None:
+        raise Http404
 
     breadcrumbs = []
     path_components = request.path.strip("/").split("/")
@@ -148,13 +175,13 @@ def simple_page(request, path=None):
         breadcrumbs.append(
             ("/%s/" % "/".join(path_components[0:i]), segment.replace("-", " ").title())
         )
-    breadcrumbs.append((request.path, page.title))
+    breadcrumbs.append((request.path, page["title"]))
 
-    ctx = {"body": html, "title": page.title, "breadcrumbs": breadcrumbs}
+    ctx = {"body": page["body"], "title": page["title"], "breadcrumbs": breadcrumbs}
 
     resp = render(request, "static-page.html", ctx)
-    resp["Created"] = http_date(page.created_on.timestamp())
-    resp["Last-Modified"] = http_date(page.updated_on.timestamp())
+    resp["Created"] = http_date(page["created_on"].timestamp())
+    resp["Last-Modified"] = http_date(page["updated_on"].timestamp())
     return resp
 
 
@@ -302,7 +329,7 @@ class AccountProfileView(LoginRequiredMixin, FormView, ListView):
     # instances with annotations
 
     allow_empty = True
-    ordering = ("-created_on",)
+    ordering = ("-last_interaction_time", "-pk")
     paginate_by = 12
 
     def post(self, *args, **kwargs):
@@ -310,55 +337,45 @@ class AccountProfileView(LoginRequiredMixin, FormView, ListView):
         return super().post(*args, **kwargs)
 
     def get_queryset(self):
-        transcriptions = Transcription.objects.filter(
-            Q(user=self.request.user) | Q(reviewed_by=self.request.user)
-        ).distinct("asset")
-
-        assets = Asset.objects.filter(transcription__in=transcriptions)
-        assets = assets.select_related(
-            "item", "item__project", "item__project__campaign"
+        # The activity summary is maintained by the Transcription signal
+        # handlers so we don't need to aggregate the user's transcriptions:
+        activity_qs = UserAssetActivity.objects.filter(user=self.request.user)
+        activity_qs = activity_qs.select_related(
+            "asset__item", "asset__item__project", "asset__item__project__campaign"
         )
-        assets = assets.annotate(
-            last_transcribed=Max(
-                "transcription__created_on",
-                filter=Q(transcription__user=self.request.user),
-            ),
-            last_reviewed=Max(
-                "transcription__updated_on",
-                filter=Q(transcription__reviewed_by=self.request.user),
-            ),
+        activity_qs = activity_qs.annotate(
+            last_interaction_time=Coalesce("last_reviewed", "last_transcribed")
         )
-        return assets
+        return activity_qs.order_by(*self.get_ordering())
 
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
         obj_list = ctx.pop("object_list")
         ctx["object_list"] = object_list = []
 
-        for asset in obj_list:
-            if asset.last_reviewed:
-                asset.last_interaction_time = asset.last_reviewed
+        for activity in obj_list:
+            asset = activity.asset
+            asset.last_interaction_time = activity.last_interaction_time
+
+            if activity.last_reviewed:
                 asset.last_interaction_type = "reviewed"
             else:
-                asset.last_interaction_time = asset.last_transcribed
                 asset.last_interaction_type = "transcribed"
 
             object_list.append(
                 (asset.item.project.campaign, asset.item.project, asset.item, asset)
             )
 
-        user = self.request.user
-        ctx["contributed_campaigns"] = (
-            Campaign.objects.annotate(
-                action_count=Count(
-                    "project__item__asset__transcription",
-                    filter=Q(project__item__asset__transcription__user=user)
-                    | Q(project__item__asset__transcription__reviewed_by=user),
-                )
-            )
-            .exclude(action_count=0)
-            .order_by("title")
+        ctx["contributed_campaigns"] = contributed_campaigns = []
+
+        campaign_activity_qs = UserCampaignActivity.objects.filter(
+            user=self.request.user, action_count__gt=0
         )
+        campaign_activity_qs = campaign_activity_qs.select_related("campaign")
+        for campaign_activity in campaign_activity_qs.order_by("campaign__title"):
+            campaign = campaign_activity.campaign
+            campaign.action_count = campaign_activity.action_count
+            contributed_campaigns.append(campaign)
 
         return ctx
 
@@ -452,18 +469,41 @@ class CampaignListView(APIListView):
         return data
 
 
-def calculate_asset_stats(asset_qs, ctx):
-    asset_count = asset_qs.count()
+def count_contributors(tally_qs, item_qs, hidden):
+    """
+    Return the number of users who contributed to the visible items in item_qs
+
+    tally_qs is the maintained contributor tally for the whole scope, which is
+    used unless the filter `hidden` matches some of the items because they or
+    their project are unpublished. In that case the distinct users are counted
+    from the item tallies of the visible items so contributions to hidden
+    content are not included, as when the count was taken from the
+    transcriptions of the published assets.
+    """
+
+    if not item_qs.filter(hidden).exists():
+        return tally_qs.count()
 
-    trans_qs = Transcription.objects.filter(asset__in=asset_qs).values_list(
-        "user_id", "reviewed_by"
+    return (
+        ItemContributor.objects.filter(item__in=item_qs.exclude(hidden))
+        .values("user")
+        .distinct()
+        .count()
     )
-    user_ids = set()
-    for i, j in trans_qs.iterator():
-        user_ids.add(i)
-        user_ids.add(j)
 
-    ctx["contributor_count"] = len(user_ids)
+
+def calculate_asset_stats(asset_qs, ctx, *, contributor_count):
+    """
+    Add the transcription status counts for the provided assets to ctx
+
+    contributor_count should come from the maintained contributor tallies
+    (see count_contributors) rather than being computed from the
+    transcriptions on every request.
+    """
+
+    asset_count = asset_qs.count()
+
+    ctx["contributor_count"] = contributor_count
 
     asset_state_qs = asset_qs.values_list("transcription_status")
     asset_state_qs = asset_state_qs.annotate(Count("transcription_status")).order_by()
@@ -619,7 +659,20 @@ class TopicDetailView(APIDetailView):
             published=True,
         )
 
-        calculate_asset_stats(topic_assets, ctx)
+        topic_contributors = ProjectContributor.objects.filter(
+            project__topics=self.object, project__published=True
+        )
+        calculate_asset_stats(
+            topic_assets,
+            ctx,
+            contributor_count=count_contributors(
+                topic_contributors.values("user").distinct(),
+                Item.objects.filter(
+                    project__topics=self.object, project__published=True
+                ),
+                Q(published=False),
+            ),
+        )
 
         return ctx
 
@@ -679,7 +732,15 @@ class CampaignDetailView(APIDetailView):
             published=True,
         )
 
-        calculate_asset_stats(campaign_assets, ctx)
+        calculate_asset_stats(
+            campaign_assets,
+            ctx,
+            contributor_count=count_contributors(
+                self.object.campaigncontributor_set.all(),
+                Item.objects.filter(project__campaign=self.object),
+                Q(published=False) | Q(project__published=False),
+            ),
+        )
 
         return ctx
 
@@ -740,7 +801,15 @@ class ProjectDetailView(APIListView):
             item__project=project, published=True, item__published=True
         )
 
-        calculate_asset_stats(project_assets, ctx)
+        calculate_asset_stats(
+            project_assets,
+            ctx,
+            contributor_count=count_contributors(
+                project.projectcontributor_set.all(),
+                project.item_set.all(),
+                Q(published=False),
+            ),
+        )
 
         annotate_children_with_progress_stats(ctx["items"])
 
@@ -804,7 +873,11 @@ class ItemDetailView(APIListView):
 
         item_assets = self.item.asset_set.published()
 
-        calculate_asset_stats(item_assets, ctx)
+        calculate_asset_stats(
+            item_assets,
+            ctx,
+            contributor_count=self.item.itemcontributor_set.count(),
+        )
 
         return ctx
 
@@ -837,7 +910,9 @@ class AssetDetailView(APIDetailView):
             item__item_id=self.kwargs["item_id"],
             slug=self.kwargs["slug"],
         )
-        asset_qs = asset_qs.select_related("item__project__campaign")
+        asset_qs = asset_qs.select_related(
+            "item__project__campaign", "latest_transcription__user"
+        )
 
         return asset_qs
 
@@ -854,8 +929,7 @@ class AssetDetailView(APIDetailView):
         ctx["project"] = project = item.project
         ctx["campaign"] = project.campaign
 
-        transcription = asset.transcription_set.order_by("-pk").first()
-        ctx["transcription"] = transcription
+        ctx["transcription"] = transcription = asset.latest_transcription
 
         ctx["next_open_asset_url"] = "%s?%s" % (
             reverse(
@@ -896,28 +970,28 @@ class AssetDetailView(APIDetailView):
         if transcription_status == TranscriptionStatus.SUBMITTED:
             ctx["activity_mode"] = "review"
 
-        previous_asset = (
-            item.asset_set.published()
-            .filter(sequence__lt=asset.sequence)
-            .order_by("sequence")
-            .last()
-        )
-        next_asset = (
-            item.asset_set.published()
-            .filter(sequence__gt=asset.sequence)
-            .order_by("sequence")
-            .first()
-        )
-        if previous_asset:
-            ctx["previous_asset_url"] = previous_asset.get_absolute_url()
-        if next_asset:
-            ctx["next_asset_url"] = next_asset.get_absolute_url()
-
-        ctx["asset_navigation"] = (
-            item.asset_set.published()
-            .order_by("sequence")
-            .values_list("sequence", "slug")
-        )
+        # The navigation index is cached per-item and already has everything
+        # needed to build the previous and next links without more queries:
+        ctx["asset_navigation"] = asset_navigation = get_item_asset_navigation(item.pk)
+
+        previous_asset = asset_navigation.previous(asset.sequence)
+        next_asset = asset_navigation.next(asset.sequence)
+
+        for context_key, adjacent_asset in (
+            ("previous_asset_url", previous_asset),
+            ("next_asset_url", next_asset),
+        ):
+            if adjacent_asset:
+                _, slug = adjacent_asset
+                ctx[context_key] = reverse(
+                    "transcriptions:asset-detail",
+                    kwargs={
+                        "campaign_slug": project.campaign.slug,
+                        "project_slug": project.slug,
+                        "item_id": item.item_id,
+                        "slug": slug,
+                    },
+                )
 
         image_url = asset_media_url(asset)
         if asset.download_url and "iiif" in asset.download_url:
@@ -931,15 +1005,11 @@ class AssetDetailView(APIDetailView):
 
         ctx["current_asset_url"] = self.request.build_absolute_uri()
 
-        tag_groups = UserAssetTagCollection.objects.filter(asset__slug=asset.slug)
-
-        tags = set()
-
-        for tag_group in tag_groups:
-            for tag in tag_group.tags.all():
-                tags.add(tag.value)
-
-        ctx["tags"] = sorted(tags)
+        ctx["tags"] = list(
+            AssetTag.objects.filter(asset=asset)
+            .order_by("tag__value")
+            .values_list("tag__value", flat=True)
+        )
 
         return ctx
 
@@ -951,20 +1021,22 @@ def ajax_captcha(request):
         key = request.POST.get("key")
 
         if response and key:
-            CaptchaStore.remove_expired()
-
+            # Expired challenges are removed by the remove_expired_captchas
+            # task so they are excluded here.
+            #
             # Note that CaptchaStore displays the response in uppercase in the
             # image and in the string representation of the object but the
             # actual value stored in the database is lowercase!
-            deleted, _ = CaptchaStore.objects.filter(
-                response=response.lower(), hashkey=key
-            ).delete()
+            captcha_qs = CaptchaStore.objects.filter(hashkey=key, expiration__gt=now())
+            if not (settings.CAPTCHA_TEST_MODE and response.lower() == "passed"):
+                captcha_qs = captcha_qs.filter(response=response.lower())
+            deleted, _ = captcha_qs.delete()
 
             if deleted > 0:
                 request.session["captcha_validation_time"] = time()
                 return JsonResponse({"valid": True})
 
-    key = CaptchaStore.generate_key()
+    key = get_captcha_key()
     return JsonResponse(
         {"key": key, "image": request.build_absolute_uri(captcha_image_url(key))},
         status=401,
@@ -972,6 +1044,19 @@ def ajax_captcha(request):
     )
 
 
+def captcha_image(request, key):
+    """
+    Serve the pre-rendered image for challenges from the captcha pool and
+    render any others as usual
+    """
+
+    image = cache.get(get_captcha_image_cache_key(key))
+    if image is not None:
+        return HttpResponse(image, content_type="image/png")
+
+    return captcha_views.captcha_image(request, key)
+
+
 def validate_anonymous_captcha(view):
     @wraps(view)
     @never_cache
@@ -1137,54 +1222,97 @@ def review_transcription(request, *, pk):
     )
 
 
-@require_POST
-@login_required
-@atomic
-def submit_tags(request, *, asset_pk):
-    asset = get_object_or_404(Asset, pk=asset_pk)
+def save_user_tags(asset, user, tag_ids):
+    """
+    Replace the user's tags for the asset with the provided Tag primary keys
+    using one INSERT for the added tags and one DELETE for the removed tags
+    """
 
-    user_tags, created = UserAssetTagCollection.objects.get_or_create(
-        asset=asset, user=request.user
-    )
+    TagThrough = UserAssetTagCollection.tags.through
 
-    tags = set(request.POST.getlist("tags"))
-    existing_tags = Tag.objects.filter(value__in=tags)
-    new_tag_values = tags.difference(i.value for i in existing_tags)
-    new_tags = [Tag(value=i) for i in new_tag_values]
-    try:
-        for i in new_tags:
-            i.full_clean()
-    except ValidationError as exc:
-        return JsonResponse({"error": exc.messages}, status=400)
+    with atomic():
+        user_tags, created = UserAssetTagCollection.objects.get_or_create(
+            asset=asset, user=user
+        )
 
-    Tag.objects.bulk_create(new_tags)
+        if created:
+            existing_tag_ids = set()
+        else:
+            existing_tag_ids = set(
+                TagThrough.objects.filter(userassettagcollection=user_tags).values_list(
+                    "tag_id", flat=True
+                )
+            )
 
-    # At this point we now have Tag objects for everything in the POSTed
-    # request. We'll add anything which wasn't previously in this user's tag
-    # collection and remove anything which is no longer present.
+        added_tag_ids = tag_ids.difference(existing_tag_ids)
+        removed_tag_ids = existing_tag_ids.difference(tag_ids)
 
-    all_submitted_tags = list(existing_tags) + new_tags
+        if removed_tag_ids:
+            TagThrough.objects.filter(
+                userassettagcollection=user_tags, tag_id__in=removed_tag_ids
+            ).delete()
 
-    existing_user_tags = user_tags.tags.all()
+        if added_tag_ids:
+            TagThrough.objects.bulk_create(
+                [
+                    TagThrough(userassettagcollection=user_tags, tag_id=i)
+                    for i in added_tag_ids
+                ],
+                ignore_conflicts=True,
+            )
 
-    for tag in all_submitted_tags:
-        if tag not in existing_user_tags:
-            user_tags.tags.add(tag)
+        # The through model is written directly so the signals which add() and
+        # remove() would have sent, and which keep the search index current,
+        # are sent here:
+        for action, pk_set in (
+            ("post_remove", removed_tag_ids),
+            ("post_add", added_tag_ids),
+        ):
+            if pk_set:
+                m2m_changed.send(
+                    sender=TagThrough,
+                    instance=user_tags,
+                    action=action,
+                    reverse=False,
+                    model=Tag,
+                    pk_set=pk_set,
+                    using=user_tags._state.db,
+                )
 
-    for tag in existing_user_tags:
-        if tag not in all_submitted_tags:
-            user_tags.tags.remove(tag)
 
-    all_tags_qs = Tag.objects.filter(userassettagcollection__asset__pk=asset_pk)
-    all_tags = all_tags_qs.order_by("value")
+@require_POST
+@login_required
+def submit_tags(request, *, asset_pk):
+    asset = get_object_or_404(Asset, pk=asset_pk)
 
-    final_user_tags = user_tags.tags.order_by("value").values_list("value", flat=True)
-    all_tags = all_tags.values_list("value", flat=True).distinct()
+    tags = set(request.POST.getlist("tags"))
 
-    return JsonResponse(
-        {"user_tags": list(final_user_tags), "all_tags": list(all_tags)}
+    try:
+        tag_ids = get_tag_ids(tags)
+    except ValidationError as exc:
+        return JsonResponse({"error": exc.messages}, status=400)
+
+    try:
+        save_user_tags(asset, request.user, set(tag_ids.values()))
+    except IntegrityError:
+        # A tag may have been deleted by another process after this process
+        # cached its primary key so we'll look them up again:
+        clear_tag_id_cache()
+        tag_ids = get_tag_ids(tags)
+        save_user_tags(asset, request.user, set(tag_ids.values()))
+
+    all_tags = list(
+        AssetTag.objects.filter(asset=asset)
+        .order_by("tag__value")
+        .values_list("tag__value", flat=True)
     )
 
+    # The user's tags are a subset of all_tags, which is already in the
+    # database's collation order:
+    user_tags = [i for i in all_tags if i in tags]
+
+    return JsonResponse({"user_tags": user_tags, "all_tags": all_tags})
+
 
 @method_decorator(never_cache, name="dispatch")
 class ContactUsView(FormView):
@@ -1639,10 +1767,11 @@ def redirect_to_next_transcribable_asset(request):
     # FIXME: if the project is specified, select the campaign
     # to which it belongs
 
-    potential_assets = None
+    potential_assets = Asset.objects.none()
     campaign_counter = 0
+    campaign_count = Campaign.objects.published().listed().count()
 
-    while not potential_assets:
+    while not potential_assets and campaign_counter < campaign_count:
         potential_assets = find_transcribable_assets(
             campaign_counter, project_slug, item_id, asset_id
         )
@@ -1792,16 +1921,10 @@ class AssetListView(APIListView):
             except (ValueError, TypeError):
                 raise Http404
 
-        latest_transcription_qs = (
-            Transcription.objects.filter(asset=OuterRef("pk"))
-            .order_by("-pk")
-            .values_list("pk", flat=True)
+        return qs.select_related(
+            "item", "item__project", "item__project__campaign", "latest_transcription"
         )
 
-        qs = qs.annotate(latest_transcription_pk=Subquery(latest_transcription_qs[:1]))
-
-        return qs.prefetch_related("item", "item__project", "item__project__campaign")
-
     def get_ordering(self):
         order_field = self.request.GET.get("order_by", "pk")
         if order_field.lstrip("-") not in ("pk", "difficulty"):
@@ -1812,46 +1935,17 @@ class AssetListView(APIListView):
         ctx = super().get_context_data(**kwargs)
 
         assets = ctx["assets"]
-        asset_pks = [i.pk for i in assets]
-
-        latest_transcriptions = {
-            asset_id: {"id": id, "submitted_by": user_id, "text": text}
-            for id, asset_id, user_id, text in Transcription.objects.filter(
-                pk__in=[i.latest_transcription_pk for i in assets]
-            ).values_list("id", "asset_id", "user_id", "text")
-        }
-
-        adjacent_asset_qs = Asset.objects.filter(
-            published=True, item=OuterRef("item")
-        ).values("sequence")
 
-        adjacent_seq_qs = (
-            Asset.objects.filter(pk__in=asset_pks, published=True)
-            .annotate(
-                next_sequence=Subquery(
-                    adjacent_asset_qs.filter(
-                        sequence__gt=OuterRef("sequence")
-                    ).order_by("sequence")[:1]
-                ),
-                previous_sequence=Subquery(
-                    adjacent_asset_qs.filter(
-                        sequence__lt=OuterRef("sequence")
-                    ).order_by("-sequence")[:1]
-                ),
-            )
-            .values_list("pk", "previous_sequence", "next_sequence")
+        navigation_indexes = get_item_asset_navigation_indexes(
+            {i.item_id for i in assets}
         )
 
-        adjacent_seqs = {
-            pk: (prev_seq, next_seq) for pk, prev_seq, next_seq in adjacent_seq_qs
-        }
-
         for asset in assets:
-            asset.latest_transcription = latest_transcriptions.get(asset.pk, None)
-
-            asset.previous_sequence, asset.next_sequence = adjacent_seqs.get(
-                asset.id, (None, None)
-            )
+            asset_navigation = navigation_indexes[asset.item_id]
+            previous_asset = asset_navigation.previous(asset.sequence)
+            next_asset = asset_navigation.next(asset.sequence)
+            asset.previous_sequence = previous_asset[0] if previous_asset else None
+            asset.next_sequence = next_asset[0] if next_asset else None
 
         return ctx
 
@@ -1863,6 +1957,14 @@ class AssetListView(APIListView):
 
         image_url, thumbnail_url = get_image_urls_from_asset(obj)
 
+        latest_transcription = obj.latest_transcription
+        if latest_transcription:
+            latest_transcription = {
+                "id": latest_transcription.pk,
+                "submitted_by": latest_transcription.user_id,
+                "text": latest_transcription.text,
+            }
+
         metadata = {
             "id": obj.pk,
             "status": obj.transcription_status,
@@ -1874,7 +1976,7 @@ class AssetListView(APIListView):
             "year": obj.year,
             "sequence": obj.sequence,
             "resource_url": obj.resource_url,
-            "latest_transcription": obj.latest_transcription,
+            "latest_transcription": latest_transcription,
             "item": {
                 "id": item.pk,
                 "item_id": item.item_id,
@@ -1969,6 +2071,108 @@ class ReviewListView(AssetListView):
         return asset_qs
 
 
+class TranscriptionSearchView(APIListView):
+    """
+    Full-text search of the latest transcription for each published asset
+    """
+
+    template_name = "transcriptions/transcription_search.html"
+    context_object_name = "assets"
+    paginate_by = 25
+
+    def get_queryset(self):
+        self.search_text = self.request.GET.get("q", "").strip()
+
+        if not self.search_text:
+            return Asset.objects.none()
+
+        asset_qs = Asset.objects.published().filter(
+            item__published=True, item__project__published=True
+        )
+
+        campaign_filter = self.request.GET.get("campaign_filter")
+        if campaign_filter:
+            asset_qs = asset_qs.filter(item__project__campaign__pk=campaign_filter)
+
+        project_filter = self.request.GET.get("project_filter")
+        if project_filter:
+            asset_qs = asset_qs.filter(item__project__pk=project_filter)
+
+        status = self.request.GET.get("transcription_status")
+        if status in TranscriptionStatus.CHOICE_MAP:
+            asset_qs = asset_qs.filter(transcription_status=status)
+
+        asset_qs = asset_qs.search_transcriptions(self.search_text)
+
+        return asset_qs.select_related(
+            "item", "item__project", "item__project__campaign"
+        ).order_by("-search_rank", "pk")
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+
+        ctx["search_text"] = self.search_text
+        ctx["campaigns"] = Campaign.objects.published().listed().order_by("title")
+        ctx["transcription_status_choices"] = TranscriptionStatus.CHOICES
+
+        assets = ctx["assets"]
+
+        if assets:
+            # Highlighting is only done for the current page of results:
+            query = SearchQuery(self.search_text, config=TRANSCRIPTION_SEARCH_CONFIG)
+            headlines = dict(
+                Transcription.objects.filter(
+                    pk__in=[i.latest_transcription_id for i in assets]
+                )
+                .annotate(
+                    headline=Func(
+                        Value(TRANSCRIPTION_SEARCH_CONFIG),
+                        F("text"),
+                        query,
+                        function="ts_headline",
+                        output_field=TextField(),
+                    )
+                )
+                .values_list("asset_id", "headline")
+            )
+
+            for asset in assets:
+                # ts_headline() does not escape the transcription text so we
+                # escape it and then restore the highlighting markup:
+                headline = escape(headlines.get(asset.pk, ""))
+                asset.headline = mark_safe(
+                    headline.replace("&lt;b&gt;", "<mark>").replace(
+                        "&lt;/b&gt;", "</mark>"
+                    )
+                )
+
+        return ctx
+
+    def serialize_object(self, obj):
+        item = obj.item
+        project = item.project
+        campaign = project.campaign
+
+        image_url, thumbnail_url = get_image_urls_from_asset(obj)
+
+        return {
+            "id": obj.pk,
+            "status": obj.transcription_status,
+            "url": obj.get_absolute_url(),
+            "thumbnailUrl": thumbnail_url,
+            "title": obj.title,
+            "rank": obj.search_rank,
+            "headline": obj.headline,
+            "item": {"id": item.pk, "item_id": item.item_id, "title": item.title},
+            "project": {"id": project.pk, "slug": project.slug, "title": project.title},
+            "campaign": {
+                "id": campaign.pk,
+                "slug": campaign.slug,
+                "title": campaign.title,
+            },
+        }
+
+
 @flag_required("ACTIVITY_UI_ENABLED")
 @login_required
 @never_cache
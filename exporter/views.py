@@ -8,26 +8,19 @@ import bagit
 import boto3
 from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models import OuterRef, Subquery
+from django.db.models import F
 from django.http import HttpResponse, HttpResponseRedirect
 from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 from tabular_export.core import export_to_csv_response, flatten_queryset
 
-from concordia.models import Asset, Item, Transcription, TranscriptionStatus
+from concordia.models import Asset, Item, TranscriptionStatus
 
 logger = getLogger(__name__)
 
 
 def get_latest_transcription_data(asset_qs):
-    latest_trans_subquery = (
-        Transcription.objects.filter(asset=OuterRef("pk"))
-        .order_by("-pk")
-        .values("text")
-    )
-
-    assets = asset_qs.annotate(latest_transcription=Subquery(latest_trans_subquery[:1]))
-    return assets
+    return asset_qs.annotate(transcription_text=F("latest_transcription__text"))
 
 
 def remove_incomplete_items(item_qs):
@@ -120,10 +113,10 @@ def do_bagit_export(assets, export_base_dir, export_filename_base):
             asset_dest_path, "%s.txt" % asset_filename
         )
 
-        if asset.latest_transcription:
+        if asset.transcription_text:
             # Write the asset level transcription file
             with open(asset_text_output_path, "w") as f:
-                f.write(asset.latest_transcription)
+                f.write(asset.transcription_text)
 
     # Add attributions to the end of all text files found under asset_dest_path
     if hasattr(settings, "ATTRIBUTION_TEXT"):
@@ -200,7 +193,7 @@ class ExportCampaignToCSV(TemplateView):
                 "title",
                 "transcription_status",
                 "download_url",
-                "latest_transcription",
+                "transcription_text",
             ],
             extra_verbose_names={
                 "item__project__campaign__title": "Campaign",
@@ -211,7 +204,7 @@ class ExportCampaignToCSV(TemplateView):
                 "title": "Asset",
                 "transcription_status": "AssetStatus",
                 "download_url": "DownloadUrl",
-                "latest_transcription": "Transcription",
+                "transcription_text": "Transcription",
             },
         )
 
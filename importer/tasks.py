@@ -21,6 +21,8 @@ from requests.packages.urllib3.util.retry import Retry
 
 from concordia.models import Asset, Item, MediaType
 from concordia.storage import ASSET_STORAGE
+from concordia.task_metrics import record_http_request
+from concordia.utils import clear_item_asset_navigation
 from importer.models import ImportItem, ImportItemAsset, ImportJob
 
 logger = getLogger(__name__)
@@ -160,6 +162,7 @@ def get_collection_items(collection_url):
         resp = cache.get(current_page_url)
         if resp is None:
             resp = requests_retry_session().get(current_page_url)
+            record_http_request(len(resp.content))
             # 48-hour timeout
             cache.set(current_page_url, resp, timeout=(3600 * 48))
 
@@ -322,6 +325,7 @@ def create_item_import_task(self, import_job_pk, item_url):
 
     # Load the Item record with metadata from the remote URL:
     resp = requests.get(item_url, params={"fo": "json"})
+    record_http_request(len(resp.content))
     resp.raise_for_status()
     item_data = resp.json()
 
@@ -386,6 +390,8 @@ def import_item(self, import_item):
         item_assets.append(item_asset)
 
     Asset.objects.bulk_create(item_assets)
+    # bulk_create() does not send post_save signals:
+    clear_item_asset_navigation([import_item.item.pk])
 
     for asset in item_assets:
         import_asset = ImportItemAsset(
@@ -513,10 +519,16 @@ def download_asset(self, import_asset, redownload_asset):
         # to the defined ASSET_STORAGE.
         with NamedTemporaryFile(mode="x+b") as temp_file:
             resp = requests.get(download_url, stream=True)
-            resp.raise_for_status()
+            response_bytes = 0
 
-            for chunk in resp.iter_content(chunk_size=256 * 1024):
-                temp_file.write(chunk)
+            try:
+                resp.raise_for_status()
+
+                for chunk in resp.iter_content(chunk_size=256 * 1024):
+                    temp_file.write(chunk)
+                    response_bytes += len(chunk)
+            finally:
+                record_http_request(response_bytes)
 
             # Rewind the tempfile back to the first byte so we can
             temp_file.flush()